@@ -138,6 +138,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'api.middleware.QueryInspectorMiddleware',  # Only active with OBE_QUERY_INSPECTOR
 ]
 
 ROOT_URLCONF = 'OBEAutomation.urls'
@@ -182,9 +183,31 @@ else:
         'NAME': BASE_DIR / 'db.sqlite3',
     }
 
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+# Section structure caches are invalidated through signals, so multi-process deployments
+# should point CACHE_BACKEND at a shared cache (e.g. Redis or Memcached).
+
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'obe-automation'),
+    }
+}
+
+# Sparse score storage: when enabled, StudentQuestionScore rows exist only for entered
+# marks instead of a zero placeholder per enrolled student and question. A missing row
+# counts as zero in results. Run `manage.py collapse_placeholder_scores` after enabling.
+OBE_SPARSE_SCORES = os.environ.get('OBE_SPARSE_SCORES', '').lower() in ('1', 'true', 'yes')
+
+# Development aid: report each request's query count and repeated (N+1) SQL shapes in
+# X-Query-Count / X-Query-Repeated response headers and the api.middleware log
+OBE_QUERY_INSPECTOR = os.environ.get('OBE_QUERY_INSPECTOR', '').lower() in ('1', 'true', 'yes')
+
 AUTHENTICATION_BACKENDS = (
     'django.contrib.auth.backends.ModelBackend',  # Default
     'guardian.backends.ObjectPermissionBackend',
+    'sections.permissions.SectionPermissionBackend',  # Assessment/question permissions via their section
 )
 
 
@@ -0,0 +1,387 @@
+"""
+Time the result, attainment and marks API endpoints against sections of chosen roster
+sizes and report latency percentiles and query counts as JSON, e.g. to compare two
+commits on the same seed_benchmark database.
+
+For every target size the sections whose rosters are closest to it are picked; each
+endpoint is then requested --repeat times as the section's faculty, first student or
+program incharge, with cold and/or warm caches. Cold runs invalidate the section's cached
+values and stored CLO attainment before every request, as a marks change does, by
+bumping this app's version tokens; the rest of the configured cache is left alone.
+
+Marks writes (full-grid POST, the grid's PATCH of --patch-cells edited cells, and a CSV
+import of the whole grid) alternately change and restore the same cells, so the marks
+are unchanged after a run.
+
+Usage:
+    python manage.py seed_benchmark --sections 200
+    python manage.py benchmark_endpoints --sizes 50 100 200 --repeat 10 --output before.json
+    python manage.py benchmark_endpoints --section 12 --cache warm
+"""
+
+import csv
+import io
+import json
+import subprocess
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count, Q
+from rest_framework.test import APIClient
+
+from api.services.dashboard_stats import invalidate_dashboard_stats
+from api.services.plo_attainment import invalidate_clo_attainment
+from api.services.query_inspector import QueryInspector
+from api.services.section_cache import (
+    bump_section_structure_version, bump_outcome_mapping_version, bump_student_scores_version
+)
+from assessments.models import StudentQuestionScore
+from sections.models import Section
+from sections.permissions import forget_section_groups
+from users.models import CustomUser
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True, cwd=settings.BASE_DIR
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = "Benchmark the result and marks endpoints and report latency percentiles and query counts as JSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            default=[50, 100, 200],
+            help="Target roster sizes; the closest sections are benchmarked (default: 50 100 200).",
+        )
+        parser.add_argument(
+            "--sections-per-size",
+            type=int,
+            default=1,
+            help="Sections benchmarked per target size (default: 1).",
+        )
+        parser.add_argument(
+            "--section",
+            type=int,
+            action="append",
+            dest="sections",
+            help="Benchmark the given section id instead of picking by size (may be repeated).",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Timed requests per endpoint and cache mode (default: 5).",
+        )
+        parser.add_argument(
+            "--patch-cells",
+            type=int,
+            default=20,
+            help="Edited cells sent by each timed PATCH, like one grid autosave (default: 20).",
+        )
+        parser.add_argument(
+            "--cache",
+            choices=["cold", "warm", "both"],
+            default="both",
+            help="Invalidate the section's cached values before every request, warm them first, or both (default: both).",
+        )
+        parser.add_argument(
+            "--label",
+            help="Name of this run in the report (default: the current git revision).",
+        )
+        parser.add_argument(
+            "--output",
+            help="Write the JSON report to this file instead of stdout.",
+        )
+
+    def handle(self, *args, **options):
+        if options["repeat"] < 1:
+            raise CommandError("--repeat must be at least 1.")
+        if options["patch_cells"] < 1:
+            raise CommandError("--patch-cells must be at least 1.")
+
+        sections = self._pick_sections(options)
+        if not sections:
+            raise CommandError("No sections with a faculty, students and assessments to benchmark; run seed_benchmark first.")
+
+        host = next((host for host in settings.ALLOWED_HOSTS if host not in ("*", "") and not host.startswith(".")), "localhost")
+        self.client = APIClient(SERVER_NAME=host)
+        modes = ["cold", "warm"] if options["cache"] == "both" else [options["cache"]]
+
+        results = []
+        for size, section in sections:
+            self.stderr.write(f"  Section {section.id} ({section.student_count} students)...")
+            roster = list(section.students.values_list("id", flat=True))
+            for endpoint in self._endpoints(section, options["patch_cells"]):
+                for mode in modes:
+                    results.append({
+                        "section_id": section.id,
+                        "size": size,
+                        "students": section.student_count,
+                        "cache": mode,
+                        **self._measure(endpoint, mode, options["repeat"], section, roster),
+                    })
+
+        report = {
+            "label": options["label"] or _git_revision(),
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "database": connection.vendor,
+            "repeat": options["repeat"],
+            "patch_cells": options["patch_cells"],
+            "sections": [
+                {
+                    "id": section.id,
+                    "size": size,
+                    "students": section.student_count,
+                    "assessments": section.assessment_count,
+                    "questions": section.question_count,
+                }
+                for size, section in sections
+            ],
+            "results": results,
+        }
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as report_file:
+                report_file.write(output + "\n")
+            self.stderr.write(self.style.SUCCESS(f"Wrote {len(results)} measurements to {options['output']}."))
+        else:
+            self.stdout.write(output)
+
+    # -----------------------------------------------------------------------
+    # Sections
+    # -----------------------------------------------------------------------
+
+    def _pick_sections(self, options):
+        """Return [(target size, section)] annotated with roster, assessment and question counts."""
+        sections = Section.objects.filter(faculty__isnull=False).annotate(
+            student_count=Count("students", distinct=True),
+            assessment_count=Count("assessments", distinct=True),
+            question_count=Count("assessments__questions", distinct=True),
+        ).filter(student_count__gt=0, assessment_count__gt=0).order_by("id")
+
+        if options["sections"]:
+            return [(section.student_count, section) for section in sections.filter(id__in=options["sections"])]
+
+        candidates = list(sections)
+        picked, used = [], set()
+        for size in options["sizes"]:
+            closest = sorted(
+                (section for section in candidates if section.id not in used),
+                key=lambda section: (abs(section.student_count - size), section.id),
+            )[:options["sections_per_size"]]
+            for section in closest:
+                used.add(section.id)
+                picked.append((size, section))
+        return picked
+
+    # -----------------------------------------------------------------------
+    # Endpoints
+    # -----------------------------------------------------------------------
+
+    def _endpoints(self, section, patch_cells):
+        """
+        Return one dict per benchmarked request of `section`: name, variant, user, method,
+        url and data, where the data of marks writes is a function of `changed` (see _measure).
+        """
+        faculty = section.faculty
+        student = section.students.order_by("id").first()
+        assessment = section.assessments.annotate(
+            question_total=Count("questions")
+        ).filter(question_total__gt=0).order_by("id").first()
+
+        student_result = f"/api/student/section/{section.id}/final_result/"
+        faculty_result = f"/api/faculty/section/{section.id}/final_result/"
+
+        endpoints = [
+            ("student-traditional-result", "overview", student, "get", student_result, {}),
+            ("student-clo-result", "", student, "get", f"/api/student/section/{section.id}/clo_result/", {}),
+            ("student-plo-result", "", student, "get", "/api/student/plo_result/", {}),
+            ("faculty-traditional-result", "overview", faculty, "get", faculty_result, {"show_students": "true"}),
+            ("faculty-clo-result", "", faculty, "get", f"/api/faculty/section/{section.id}/clo_result/", {}),
+            ("student-dashboard", "", student, "get", "/api/student_dashboard/", {"include_results": "true"}),
+            ("faculty-dashboard", "", faculty, "get", "/api/faculty_dashboard/", {}),
+        ]
+        program_viewer = self._program_viewer(section)
+        if program_viewer:
+            endpoints.append(
+                ("program-plo-result", "", program_viewer, "get", f"/api/program/{section.program_id}/plo_result/", {})
+            )
+        if assessment:
+            marks = "/api/assessment-marks/"
+            writes = f"{marks}?id={assessment.id}"
+            grid = _ScoreGrid(assessment)
+            assessment_level = {"assessment_type": assessment.type, "assessment_id": assessment.id}
+            endpoints += [
+                ("student-traditional-result", "type", student, "get", student_result, {"assessment_type": assessment.type}),
+                ("student-traditional-result", "assessment", student, "get", student_result, assessment_level),
+                ("faculty-traditional-result", "assessment", faculty, "get", faculty_result, {**assessment_level, "show_students": "true"}),
+                ("assessment-marks", "grid", faculty, "get", marks, {"id": assessment.id}),
+                ("assessment-marks", "matrix", faculty, "get", marks, {"id": assessment.id, "format": "matrix"}),
+                ("assessment-marks", "save", faculty, "post", writes, grid.post_body),
+                ("assessment-marks", "patch", faculty, "patch", writes, lambda changed: grid.patch_body(changed, patch_cells)),
+                ("assessment-marks-import", "csv", faculty, "post", f"{marks}import/?id={assessment.id}", grid.import_body),
+            ]
+        return [
+            {"endpoint": name, "variant": variant, "user": user, "method": method, "url": url, "data": data}
+            for name, variant, user, method, url, data in endpoints
+        ]
+
+    def _program_viewer(self, section):
+        """The program's incharge, or else an admin, who may see program-wide PLO results."""
+        if section.program_id is None:
+            return None
+        program = section.program
+        if program.program_incharge_id:
+            return program.program_incharge
+        return CustomUser.objects.filter(Q(is_superuser=True) | Q(role="admin")).order_by("id").first()
+
+    def _request(self, endpoint, data):
+        self.client.force_authenticate(endpoint["user"])
+        if endpoint["endpoint"] == "assessment-marks-import":
+            return self.client.post(endpoint["url"], data, format="multipart")
+        if endpoint["method"] == "get":
+            return self.client.get(endpoint["url"], data)
+        return getattr(self.client, endpoint["method"])(endpoint["url"], data, format="json")
+
+    def _invalidate(self, section, roster):
+        """
+        Drop this app's cached values behind the section's endpoints, as a marks change
+        does, by bumping their version tokens instead of clearing the shared cache.
+        """
+        bump_section_structure_version(section.id)
+        bump_student_scores_version(section.id, roster)
+        bump_outcome_mapping_version()
+        invalidate_clo_attainment(section.id)
+        invalidate_dashboard_stats()
+        forget_section_groups(section.id)
+        ContentType.objects.clear_cache()
+
+    def _measure(self, endpoint, mode, runs, section, roster):
+        """
+        Time `runs` requests of `endpoint`. The data of marks writes is built before each
+        request from the current scores: changed cells on even runs and the original marks
+        on odd ones, which are sent once more at the end if needed to restore the grid.
+        """
+        data = endpoint["data"]
+        body = data if callable(data) else lambda changed: data
+        if mode == "warm":
+            self._request(endpoint, body(False))
+
+        timings, queries, status = [], [], None
+        for run in range(runs):
+            request_data = body(run % 2 == 0)
+            if mode == "cold":
+                self._invalidate(section, roster)
+            with QueryInspector() as inspector:
+                started = time.perf_counter()
+                response = self._request(endpoint, request_data)
+                timings.append((time.perf_counter() - started) * 1000)
+            queries.append(inspector.count)
+            status = response.status_code
+        if callable(data) and runs % 2:
+            self._request(endpoint, body(False))  # Put the changed cells back
+
+        return {
+            "endpoint": endpoint["endpoint"],
+            "variant": endpoint["variant"],
+            "status": status,
+            "runs": runs,
+            "min_ms": round(min(timings), 2),
+            **{
+                f"p{percentile}_ms": round(float(value), 2)
+                for percentile, value in zip(PERCENTILES, np.percentile(timings, PERCENTILES))
+            },
+            "max_ms": round(max(timings), 2),
+            "mean_ms": round(float(np.mean(timings)), 2),
+            "queries": max(queries),
+        }
+
+
+class _ScoreGrid:
+    """
+    The original marks of one assessment, read once, and the request bodies of the marks
+    writes: each either changes cells (ungraded or non-zero marks to full marks or zero)
+    or puts the original marks back.
+    """
+
+    def __init__(self, assessment):
+        self.assessment = assessment
+        self.questions = list(assessment.questions.order_by("id").values_list("id", "marks"))
+        self.students = list(assessment.section.students.order_by("id").values_list("id", "username"))
+        self.original = dict(
+            ((student_id, question_id), marks_obtained)
+            for student_id, question_id, marks_obtained in StudentQuestionScore.objects.filter(
+                assessment=assessment
+            ).values_list("student_id", "question_id", "marks_obtained")
+        )
+        # Row-major (student × question) cells, like the grid
+        self.cells = [(student_id, question_id) for student_id, _ in self.students for question_id, _ in self.questions]
+        question_marks = dict(self.questions)
+        self.changed = {
+            (student_id, question_id): 0.0 if self.original.get((student_id, question_id)) else question_marks[question_id]
+            for student_id, question_id in self.cells
+        }
+
+    def marks(self, cell, changed):
+        return self.changed[cell] if changed else self.original.get(cell)
+
+    def post_body(self, changed):
+        """The whole grid with its first cell changed."""
+        return {"scores": [
+            {"student_id": student_id, "question_id": question_id, "marks_obtained": self.marks(
+                (student_id, question_id), changed and index == 0
+            )}
+            for index, (student_id, question_id) in enumerate(self.cells)
+        ]}
+
+    def patch_body(self, changed, count):
+        """The first `count` cells, each with the version it currently has."""
+        cells = self.cells[:count]
+        versions = {
+            (student_id, question_id): version
+            for student_id, question_id, version in StudentQuestionScore.objects.filter(
+                assessment=self.assessment,
+                student_id__in={student_id for student_id, _ in cells},
+                question_id__in={question_id for _, question_id in cells},
+            ).values_list("student_id", "question_id", "version")
+        }
+        return {"scores": [
+            {
+                "student_id": student_id,
+                "question_id": question_id,
+                "marks_obtained": self.marks((student_id, question_id), changed),
+                "version": versions.get((student_id, question_id), 0),
+            }
+            for student_id, question_id in cells
+        ]}
+
+    def import_body(self, changed):
+        """A CSV of the whole grid (blank for ungraded cells) with its first cell changed."""
+        content = io.StringIO()
+        writer = csv.writer(content)
+        writer.writerow(["username"] + [f"Q{number}" for number in range(1, len(self.questions) + 1)])
+        for row, (student_id, username) in enumerate(self.students):
+            writer.writerow([username] + [
+                "" if marks is None else marks
+                for marks in (
+                    self.marks((student_id, question_id), changed and row == 0 and column == 0)
+                    for column, (question_id, _) in enumerate(self.questions)
+                )
+            ])
+        return {"file": SimpleUploadedFile("marks.csv", content.getvalue().encode())}
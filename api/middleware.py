@@ -0,0 +1,40 @@
+import logging
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from api.services.query_inspector import QueryInspector
+
+logger = logging.getLogger(__name__)
+
+
+class QueryInspectorMiddleware:
+    """
+    Development aid enabled with OBE_QUERY_INSPECTOR: counts the queries of every request
+    and reports SQL shapes repeated within it (likely N+1 loops) in response headers:
+
+        X-Query-Count: 23
+        X-Query-Repeated: 2; max=40
+
+    Requests with repeated shapes are also logged as warnings with the offending SQL.
+    """
+
+    def __init__(self, get_response):
+        if not settings.OBE_QUERY_INSPECTOR:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with QueryInspector() as inspector:
+            response = self.get_response(request)
+
+        repeated = inspector.repeated()
+        response["X-Query-Count"] = str(inspector.count)
+        if repeated:
+            response["X-Query-Repeated"] = f"{len(repeated)}; max={repeated[0][1]}"
+            logger.warning(
+                "%s %s ran %d queries with %d repeated shapes:\n%s",
+                request.method, request.path, inspector.count, len(repeated),
+                "\n".join(f"  {times} x {shape}" for shape, times in repeated),
+            )
+        else:
+            logger.debug("%s %s ran %d queries", request.method, request.path, inspector.count)
+        return response
@@ -0,0 +1,140 @@
+import numpy as np
+from api.services.section_cache import get_or_build_section_value
+from api.services.section_structure import SectionStructure
+from api.services.score_matrix import build_score_matrix
+
+
+class CLOWeightMatrix:
+    """
+    Per-section question × CLO matrix of distributed weights, one per assessment type.
+
+    A question of an assessment with a non-zero type weight contributes
+    (question marks / assessment marks) × type weight × assessment weightage / 100,
+    split evenly between the CLOs it is mapped to. A student's attainment of a CLO is
+    then (obtained / question marks) @ weights, computed for all students at once.
+
+    Only plain data (ids, numbers, arrays) is kept so instances can be cached.
+    """
+
+    def __init__(self, structure):
+        valid_assessment_types = {atype: weight for atype, weight in structure.breakdown.items() if weight > 0}
+
+        clos = sorted(structure.clos, key=lambda clo: clo.CLO)
+        self.clos = [
+            {"id": clo.id, "key": f"CLO{clo.CLO}", "title": clo.heading, "weightage": clo.weightage}
+            for clo in clos
+        ]
+        clo_index = {clo.id: column for column, clo in enumerate(clos)}
+
+        self.question_ids = [question.id for question in structure.questions]
+        self.question_marks = np.array([question.marks for question in structure.questions], dtype=float)
+        question_index = {question_id: row for row, question_id in enumerate(self.question_ids)}
+
+        # weights[type] holds the distributed weights; links[type] marks contributing (question, CLO) pairs
+        self.weights = {}
+        self.links = {}
+        # Assessment types in the order they first contribute to each CLO
+        self.clo_types = [[] for _ in clos]
+
+        for assessment in structure.assessments:
+            if assessment.type not in valid_assessment_types:
+                continue
+            questions = structure.questions_by_assessment[assessment.id]
+            total_assessment_marks = sum(q.marks for q in questions)
+            if total_assessment_marks == 0:
+                continue  # Skip empty assessments
+
+            assessment_type = assessment.type
+            adjusted_weight = valid_assessment_types[assessment_type] * assessment.weightage / 100
+            if assessment_type not in self.weights:
+                self.weights[assessment_type] = np.zeros((len(self.question_ids), len(clos)))
+                self.links[assessment_type] = np.zeros((len(self.question_ids), len(clos)), dtype=bool)
+
+            for question in questions:
+                mapped_clos = structure.clo_ids_by_question[question.id]
+                if not mapped_clos:
+                    continue  # Skip questions without CLOs
+
+                distributed_weight = (question.marks / total_assessment_marks) * adjusted_weight / len(mapped_clos)
+                for clo_id in mapped_clos:
+                    column = clo_index.get(clo_id)
+                    if column is None:
+                        continue  # CLO of another course
+                    row = question_index[question.id]
+                    self.weights[assessment_type][row, column] += distributed_weight
+                    self.links[assessment_type][row, column] = True
+                    if assessment_type not in self.clo_types[column]:
+                        self.clo_types[column].append(assessment_type)
+
+    def clo_summaries(self):
+        """The CLO list of the attainment payload: total weight and per-type contribution of each CLO."""
+        contributions = {atype: weights.sum(axis=0) for atype, weights in self.weights.items()}
+        summaries = []
+        for column, clo in enumerate(self.clos):
+            type_contribution = {atype: float(contributions[atype][column]) for atype in self.clo_types[column]}
+            summaries.append({
+                "clo_id": clo["key"],
+                "title": clo["title"],
+                "weightage": clo["weightage"],
+                "totalMarks": sum(type_contribution.values()),
+                "assessmentTypeContribution": type_contribution,
+            })
+        return summaries
+
+    def student_clo_results(self, student_ids, score_rows):
+        """
+        Return one {clo_key: {assessment_type: attained weight}} dict per student id.
+        A type appears under a CLO only when the student has a score row for a question
+        contributing to it, matching the per-question payload this replaces.
+        """
+        score_rows = list(score_rows)
+        attained = self._attained_by_type(student_ids, score_rows)
+        present = self._score_matrix(
+            student_ids, [(student_id, question_id, 1) for student_id, question_id, _ in score_rows]
+        )
+        contributes = {atype: (present @ links) > 0 for atype, links in self.links.items()}
+
+        return [
+            {
+                clo["key"]: {
+                    atype: float(attained[atype][row, column])
+                    for atype in self.clo_types[column]
+                    if contributes[atype][row, column]
+                }
+                for column, clo in enumerate(self.clos)
+            }
+            for row in range(len(student_ids))
+        ]
+
+    def clo_attainment(self, student_ids, score_rows):
+        """
+        Return (attained, possible): a students × CLOs array of attained weight summed over
+        assessment types, and the per-CLO total weight (the CLO's "totalMarks").
+        """
+        possible = np.zeros(len(self.clos))
+        attained = np.zeros((len(student_ids), len(self.clos)))
+        for atype, type_attained in self._attained_by_type(student_ids, score_rows).items():
+            attained += type_attained
+            possible += self.weights[atype].sum(axis=0)
+        return attained, possible
+
+    def _score_matrix(self, student_ids, score_rows):
+        student_index = {student_id: row for row, student_id in enumerate(student_ids)}
+        question_index = {question_id: column for column, question_id in enumerate(self.question_ids)}
+        return build_score_matrix(student_index, question_index, score_rows)
+
+    def _attained_by_type(self, student_ids, score_rows):
+        """Students × CLOs attained weight per assessment type."""
+        marks = self._score_matrix(student_ids, score_rows)
+        ratios = marks / np.where(self.question_marks > 0, self.question_marks, 1)
+        return {atype: ratios @ weights for atype, weights in self.weights.items()}
+
+
+def get_clo_weight_matrix(section):
+    """
+    Return the section's CLOWeightMatrix, cached until its structure changes
+    (see api/signals/cache_signals.py).
+    """
+    return get_or_build_section_value(
+        section.id, "clo_weight_matrix", lambda: CLOWeightMatrix(SectionStructure(section))
+    )
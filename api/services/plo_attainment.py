@@ -0,0 +1,327 @@
+from collections import defaultdict
+import hashlib
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from assessments.models import StudentQuestionScore
+from outcomes.models import PloCloMapping, ProgramLearningOutcome
+from results.models import CLOAttainmentSnapshot, StudentCLOAttainment
+from sections.models import Section
+from users.models import CustomUser
+from api.services.clo_attainment import CLOWeightMatrix
+from api.services.section_cache import (
+    outcome_mapping_version, clo_attainment_versions, bump_clo_attainment_version
+)
+from api.services.section_structure import SectionStructure
+
+# Sections computed together; each batch costs the same fixed number of queries
+SECTION_BATCH_SIZE = 200
+# A student attains a PLO at or above this percentage
+PLO_ATTAINMENT_THRESHOLD = 50
+# Recompute passes of ensure_clo_attainment; a second pass only runs for sections whose
+# scores changed while the first was computing them
+ENSURE_PASSES = 2
+
+
+def _delete_snapshots(section_ids):
+    CLOAttainmentSnapshot.objects.filter(section_id__in=section_ids).delete()
+
+
+def invalidate_clo_attainment(*section_ids):
+    """
+    Mark the stored CLO attainment of the given sections as stale: delete their snapshots
+    and bump their version token, so a compute that read the old scores does not store a
+    snapshot. Inside a transaction both are repeated on commit, once the change is visible
+    to computes running meanwhile.
+    """
+    def invalidate():
+        bump_clo_attainment_version(*section_ids)
+        _delete_snapshots(section_ids)
+
+    invalidate()
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(invalidate)
+
+
+def compute_clo_attainment(sections, batch_size=1000):
+    """
+    Recompute and store the StudentCLOAttainment rows of `sections` (loaded with
+    select_related('assessmentbreakdown')) from raw scores, in a fixed number of queries.
+    """
+    sections = [section for section in sections if hasattr(section, 'assessmentbreakdown')]
+    if not sections:
+        return 0
+    section_ids = [section.id for section in sections]
+    # Taken before the scores are read; a change bumps it (see invalidate_clo_attainment)
+    versions = clo_attainment_versions(section_ids)
+    structures = SectionStructure.load_many(sections)
+
+    students_by_section = defaultdict(list)
+    for section_id, student_id in Section.students.through.objects.filter(
+        section_id__in=section_ids
+    ).order_by('customuser_id').values_list('section_id', 'customuser_id'):
+        students_by_section[section_id].append(student_id)
+
+    scores_by_section = defaultdict(list)
+    for section_id, student_id, question_id, marks_obtained in StudentQuestionScore.objects.filter(
+        section_id__in=section_ids
+    ).values_list('section_id', 'student_id', 'question_id', 'marks_obtained'):
+        scores_by_section[section_id].append((student_id, question_id, marks_obtained))
+
+    rows = []
+    for section in sections:
+        weight_matrix = CLOWeightMatrix(structures[section.id])
+        student_ids = students_by_section[section.id]
+        attained, possible = weight_matrix.clo_attainment(student_ids, scores_by_section[section.id])
+        for row, student_id in enumerate(student_ids):
+            for column, clo in enumerate(weight_matrix.clos):
+                rows.append(StudentCLOAttainment(
+                    section_id=section.id,
+                    student_id=student_id,
+                    clo_id=clo["id"],
+                    attained=float(attained[row, column]),
+                    possible=float(possible[column]),
+                ))
+
+    with transaction.atomic():
+        # Rows of dropped students/CLOs go with the old snapshot
+        StudentCLOAttainment.objects.filter(section_id__in=section_ids).delete()
+        StudentCLOAttainment.objects.bulk_create(rows, batch_size=batch_size)
+        CLOAttainmentSnapshot.objects.bulk_create(
+            [CLOAttainmentSnapshot(section_id=section_id) for section_id in section_ids],
+            ignore_conflicts=True,
+        )
+
+    # Scores that changed while computing were invalidated before this snapshot existed;
+    # leave those sections stale for the next read
+    changed = [
+        section_id for section_id, version in clo_attainment_versions(section_ids).items()
+        if version != versions[section_id]
+    ]
+    if changed:
+        _delete_snapshots(changed)
+    return len(rows)
+
+
+def ensure_clo_attainment(sections):
+    """
+    Recompute the sections whose snapshot is missing and return {section_id: snapshot_id}
+    for all of them. Snapshot ids change whenever a section is recomputed. A section whose
+    scores keep changing during ENSURE_PASSES recomputes is left without a snapshot.
+    """
+    sections = list(sections)
+    section_ids = [section.id for section in sections]
+    snapshots = dict(
+        CLOAttainmentSnapshot.objects.filter(section_id__in=section_ids).values_list('section_id', 'id')
+    )
+    for _ in range(ENSURE_PASSES):
+        stale = [section for section in sections if section.id not in snapshots]
+        if not stale:
+            break
+        for start in range(0, len(stale), SECTION_BATCH_SIZE):
+            compute_clo_attainment(stale[start:start + SECTION_BATCH_SIZE])
+        snapshots = dict(
+            CLOAttainmentSnapshot.objects.filter(section_id__in=section_ids).values_list('section_id', 'id')
+        )
+    return snapshots
+
+
+def load_clo_attainment(sections, student_ids=None):
+    """
+    Return (section_id, student_id, clo_id, attained, possible) rows of `sections`,
+    recomputing only the sections whose snapshot is missing.
+    """
+    sections = list(sections)
+    ensure_clo_attainment(sections)
+    return read_clo_attainment([section.id for section in sections], student_ids)
+
+
+def read_clo_attainment(section_ids, student_ids=None):
+    """Stored rows of the given sections that have a current snapshot."""
+    rows = StudentCLOAttainment.objects.filter(
+        section_id__in=section_ids, section__clo_attainment_snapshot__isnull=False
+    )
+    if student_ids is not None:
+        rows = rows.filter(student_id__in=student_ids)
+    return list(rows.values_list('section_id', 'student_id', 'clo_id', 'attained', 'possible'))
+
+
+def program_sections(program):
+    """Sections of every course in the program, excluding sections run for another program."""
+    return Section.objects.filter(
+        Q(program=program) | Q(program__isnull=True), course__programs=program
+    ).select_related('assessmentbreakdown').distinct().order_by('id')
+
+
+def program_plo_attainment(program, include_students=False, threshold=PLO_ATTAINMENT_THRESHOLD):
+    """
+    Roll the stored CLO attainment of every section in the program up through the
+    program's PloCloMapping weightages.
+
+    A student's PLO attainment is the mapping-weighted average of their CLO attainment
+    percentages (attained / possible × 100) over every section and mapped CLO with a
+    non-zero possible weight. Per-PLO figures aggregate those student percentages.
+    """
+    sections = list(program_sections(program))
+    plos = list(ProgramLearningOutcome.objects.filter(program=program).order_by('PLO'))
+    plo_by_clo = {
+        clo_id: (plo_id, weightage)
+        for clo_id, plo_id, weightage in PloCloMapping.objects.filter(program=program).values_list(
+            'clo_id', 'plo_id', 'weightage'
+        )
+    }
+
+    # (student_id, plo_id) → [weighted percentage sum, weight sum]
+    totals = defaultdict(lambda: [0.0, 0.0])
+    sections_by_plo = defaultdict(set)
+    for section_id, student_id, clo_id, attained, possible in load_clo_attainment(sections):
+        mapping = plo_by_clo.get(clo_id)
+        if mapping is None or possible <= 0:
+            continue
+        plo_id, weightage = mapping
+        total = totals[(student_id, plo_id)]
+        total[0] += weightage * attained / possible * 100
+        total[1] += weightage
+        sections_by_plo[plo_id].add(section_id)
+
+    student_results = defaultdict(dict)  # student_id → {plo_id: percentage}
+    for (student_id, plo_id), (weighted_sum, weight_sum) in totals.items():
+        if weight_sum > 0:
+            student_results[student_id][plo_id] = weighted_sum / weight_sum
+
+    plo_summaries = []
+    for plo in plos:
+        percentages = [results[plo.id] for results in student_results.values() if plo.id in results]
+        attained_count = sum(1 for percentage in percentages if percentage >= threshold)
+        plo_summaries.append({
+            "plo_id": f"PLO{plo.PLO}",
+            "title": plo.heading,
+            "weightage": plo.weightage,
+            "sections": len(sections_by_plo[plo.id]),
+            "students_assessed": len(percentages),
+            "students_attained": attained_count,
+            "average_attainment": round(sum(percentages) / len(percentages), 2) if percentages else 0,
+            "attainment_rate": round(attained_count / len(percentages) * 100, 2) if percentages else 0,
+        })
+
+    data = {
+        "program": program.program_abbreviation,
+        "threshold": threshold,
+        "sections": len(sections),
+        "PLOs": plo_summaries,
+    }
+
+    if include_students:
+        students = CustomUser.objects.filter(id__in=student_results.keys()).order_by('username')
+        data["students"] = {
+            student.username: {
+                "student_details": {
+                    "first_name": student.first_name,
+                    "last_name": student.last_name,
+                    "email": student.email
+                },
+                "plo_results": {
+                    f"PLO{plo.PLO}": round(student_results[student.id][plo.id], 2)
+                    for plo in plos
+                    if plo.id in student_results[student.id]
+                }
+            }
+            for student in students
+        }
+
+    return data
+
+
+def student_plo_transcript(student, threshold=PLO_ATTAINMENT_THRESHOLD):
+    """
+    PLO profile of a student across every section they are enrolled in, grouped by program.
+
+    Stale sections are recomputed together in one batched pass. The result is cached per
+    student under a fingerprint of their sections' snapshot ids, so it is rebuilt only when
+    one of those sections changes (or a PLO/mapping does); a hit costs two queries.
+    """
+    sections = list(
+        student.enrolled_sections.select_related('assessmentbreakdown', 'course').order_by('id')
+    )
+    snapshots = ensure_clo_attainment(sections)
+
+    fingerprint = hashlib.md5(
+        ",".join(f"{section_id}:{snapshot_id}" for section_id, snapshot_id in sorted(snapshots.items())).encode()
+    ).hexdigest()
+    key = f"student:{student.id}:plo_transcript:{threshold}:{outcome_mapping_version()}:{fingerprint}"
+    data = cache.get(key)
+    if data is None:
+        data = _build_student_plo_transcript(sections, student, threshold)
+        cache.set(key, data)
+    return data
+
+
+def _build_student_plo_transcript(sections, student, threshold):
+    sections_by_id = {section.id: section for section in sections}
+    mappings_by_clo = defaultdict(list)
+    for mapping in PloCloMapping.objects.filter(
+        course_id__in={section.course_id for section in sections}
+    ).select_related('program', 'plo', 'clo'):
+        mappings_by_clo[mapping.clo_id].append(mapping)
+
+    # program_id → plo_id → PLO entry with its contributing courses
+    programs = {}
+    for section_id, _, clo_id, attained, possible in read_clo_attainment(list(sections_by_id), [student.id]):
+        if possible <= 0:
+            continue
+        section = sections_by_id[section_id]
+        for mapping in mappings_by_clo[clo_id]:
+            if section.program_id is not None and mapping.program_id != section.program_id:
+                continue  # The section is run for another program
+            program = programs.setdefault(mapping.program_id, {"program": mapping.program, "plos": {}})
+            plo = program["plos"].setdefault(mapping.plo_id, {
+                "plo": mapping.plo, "weighted_sum": 0.0, "weight_sum": 0.0, "courses": {}
+            })
+            percentage = attained / possible * 100
+            plo["weighted_sum"] += mapping.weightage * percentage
+            plo["weight_sum"] += mapping.weightage
+            course = plo["courses"].setdefault(section_id, {
+                "course_id": section.course.course_id,
+                "course_name": section.course.name,
+                "section_id": section_id,
+                "semester": section.semester,
+                "batch": section.batch,
+                "year": section.year,
+                "clos": [],
+            })
+            course["clos"].append({
+                "clo_id": f"CLO{mapping.clo.CLO}",
+                "mapping_weightage": mapping.weightage,
+                "attainment": round(percentage, 2),
+            })
+
+    program_results = []
+    for program in sorted(programs.values(), key=lambda entry: entry["program"].program_abbreviation):
+        plo_results = []
+        for plo in sorted(program["plos"].values(), key=lambda entry: entry["plo"].PLO):
+            attainment = plo["weighted_sum"] / plo["weight_sum"] if plo["weight_sum"] > 0 else 0
+            plo_results.append({
+                "plo_id": f"PLO{plo['plo'].PLO}",
+                "title": plo["plo"].heading,
+                "weightage": plo["plo"].weightage,
+                "attainment": round(attainment, 2),
+                "attained": attainment >= threshold,
+                "courses": list(plo["courses"].values()),
+            })
+        program_results.append({
+            "program": program["program"].program_abbreviation,
+            "title": program["program"].program_title,
+            "PLOs": plo_results,
+        })
+
+    return {
+        "student_details": {
+            "first_name": student.first_name,
+            "last_name": student.last_name,
+            "email": student.email,
+            "sap_id": student.username,
+        },
+        "threshold": threshold,
+        "sections": len(sections),
+        "programs": program_results,
+    }
@@ -0,0 +1,54 @@
+import re
+from collections import Counter
+from django.db import connection
+
+# Literals and IN lists are collapsed so queries differing only in their values share a shape
+_IN_LIST = re.compile(r'\bIN \((?:%s|\?)(?:, (?:%s|\?))*\)', re.IGNORECASE)
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+
+# A shape run this many times in one request is reported as a likely N+1
+REPEATED_QUERY_THRESHOLD = 5
+
+
+def query_shape(sql):
+    """Return `sql` with its parameters and literal values replaced by placeholders."""
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    return _IN_LIST.sub('IN (...)', sql)
+
+
+class QueryInspector:
+    """
+    Counts the queries run on the default connection inside the block and groups them by
+    shape, e.g.
+
+        with QueryInspector() as inspector:
+            ...
+        inspector.count, inspector.repeated()
+
+    Works with DEBUG off, as it wraps query execution instead of reading connection.queries.
+    """
+
+    def __init__(self):
+        self.shapes = Counter()
+
+    def __enter__(self):
+        self._wrapper = connection.execute_wrapper(self._execute)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._wrapper.__exit__(*exc_info)
+
+    def _execute(self, execute, sql, params, many, context):
+        self.shapes[query_shape(sql)] += 1
+        return execute(sql, params, many, context)
+
+    @property
+    def count(self):
+        return sum(self.shapes.values())
+
+    def repeated(self, threshold=REPEATED_QUERY_THRESHOLD):
+        """Return [(shape, times)] of shapes run at least `threshold` times, most repeated first."""
+        return [(shape, times) for shape, times in self.shapes.most_common() if times >= threshold]
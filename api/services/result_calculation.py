@@ -1,15 +1,14 @@
-from django.db.models import Sum
 from sections.models import Section
-from assessments.models import Assessment, Question, StudentQuestionScore
-from outcomes.models import CourseLearningOutcome
+from api.services.section_structure import SectionStructure, load_student_scores
 
 def calculate_student_results(section_id, student_id):
-    # Retrieve the section and student
-    section = Section.objects.get(id=section_id)
+    # Retrieve the section (with its breakdown) and student
+    section = Section.objects.select_related('assessmentbreakdown').get(id=section_id)
     student = section.students.get(id=student_id)
 
-    # Retrieve the assessment breakdown for the section
-    assessment_breakdown = section.assessmentbreakdown
+    # Load the section's assessments, questions, CLO links and the student's scores up front
+    structure = SectionStructure(section)
+    scores = load_student_scores(section, student.id)
 
     result = {
         "section_id": section.id,
@@ -25,7 +24,7 @@ def calculate_student_results(section_id, student_id):
     overall_score = 0.0
 
     # Iterate over all assessment types in the breakdown
-    for assessment_type, allocated_weight in assessment_breakdown.get_assessment_types().items():
+    for assessment_type, allocated_weight in structure.breakdown.items():
         if allocated_weight == 0:
             continue
         # Initialize cumulative variables for this type
@@ -34,32 +33,31 @@ def calculate_student_results(section_id, student_id):
         assessment_weight_sum = 0.0
         assessment_type_assessments = []
 
-        # Retrieve and process assessments of the current type
-        assessments = Assessment.objects.filter(section=section, type=assessment_type)
-        for assessment in assessments:
-            questions = assessment.questions.all()
-            total_marks = questions.aggregate(total=Sum("marks"))["total"] or 0.0
-            obtained_marks = StudentQuestionScore.objects.filter(student=student, question__in=questions).aggregate(obtained=Sum("marks_obtained"))["obtained"] or 0.0
+        # Process assessments of the current type
+        for assessment in structure.assessments_by_type[assessment_type]:
+            questions = structure.questions_by_assessment[assessment.id]
+            total_marks = float(sum(question.marks for question in questions))
+            obtained_marks = float(sum(scores.get(question.id, 0.0) for question in questions))
             assessment_weight = assessment.weightage
 
             # Adjusted marks for this assessment
-            adjusted_marks = (float(obtained_marks) / total_marks) * assessment_weight if total_marks > 0 else 0.0
+            adjusted_marks = (obtained_marks / total_marks) * assessment_weight if total_marks > 0 else 0.0
 
             # Update cumulative values
             total_marks_sum += total_marks
-            obtained_marks_sum += float(obtained_marks)
+            obtained_marks_sum += obtained_marks
             assessment_weight_sum += assessment_weight
 
             # Question details
-            question_details = [
-                {
+            question_details = []
+            for question in questions:
+                question_obtained = scores.get(question.id) or 0.0
+                question_details.append({
                     "question_id": question.id,
                     "marks": question.marks,
-                    "obtained_marks": StudentQuestionScore.objects.filter(student=student, question=question).first().marks_obtained or 0.0,
-                    "percentage": float(StudentQuestionScore.objects.filter(student=student, question=question).first().marks_obtained or 0.0) / question.marks * 100 if question.marks > 0 else 0.0
-                }
-                for question in questions
-            ]
+                    "obtained_marks": question_obtained,
+                    "percentage": float(question_obtained) / question.marks * 100 if question.marks > 0 else 0.0
+                })
 
             # Append assessment data
             assessment_type_assessments.append({
@@ -69,7 +67,7 @@ def calculate_student_results(section_id, student_id):
                 "student_obtained_marks": obtained_marks,
                 "assessment_weight": assessment_weight,
                 "adjusted_marks": adjusted_marks,
-                "percentage": (float(obtained_marks)/total_marks)*100 if total_marks > 0 else 0.0,
+                "percentage": (obtained_marks/total_marks)*100 if total_marks > 0 else 0.0,
                 "questions": question_details
             })
 
@@ -98,14 +96,19 @@ def calculate_student_results(section_id, student_id):
     result["course_completion"] = overall_completion
     result["student_current_overall"] = overall_score
 
-    # CLO-based results
-    clos = CourseLearningOutcome.objects.filter(course=section.course)
+    # CLO-based results (every question of the section mapped to the CLO, regardless of type)
+    clo_totals = {clo.id: 0.0 for clo in structure.clos}
+    clo_obtained = {clo.id: 0.0 for clo in structure.clos}
+    for question in structure.questions:
+        for clo_id in structure.clo_ids_by_question[question.id]:
+            if clo_id in clo_totals:
+                clo_totals[clo_id] += question.marks
+                clo_obtained[clo_id] += scores.get(question.id, 0.0)
+
     clo_results = []
-    for clo in clos:
-        questions = Question.objects.filter(clo=clo, assessment__section=section)
-        total_marks = questions.aggregate(total=Sum("marks"))["total"] or 0.0
-        obtained_marks = StudentQuestionScore.objects.filter(student=student, question__in=questions).aggregate(obtained=Sum("marks_obtained"))["obtained"] or 0.0
-        percentage = (float(obtained_marks) / total_marks) * 100 if total_marks > 0 else 0.0
+    for clo in structure.clos:
+        total_marks = clo_totals[clo.id]
+        percentage = (clo_obtained[clo.id] / total_marks) * 100 if total_marks > 0 else 0.0
         clo_results.append({
             "clo_id": clo.id,
             "clo_name": clo.heading,
@@ -113,4 +116,4 @@ def calculate_student_results(section_id, student_id):
         })
     result["clo_based_results"] = clo_results
 
-    return result
\ No newline at end of file
+    return result
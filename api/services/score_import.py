@@ -0,0 +1,160 @@
+import csv
+import io
+import re
+from django.db import transaction
+from users.models import CustomUser
+from api.services.score_writes import ScoreValidator, save_score_cells
+
+# Spreadsheet rows mapped, validated and written together
+IMPORT_CHUNK_SIZE = 200
+
+USERNAME_HEADERS = {"username", "sap_id", "sap id", "sapid", "student"}
+QUESTION_HEADER = re.compile(r'^(?:q|question)?\s*(\d+)$', re.IGNORECASE)
+# "First Last (username)" as written by the score grid's Excel export
+NAMED_USERNAME = re.compile(r'\(([^()]+)\)\s*$')
+# Label rows of the grid's Excel export
+SKIPPED_ROWS = {"question ids", "total marks"}
+
+
+class ScoreImportError(Exception):
+    """Raised when an import has errors; nothing is written."""
+
+    def __init__(self, errors):
+        super().__init__(f"{len(errors)} error(s) in the imported file.")
+        self.errors = errors
+
+
+def _iter_csv_rows(uploaded_file):
+    text = io.TextIOWrapper(uploaded_file, encoding='utf-8-sig', newline='')
+    try:
+        yield from csv.reader(text)
+    except (UnicodeDecodeError, csv.Error):
+        raise ScoreImportError([{"row": None, "error": "Could not read the CSV file; save it as UTF-8 CSV."}])
+    finally:
+        text.detach()  # Leave the uploaded file open for Django to clean up
+
+
+def _iter_xlsx_rows(uploaded_file):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ScoreImportError([{"row": None, "error": "XLSX import requires openpyxl; upload a CSV file instead."}])
+    # read_only mode streams rows from the sheet XML instead of building the whole workbook
+    try:
+        workbook = load_workbook(uploaded_file, read_only=True, data_only=True)
+    except Exception:
+        raise ScoreImportError([{"row": None, "error": "Could not read the XLSX file."}])
+    try:
+        for row in workbook.worksheets[0].iter_rows(values_only=True):
+            yield ["" if value is None else value for value in row]
+    finally:
+        workbook.close()
+
+
+def iter_spreadsheet_rows(uploaded_file):
+    """Yield the rows of an uploaded .csv or .xlsx file one at a time."""
+    name = (getattr(uploaded_file, 'name', '') or '').lower()
+    if name.endswith('.xlsx'):
+        return _iter_xlsx_rows(uploaded_file)
+    if name.endswith('.csv'):
+        return _iter_csv_rows(uploaded_file)
+    raise ScoreImportError([{"row": None, "error": "Unsupported file type; upload a .csv or .xlsx file."}])
+
+
+def _parse_header(header, questions):
+    """Return (username column, {column: (question number, question)}, errors) from the header row."""
+    username_column = None
+    question_columns = {}
+    errors = []
+    for column, value in enumerate(header):
+        label = str(value).strip()
+        if label.lower() in USERNAME_HEADERS:
+            username_column = column
+            continue
+        match = QUESTION_HEADER.match(label)
+        if match:
+            number = int(match.group(1))
+            if 1 <= number <= len(questions):
+                question_columns[column] = (number, questions[number - 1])
+            else:
+                errors.append({"row": 1, "error": f"Question {number} does not exist in this assessment."})
+    if username_column is None and header and not str(header[0]).strip():
+        username_column = 0  # Unlabelled first column, as in the score grid's export
+    if username_column is None:
+        errors.append({"row": 1, "error": "Missing a username (SAP ID) column."})
+    if not question_columns:
+        errors.append({"row": 1, "error": "No question columns (Q1, Q2, ...) found."})
+    return username_column, question_columns, errors
+
+
+def _username(value):
+    username = str(value).strip()
+    match = NAMED_USERNAME.search(username)
+    return match.group(1).strip() if match else username
+
+
+def import_scores(assessment, uploaded_file, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Import a spreadsheet with one row per student (username / SAP ID column) and one
+    column per question number (Q1, Q2, ... in question order). Rows are streamed in
+    chunks; each chunk resolves usernames with one query and is validated and
+    bulk-upserted. Blank cells clear the mark, as in the score grid; columns left out of
+    the file are unchanged. All chunks share one transaction,
+    so any error raises ScoreImportError and nothing is written.
+    Returns the number of scores written.
+    """
+    questions = list(assessment.questions.order_by('id'))
+    validator = ScoreValidator(assessment)
+    rows = iter_spreadsheet_rows(uploaded_file)
+
+    header = next(rows, None)
+    if header is None:
+        raise ScoreImportError([{"row": None, "error": "The file is empty."}])
+    username_column, question_columns, errors = _parse_header(header, questions)
+    if errors:
+        raise ScoreImportError(errors)
+
+    updated = 0
+    with transaction.atomic():
+        chunk = []
+        for row_number, row in enumerate(rows, start=2):
+            username = _username(row[username_column]) if username_column < len(row) else ""
+            if not username or username.lower() in SKIPPED_ROWS:
+                continue
+            chunk.append((row_number, username, row))
+            if len(chunk) >= chunk_size:
+                updated += _import_chunk(chunk, question_columns, validator, errors)
+                chunk = []
+        if chunk:
+            updated += _import_chunk(chunk, question_columns, validator, errors)
+
+        if errors:
+            transaction.set_rollback(True)
+    if errors:
+        raise ScoreImportError(errors)
+    return updated
+
+
+def _import_chunk(chunk, question_columns, validator, errors):
+    student_ids = dict(
+        CustomUser.objects.filter(username__in={username for _, username, _ in chunk}).values_list('username', 'id')
+    )
+
+    values = {}
+    for row_number, username, row in chunk:
+        student_id = student_ids.get(username)
+        if student_id is None:
+            errors.append({"row": row_number, "username": username, "error": "Unknown student."})
+            continue
+        for column, (number, question) in question_columns.items():
+            raw = row[column] if column < len(row) else ""
+            marks_obtained, error = validator.validate(student_id, question.id, raw)
+            if error:
+                errors.append({"row": row_number, "username": username, "question": f"Q{number}", "error": error})
+            else:
+                values[(student_id, question.id)] = marks_obtained
+
+    # Once an error is found the transaction is rolled back, so skip further writes
+    if errors or not values:
+        return 0
+    return save_score_cells(validator.assessment, values)
@@ -0,0 +1,83 @@
+import numpy as np
+from collections import defaultdict
+from results.models import StudentAssessmentAggregate
+from api.services.section_structure import load_assessments_with_totals
+
+PERCENTILES = (25, 75, 90)
+
+
+def build_score_matrix(student_index, question_index, score_rows):
+    """
+    Fill a dense students × questions array from (student_id, question_id, marks) rows.
+    Rows for students or questions outside the indexes are ignored; missing cells stay zero.
+    """
+    marks = np.zeros((len(student_index), len(question_index)))
+    rows, columns, values = [], [], []
+    for student_id, question_id, marks_obtained in score_rows:
+        row = student_index.get(student_id)
+        column = question_index.get(question_id)
+        if row is not None and column is not None:
+            rows.append(row)
+            columns.append(column)
+            values.append(marks_obtained)
+    marks[rows, columns] = values
+    return marks
+
+
+class SectionAssessmentMatrix:
+    """
+    Dense students × assessments matrix of obtained marks read from the aggregate table,
+    so its size scales with students × assessments rather than students × questions.
+    """
+
+    def __init__(self, section, students):
+        self.section = section
+        self.students = list(students)
+        self.assessments = load_assessments_with_totals(section)
+        self.assessments_by_type = defaultdict(list)
+        for assessment in self.assessments:
+            self.assessments_by_type[assessment.type].append(assessment)
+
+        self.student_index = {student.id: row for row, student in enumerate(self.students)}
+        self.assessment_index = {assessment.id: column for column, assessment in enumerate(self.assessments)}
+        self.total_marks = np.array([assessment.total_marks for assessment in self.assessments], dtype=float)
+
+        self.scores = np.zeros((len(self.students), len(self.assessments)))
+        rows, columns, values = [], [], []
+        aggregate_rows = StudentAssessmentAggregate.objects.filter(
+            assessment__section=section
+        ).values_list('student_id', 'assessment_id', 'obtained_sum')
+        for student_id, assessment_id, obtained_sum in aggregate_rows:
+            row = self.student_index.get(student_id)
+            if row is not None:
+                rows.append(row)
+                columns.append(self.assessment_index[assessment_id])
+                values.append(obtained_sum)
+        self.scores[rows, columns] = values
+
+    def columns(self, assessments):
+        return np.array([self.assessment_index[a.id] for a in assessments], dtype=int)
+
+    def assessment_total_marks(self, assessments):
+        """Total marks of each assessment, as a vector."""
+        return self.total_marks[self.columns(assessments)]
+
+    def assessment_scores(self, assessments):
+        """Students × assessments matrix of obtained marks."""
+        return self.scores[:, self.columns(assessments)]
+
+
+def distribution_statistics(values):
+    """
+    Median, standard deviation and percentiles of a 1-D array of scores.
+    """
+    values = np.asarray(values, dtype=float)
+    if values.size == 0:
+        return {"median": 0, "std_dev": 0, "percentiles": {f"p{p}": 0 for p in PERCENTILES}}
+    return {
+        "median": round(float(np.median(values)), 2),
+        "std_dev": round(float(np.std(values)), 2),
+        "percentiles": {
+            f"p{p}": round(float(value), 2) for p, value in zip(PERCENTILES, np.percentile(values, PERCENTILES))
+        },
+    }
@@ -0,0 +1,238 @@
+from django.conf import settings
+from django.db import transaction
+from assessments.models import Assessment, StudentQuestionScore
+from assessments.signals import scores_bulk_saved
+from results.aggregates import upsert_options
+
+
+def _cell_error(student_id, question_id, error):
+    return {"student_id": student_id, "question_id": question_id, "error": error}
+
+
+def _cell_conflict(student_id, question_id, score):
+    return {
+        "student_id": student_id,
+        "question_id": question_id,
+        "marks_obtained": score.marks_obtained if score else None,
+        "version": score.version if score else 0,
+        "error": "These marks were changed by someone else; reload to see them.",
+    }
+
+
+class ScoreValidator:
+    """
+    Validates score cells of one assessment against its questions' max marks and enrolled
+    students, both loaded once, so any number of cells is checked in memory.
+    """
+
+    def __init__(self, assessment):
+        self.assessment = assessment
+        self.question_marks = dict(assessment.questions.values_list('id', 'marks'))
+        self.enrolled = set(assessment.section.students.values_list('id', flat=True))
+
+    def validate(self, student_id, question_id, marks_obtained):
+        """
+        Return (marks, error) for one cell. A blank cell clears the mark: it is None
+        (ungraded, the row is deleted) in sparse mode (OBE_SPARSE_SCORES) and 0 otherwise,
+        where every cell keeps a zero placeholder row.
+        """
+        blank = marks_obtained is None or str(marks_obtained).strip() == ""
+        if not blank:
+            try:
+                marks_obtained = float(marks_obtained)
+            except (TypeError, ValueError):
+                return None, "Invalid marks format."
+
+        if question_id not in self.question_marks:
+            return None, "Question not found."
+        if student_id not in self.enrolled:
+            return None, "Student is not enrolled in this section."
+        if blank:
+            return (None if settings.OBE_SPARSE_SCORES else 0.0), None
+        if marks_obtained < 0:
+            return None, "Marks cannot be negative."
+        if marks_obtained > self.question_marks[question_id]:
+            return None, f"Marks cannot exceed {self.question_marks[question_id]}."
+        return marks_obtained, None
+
+
+def validate_score_cells(assessment, cells):
+    """
+    Validate {student_id, question_id, marks_obtained} cells of the score grid.
+    Returns ({(student_id, question_id): marks}, errors); cleared cells map to None.
+    """
+    validator = ScoreValidator(assessment)
+    values, errors = {}, []
+    for cell in cells:
+        student_id = cell.get('student_id')
+        question_id = cell.get('question_id')
+        try:
+            student_id, question_id = int(student_id), int(question_id)
+        except (TypeError, ValueError):
+            errors.append(_cell_error(student_id, question_id, "Invalid student or question id."))
+            continue
+
+        marks_obtained, error = validator.validate(student_id, question_id, cell.get('marks_obtained'))
+        if error:
+            errors.append(_cell_error(student_id, question_id, error))
+        else:
+            values[(student_id, question_id)] = marks_obtained
+    return values, errors
+
+
+def save_score_cells(assessment, values, batch_size=1000):
+    """
+    Upsert validated {(student_id, question_id): marks} of one assessment in a single
+    transaction, skipping unchanged cells and deleting the rows of cleared (None) cells,
+    and send `scores_bulk_saved` so aggregates and derived results are refreshed once for
+    the whole batch. Returns the number of cells written.
+    """
+    student_ids = {student_id for student_id, _ in values}
+    current = {
+        (student_id, question_id): (score_id, marks_obtained, version)
+        for score_id, student_id, question_id, marks_obtained, version in StudentQuestionScore.objects.filter(
+            assessment=assessment, student_id__in=student_ids
+        ).values_list('id', 'student_id', 'question_id', 'marks_obtained', 'version')
+    }
+    changed, cleared = [], []
+    for (student_id, question_id), marks_obtained in values.items():
+        score_id, current_marks, current_version = current.get((student_id, question_id), (None, None, 0))
+        if current_marks == marks_obtained:
+            continue
+        if marks_obtained is None:
+            cleared.append((student_id, score_id))
+        else:
+            changed.append(StudentQuestionScore(
+                student_id=student_id, question_id=question_id,
+                marks_obtained=marks_obtained, version=current_version + 1,
+                assessment_id=assessment.id, section_id=assessment.section_id
+            ))
+    if not changed and not cleared:
+        return 0
+
+    with transaction.atomic():
+        if changed:
+            StudentQuestionScore.objects.bulk_create(
+                changed,
+                batch_size=batch_size,
+                **upsert_options(['student', 'question'], ['marks_obtained', 'version']),
+            )
+        score_ids = [score_id for _, score_id in cleared]
+        for start in range(0, len(score_ids), batch_size):
+            StudentQuestionScore.objects.filter(id__in=score_ids[start:start + batch_size]).delete()
+        _scores_saved(
+            assessment, {score.student_id for score in changed} | {student_id for student_id, _ in cleared}
+        )
+    return len(changed) + len(cleared)
+
+
+def _scores_saved(assessment, student_ids):
+    scores_bulk_saved.send(sender=Assessment, assessment=assessment, student_ids=student_ids)
+
+
+def save_score_changes(assessment, cells):
+    """
+    Apply only the changed cells of the marks grid, each carrying the `version` of the
+    score row it was edited from. Cells whose row has moved on since are rejected as
+    conflicts (with the current marks and version) instead of overwriting it; the rest
+    are validated and written in one transaction, locking just the touched rows. Cleared
+    cells are deleted in sparse mode (see ScoreValidator.validate).
+    Returns (saved, conflicts, errors), each a list of per-cell dicts.
+    """
+    validator = ScoreValidator(assessment)
+    edits, errors = {}, []
+    for cell in cells:
+        student_id = cell.get('student_id')
+        question_id = cell.get('question_id')
+        try:
+            student_id, question_id = int(student_id), int(question_id)
+            version = int(cell['version'])
+        except (KeyError, TypeError, ValueError):
+            errors.append(_cell_error(student_id, question_id, "Invalid student, question or version."))
+            continue
+
+        marks_obtained, error = validator.validate(student_id, question_id, cell.get('marks_obtained'))
+        if error:
+            errors.append(_cell_error(student_id, question_id, error))
+        else:
+            edits[(student_id, question_id)] = (marks_obtained, version)
+
+    saved, conflicts = [], []
+    if not edits:
+        return saved, conflicts, errors
+
+    with transaction.atomic():
+        rows = {
+            (score.student_id, score.question_id): score
+            for score in StudentQuestionScore.objects.select_for_update().filter(
+                assessment=assessment,
+                student_id__in={student_id for student_id, _ in edits},
+                question_id__in={question_id for _, question_id in edits},
+            )
+        }
+        to_update, to_create, to_delete = [], [], []
+        for (student_id, question_id), (marks_obtained, version) in edits.items():
+            score = rows.get((student_id, question_id))
+            current_version = score.version if score else 0
+            if version != current_version:
+                conflicts.append(_cell_conflict(student_id, question_id, score))
+                continue
+            if marks_obtained is None:
+                if score is not None:
+                    to_delete.append(score)
+                saved.append({"student_id": student_id, "question_id": question_id, "marks_obtained": None, "version": 0})
+                continue
+            if score is None:
+                score = StudentQuestionScore(
+                    student_id=student_id, question_id=question_id, marks_obtained=marks_obtained, version=1,
+                    assessment_id=assessment.id, section_id=assessment.section_id
+                )
+                to_create.append(score)
+            elif score.marks_obtained != marks_obtained:
+                score.marks_obtained = marks_obtained
+                score.version += 1
+                to_update.append(score)
+            saved.append({
+                "student_id": student_id,
+                "question_id": question_id,
+                "marks_obtained": score.marks_obtained,
+                "version": score.version,
+            })
+
+        if to_update:
+            StudentQuestionScore.objects.bulk_update(to_update, ['marks_obtained', 'version'])
+        if to_create:
+            to_create = _create_missing_scores(assessment, to_create, saved, conflicts)
+        if to_delete:
+            StudentQuestionScore.objects.filter(id__in=[score.id for score in to_delete]).delete()
+        if to_update or to_create or to_delete:
+            _scores_saved(assessment, {score.student_id for score in to_update + to_create + to_delete})
+    return saved, conflicts, errors
+
+
+def _create_missing_scores(assessment, scores, saved, conflicts):
+    """
+    Insert new score rows of save_score_changes. A row created by a concurrent first
+    write since the locked read makes the insert skip that cell; it is moved from
+    `saved` to `conflicts` with the winning marks. Returns the scores actually created.
+    """
+    StudentQuestionScore.objects.bulk_create(scores, ignore_conflicts=True)
+    stored = {
+        (score.student_id, score.question_id): score
+        for score in StudentQuestionScore.objects.select_for_update().filter(
+            assessment=assessment,
+            student_id__in={score.student_id for score in scores},
+            question_id__in={score.question_id for score in scores},
+        )
+    }
+    created, lost = [], set()
+    for score in scores:
+        key = (score.student_id, score.question_id)
+        current = stored.get(key)
+        if current is not None and (current.marks_obtained, current.version) == (score.marks_obtained, score.version):
+            created.append(score)
+        else:
+            lost.add(key)
+            conflicts.append(_cell_conflict(score.student_id, score.question_id, current))
+    saved[:] = [cell for cell in saved if (cell["student_id"], cell["question_id"]) not in lost]
+    return created
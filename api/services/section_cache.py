@@ -0,0 +1,88 @@
+import uuid
+from django.core.cache import cache
+
+OUTCOME_MAPPING_VERSION_KEY = "outcomes:mapping_version"
+
+
+def _structure_version_key(section_id):
+    return f"section:{section_id}:structure_version"
+
+
+def _version(key):
+    version = cache.get(key)
+    if version is None:
+        version = uuid.uuid4().hex
+        cache.add(key, version, timeout=None)
+        version = cache.get(key, version)
+    return version
+
+
+def section_structure_version(section_id):
+    """
+    Return the current structure version token of a section. Cached values that depend
+    on the section's assessments, questions, CLO links or breakdown embed this token in
+    their key, so bumping it invalidates all of them at once.
+    """
+    return _version(_structure_version_key(section_id))
+
+
+def bump_section_structure_version(*section_ids):
+    """Invalidate every cached value derived from the given sections' structure."""
+    cache.set_many({_structure_version_key(section_id): uuid.uuid4().hex for section_id in section_ids}, timeout=None)
+
+
+def outcome_mapping_version():
+    """Version token of the PLO definitions and CLO → PLO mappings of all programs."""
+    return _version(OUTCOME_MAPPING_VERSION_KEY)
+
+
+def bump_outcome_mapping_version():
+    """Invalidate every cached value derived from PLOs or PloCloMapping rows."""
+    cache.set(OUTCOME_MAPPING_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+
+
+def get_or_build_section_value(section_id, name, build):
+    """
+    Return the cached `name` value of a section for its current structure version,
+    calling `build()` and caching the result on a miss.
+    """
+    key = f"section:{section_id}:{name}:{section_structure_version(section_id)}"
+    value = cache.get(key)
+    if value is None:
+        value = build()
+        cache.set(key, value, timeout=None)
+    return value
+
+
+def _student_scores_version_key(section_id, student_id):
+    return f"section:{section_id}:student:{student_id}:scores_version"
+
+
+def student_scores_version(section_id, student_id):
+    """Version token of one student's scores and enrollment in a section."""
+    return _version(_student_scores_version_key(section_id, student_id))
+
+
+def bump_student_scores_version(section_id, student_ids):
+    """Invalidate cached values derived from the given students' scores in a section."""
+    cache.set_many(
+        {_student_scores_version_key(section_id, student_id): uuid.uuid4().hex for student_id in student_ids},
+        timeout=None,
+    )
+
+
+def _clo_attainment_version_key(section_id):
+    return f"section:{section_id}:clo_attainment_version"
+
+
+def clo_attainment_versions(section_ids):
+    """{section_id: version token} of the sections' stored CLO attainment (None until first bumped)."""
+    cached = cache.get_many([_clo_attainment_version_key(section_id) for section_id in section_ids])
+    return {section_id: cached.get(_clo_attainment_version_key(section_id)) for section_id in section_ids}
+
+
+def bump_clo_attainment_version(*section_ids):
+    """Mark CLO attainment computed from the sections' earlier scores as stale."""
+    cache.set_many(
+        {_clo_attainment_version_key(section_id): uuid.uuid4().hex for section_id in section_ids}, timeout=None
+    )
@@ -0,0 +1,116 @@
+from collections import defaultdict
+from django.db.models import Sum, Value
+from django.db.models.functions import Coalesce
+from assessments.models import Assessment, Question, StudentQuestionScore
+from outcomes.models import CourseLearningOutcome
+
+
+class SectionStructure:
+    """
+    Assessments, questions and question→CLO links of a section, loaded with a
+    fixed number of grouped queries. Result services compute everything else
+    in memory from these lists instead of querying per assessment/question.
+    """
+
+    def __init__(self, section, assessments=None, questions=None, question_clo_links=None, clos=None):
+        self.section = section
+        self.breakdown = section.assessmentbreakdown.get_assessment_types()
+
+        # Lists preloaded by load_many() are used as-is; otherwise they are queried for this section
+        if assessments is None:
+            assessments = Assessment.objects.filter(section=section).order_by('id')
+        if questions is None:
+            questions = Question.objects.filter(assessment__section=section).order_by('id')
+        if clos is None:
+            clos = CourseLearningOutcome.objects.filter(course_id=section.course_id).order_by('id')
+        if question_clo_links is None:
+            question_clo_links = Question.clo.through.objects.filter(
+                question__assessment__section=section
+            ).values_list('question_id', 'courselearningoutcome_id')
+
+        self.assessments = list(assessments)
+        self.questions = list(questions)
+        self.clos = list(clos)
+
+        # Lookup tables used by the result services
+        self.questions_by_assessment = defaultdict(list)
+        for question in self.questions:
+            self.questions_by_assessment[question.assessment_id].append(question)
+
+        self.assessments_by_type = defaultdict(list)
+        for assessment in self.assessments:
+            self.assessments_by_type[assessment.type].append(assessment)
+
+        self.clo_ids_by_question = defaultdict(list)
+        for question_id, clo_id in question_clo_links:
+            self.clo_ids_by_question[question_id].append(clo_id)
+
+    @classmethod
+    def load_many(cls, sections):
+        """
+        Return {section_id: SectionStructure} for many sections with the same four grouped
+        queries a single section needs. Sections must have their assessmentbreakdown loaded
+        (select_related) to avoid a query per section.
+        """
+        sections = list(sections)
+        section_ids = [section.id for section in sections]
+
+        assessments_by_section = defaultdict(list)
+        section_by_assessment = {}
+        for assessment in Assessment.objects.filter(section_id__in=section_ids).order_by('id'):
+            assessments_by_section[assessment.section_id].append(assessment)
+            section_by_assessment[assessment.id] = assessment.section_id
+
+        questions_by_section = defaultdict(list)
+        section_by_question = {}
+        for question in Question.objects.filter(assessment__section_id__in=section_ids).order_by('id'):
+            section_id = section_by_assessment[question.assessment_id]
+            questions_by_section[section_id].append(question)
+            section_by_question[question.id] = section_id
+
+        links_by_section = defaultdict(list)
+        for question_id, clo_id in Question.clo.through.objects.filter(
+            question__assessment__section_id__in=section_ids
+        ).values_list('question_id', 'courselearningoutcome_id'):
+            links_by_section[section_by_question[question_id]].append((question_id, clo_id))
+
+        clos_by_course = defaultdict(list)
+        for clo in CourseLearningOutcome.objects.filter(
+            course_id__in={section.course_id for section in sections}
+        ).order_by('id'):
+            clos_by_course[clo.course_id].append(clo)
+
+        return {
+            section.id: cls(
+                section,
+                assessments=assessments_by_section[section.id],
+                questions=questions_by_section[section.id],
+                question_clo_links=links_by_section[section.id],
+                clos=clos_by_course[section.course_id],
+            )
+            for section in sections
+        }
+
+
+def load_student_scores(section, student_id):
+    """
+    Return {question_id: marks_obtained} for one student in a section (one query).
+    Questions without a score row are simply missing from the dict.
+    """
+    return dict(
+        StudentQuestionScore.objects.filter(
+            student_id=student_id, section=section
+        ).values_list('question_id', 'marks_obtained')
+    )
+
+
+def load_assessments_with_totals(section):
+    """
+    Return the section's assessments (ordered by id), each annotated with `total_marks`.
+    """
+    return list(
+        Assessment.objects.filter(section=section)
+        .annotate(total_marks=Coalesce(Sum('questions__marks'), Value(0.0)))
+        .order_by('id')
+    )
+
@@ -0,0 +1,127 @@
+from django.core.cache import cache
+from api.services.section_cache import section_structure_version, student_scores_version
+from api.services.section_structure import SectionStructure, load_student_scores
+from api.services.student_standing import section_standing
+
+
+def _percentage(obtained, total):
+    return (float(obtained) / total) * 100 if total > 0 else 0
+
+
+def type_details(section_id, assessment_type, weight, assessments):
+    """Level 2 payload from the type's assessment entries of the result tree."""
+    type_total_marks = sum(assessment["total_marks"] for assessment in assessments)
+    type_obtained_marks = sum(assessment["student_obtained_marks"] for assessment in assessments)
+    type_completion_percentage = (sum(assessment["weightage"] for assessment in assessments) / 100) * weight if weight > 0 else 0
+    student_type_percentage = (
+        (float(type_obtained_marks) / type_total_marks) * (type_completion_percentage / 100) * weight
+        if type_total_marks > 0
+        else 0
+    )
+
+    return {
+        "section_id": section_id,
+        "assessment_type": assessment_type,
+        "type_allocated_weight": weight,
+        "type_completion_percentage": round(type_completion_percentage, 2),
+        "student_type_percentage": round(student_type_percentage, 2),
+        "assessments": [
+            {
+                "assessment_id": assessment["assessment_id"],
+                "title": assessment["title"],
+                "total_marks": assessment["total_marks"],
+                "student_obtained_marks": assessment["student_obtained_marks"],
+                "assessment_percentage": round(assessment["assessment_percentage"], 2),
+                "weighted_contribution": round((assessment["assessment_percentage"] * weight) / 100, 2),
+            }
+            for assessment in assessments
+        ],
+    }
+
+
+def _build_student_result_tree(section, student_id):
+    structure = SectionStructure(section)
+    scores = load_student_scores(section, student_id)
+    breakdown = structure.breakdown
+
+    assessments = {}
+    obtained_by_assessment = {}
+    for assessment in structure.assessments:
+        questions = structure.questions_by_assessment[assessment.id]
+        total_marks = float(sum(question.marks for question in questions))
+        obtained_marks = float(sum(scores.get(question.id, 0.0) for question in questions))
+        assessment.total_marks = total_marks  # For section_standing()
+        obtained_by_assessment[assessment.id] = obtained_marks
+
+        # Level 3: one assessment with its questions
+        assessments[assessment.id] = {
+            "section_id": section.id,
+            "assessment_type": assessment.type,
+            "assessment_id": assessment.id,
+            "title": assessment.title,
+            "total_marks": total_marks,
+            "student_obtained_marks": obtained_marks,
+            "assessment_percentage": round(_percentage(obtained_marks, total_marks), 2),
+            "questions": [
+                {
+                    "question_id": question.id,
+                    "total_marks": question.marks,
+                    "student_obtained_marks": scores.get(question.id, 0),
+                    "question_percentage": round(_percentage(scores.get(question.id, 0), question.marks), 2),
+                }
+                for question in questions
+            ],
+        }
+
+    # Level 1: section overview
+    total_completion, student_performance, types = section_standing(breakdown, structure.assessments, obtained_by_assessment)
+    overview = {
+        "section_id": section.id,
+        "total_weight": 100,
+        "course_completion": round(total_completion, 2),
+        "student_current_overall": round(student_performance, 2),
+        "assessment_types": [
+            {
+                **type_data,
+                "completion_percentage": round(type_data["completion_percentage"], 2),
+                "student_earned_percentage_of_this_type": round(type_data["student_earned_percentage_of_this_type"], 2),
+            }
+            for type_data in types
+        ],
+    }
+
+    # Level 2: one entry per assessment type of the breakdown
+    type_assessments = {assessment_type: [] for assessment_type in breakdown}
+    for assessment in structure.assessments:
+        type_assessments.setdefault(assessment.type, []).append({
+            "assessment_id": assessment.id,
+            "title": assessment.title,
+            "weightage": assessment.weightage,
+            "total_marks": assessment.total_marks,
+            "student_obtained_marks": obtained_by_assessment[assessment.id],
+            "assessment_percentage": _percentage(obtained_by_assessment[assessment.id], assessment.total_marks),
+        })
+    types_details = {
+        assessment_type: type_details(section.id, assessment_type, breakdown.get(assessment_type, 0), entries)
+        for assessment_type, entries in type_assessments.items()
+    }
+
+    return {"overview": overview, "types": types_details, "assessments": assessments}
+
+
+def student_result_tree(section, student_id):
+    """
+    All three drill-down levels of a student's result in a section (loaded with
+    select_related('assessmentbreakdown')): {"overview", "types": {type: ...},
+    "assessments": {assessment_id: ...}}. Built with a fixed number of queries and
+    cached until the section's structure or the student's scores in it change.
+    """
+    key = (
+        f"section:{section.id}:student:{student_id}:result_tree:"
+        f"{section_structure_version(section.id)}:{student_scores_version(section.id, student_id)}"
+    )
+    tree = cache.get(key)
+    if tree is None:
+        tree = _build_student_result_tree(section, student_id)
+        cache.set(key, tree)
+    return tree
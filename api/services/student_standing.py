@@ -0,0 +1,98 @@
+from collections import defaultdict
+from django.db.models import Sum, Value
+from django.db.models.functions import Coalesce
+from assessments.models import Assessment
+from outcomes.models import CourseLearningOutcome
+from results.models import StudentAssessmentAggregate
+from api.services.plo_attainment import load_clo_attainment
+
+
+def section_standing(breakdown, assessments, obtained):
+    """
+    Course completion and a student's current overall score in one section.
+
+    `assessments` are the section's assessments annotated with `total_marks`, and
+    `obtained` maps assessment ids to the student's obtained marks. Returns
+    (course_completion, student_current_overall, per-type rows), unrounded.
+    """
+    assessments_by_type = defaultdict(list)
+    for assessment in assessments:
+        assessments_by_type[assessment.type].append(assessment)
+
+    total_completion = 0
+    student_performance = 0
+    types = []
+    for assessment_type, weight in breakdown.items():
+        type_assessments = assessments_by_type[assessment_type]
+        completion_percentage = (sum(a.weightage for a in type_assessments) / 100) * weight if weight > 0 else 0
+
+        type_total_marks = sum(a.total_marks for a in type_assessments)
+        type_obtained_marks = sum(obtained.get(a.id, 0) for a in type_assessments)
+        student_performance_in_type = (
+            (float(type_obtained_marks) / type_total_marks) * (completion_percentage / 100) * weight
+            if type_total_marks > 0
+            else 0
+        )
+
+        total_completion += completion_percentage
+        student_performance += student_performance_in_type
+        types.append({
+            "type": assessment_type,
+            "allocated_weight": weight,
+            "completion_percentage": completion_percentage,
+            "student_earned_percentage_of_this_type": student_performance_in_type,
+        })
+    return total_completion, student_performance, types
+
+
+def student_section_standings(student, sections):
+    """
+    Return {section_id: standing} for all of a student's `sections` (loaded with
+    select_related('assessmentbreakdown')) in one batched pass: course completion,
+    current overall and a CLO attainment summary per section. Costs a fixed number of
+    queries whatever the number of sections; stale CLO attainment is recomputed together.
+    """
+    sections = [section for section in sections if hasattr(section, 'assessmentbreakdown')]
+    section_ids = [section.id for section in sections]
+
+    assessments_by_section = defaultdict(list)
+    for assessment in Assessment.objects.filter(section_id__in=section_ids).annotate(
+        total_marks=Coalesce(Sum('questions__marks'), Value(0.0))
+    ).order_by('id'):
+        assessments_by_section[assessment.section_id].append(assessment)
+
+    obtained = dict(
+        StudentAssessmentAggregate.objects.filter(
+            student=student, assessment__section_id__in=section_ids
+        ).values_list('assessment_id', 'obtained_sum')
+    )
+
+    clos = {
+        clo.id: clo for clo in CourseLearningOutcome.objects.filter(
+            course_id__in={section.course_id for section in sections}
+        )
+    }
+    clo_rows = defaultdict(list)
+    for section_id, _, clo_id, attained, possible in load_clo_attainment(sections, [student.id]):
+        clo_rows[section_id].append((clos[clo_id], attained, possible))
+
+    standings = {}
+    for section in sections:
+        completion, overall, _ = section_standing(
+            section.assessmentbreakdown.get_assessment_types(), assessments_by_section[section.id], obtained
+        )
+        standings[section.id] = {
+            "course_completion": round(completion, 2),
+            "student_current_overall": round(overall, 2),
+            "clo_summary": [
+                {
+                    "clo_id": f"CLO{clo.CLO}",
+                    "title": clo.heading,
+                    "attained": round(attained, 2),
+                    "possible": round(possible, 2),
+                    "attainment": round(attained / possible * 100, 2) if possible > 0 else 0,
+                }
+                for clo, attained, possible in sorted(clo_rows[section.id], key=lambda row: row[0].CLO)
+            ],
+        }
+    return standings
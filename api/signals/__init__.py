@@ -0,0 +1 @@
+from .cache_signals import *
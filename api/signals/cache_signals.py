@@ -0,0 +1,144 @@
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from assessments.models import Assessment, AssessmentBreakdown, Question, StudentQuestionScore
+from assessments.signals import scores_bulk_saved
+from outcomes.models import CourseLearningOutcome, PloCloMapping, ProgramLearningOutcome
+from sections.models import Section
+from programs.models import Program
+from courses.models import Course
+from users.models import CustomUser
+from api.services.section_cache import (
+    bump_section_structure_version, bump_outcome_mapping_version, bump_student_scores_version
+)
+from api.services.plo_attainment import invalidate_clo_attainment
+from api.services.dashboard_stats import invalidate_dashboard_stats
+
+def invalidate_sections(section_ids):
+    """
+    Drop cached structure values and stored CLO attainment of the given sections.
+    """
+    section_ids = list(section_ids)
+    bump_section_structure_version(*section_ids)
+    invalidate_clo_attainment(*section_ids)
+
+@receiver(post_save, sender=Assessment)
+@receiver(post_delete, sender=Assessment)
+@receiver(post_save, sender=AssessmentBreakdown)
+def invalidate_section_structure(sender, instance, **kwargs):
+    """
+    Assessment type/weightage and breakdown changes alter every cached section structure value.
+    """
+    invalidate_sections([instance.section_id])
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def invalidate_section_structure_on_question_change(sender, instance, **kwargs):
+    """
+    Question create/delete/marks changes alter the section's question weights.
+    """
+    section_ids = Assessment.objects.filter(pk=instance.assessment_id).values_list('section_id', flat=True)
+    invalidate_sections(section_ids)
+
+@receiver(m2m_changed, sender=Question.clo.through)
+def invalidate_section_structure_on_clo_mapping_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Question ↔ CLO links decide how question weights are distributed between CLOs.
+    """
+    if not action.startswith('post_'):
+        return
+    if reverse:
+        # `instance` is a CLO; every section of its course may be affected
+        section_ids = Section.objects.filter(course_id=instance.course_id).values_list('id', flat=True)
+    else:
+        section_ids = Assessment.objects.filter(pk=instance.assessment_id).values_list('section_id', flat=True)
+    invalidate_sections(section_ids)
+
+@receiver(post_save, sender=CourseLearningOutcome)
+@receiver(post_delete, sender=CourseLearningOutcome)
+def invalidate_course_sections_on_clo_change(sender, instance, **kwargs):
+    """
+    CLO numbering, headings and weightages are part of the cached attainment structure.
+    """
+    section_ids = Section.objects.filter(course_id=instance.course_id).values_list('id', flat=True)
+    invalidate_sections(section_ids)
+
+@receiver(post_save, sender=StudentQuestionScore)
+def invalidate_clo_attainment_on_score_change(sender, instance, **kwargs):
+    """
+    Scores feed the stored CLO attainment of the score's section and the student's
+    cached result tree. post_delete is left unhandled so bulk deletes stay a single query;
+    every path that deletes score rows invalidates on its own: question deletes, enrollment
+    removals, cleared grid and import cells (through scores_bulk_saved), and
+    collapse_placeholder_scores, whose zero rows never changed a derived value.
+    """
+    invalidate_clo_attainment(instance.section_id)
+    bump_student_scores_version(instance.section_id, [instance.student_id])
+
+@receiver(scores_bulk_saved)
+def invalidate_clo_attainment_on_bulk_score_save(sender, assessment, student_ids, **kwargs):
+    """
+    Bulk score writes skip post_save; drop the section's stored CLO attainment and the
+    students' cached result trees once per batch.
+    """
+    invalidate_clo_attainment(assessment.section_id)
+    bump_student_scores_version(assessment.section_id, student_ids)
+
+@receiver(m2m_changed, sender=Section.students.through)
+def invalidate_clo_attainment_on_enrollment_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Enrollment changes add or drop students from the stored CLO attainment, and create or
+    remove the students' score rows behind their cached result trees.
+    """
+    if reverse:
+        # `instance` is a student and pk_set holds section ids; a clear has no pk_set,
+        # so its sections are read before they are removed
+        if action == 'pre_clear':
+            section_ids = list(instance.enrolled_sections.values_list('id', flat=True))
+        elif action in ('post_add', 'post_remove'):
+            section_ids = pk_set
+        else:
+            return
+        invalidate_clo_attainment(*section_ids)
+        for section_id in section_ids:
+            bump_student_scores_version(section_id, [instance.pk])
+    else:
+        if action == 'pre_clear':
+            bump_student_scores_version(instance.pk, instance.students.values_list('id', flat=True))
+        elif action in ('post_add', 'post_remove'):
+            bump_student_scores_version(instance.pk, pk_set)
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            invalidate_clo_attainment(instance.pk)
+
+@receiver(post_save, sender=PloCloMapping)
+@receiver(post_delete, sender=PloCloMapping)
+@receiver(post_save, sender=ProgramLearningOutcome)
+@receiver(post_delete, sender=ProgramLearningOutcome)
+def invalidate_outcome_mappings(sender, instance, **kwargs):
+    """
+    PLO definitions and CLO → PLO weightages are part of every cached PLO transcript.
+    """
+    bump_outcome_mapping_version()
+
+@receiver(post_save, sender=Program)
+@receiver(post_delete, sender=Program)
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+@receiver(post_save, sender=Section)
+@receiver(post_delete, sender=Section)
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def invalidate_dashboard_stats_on_change(sender, instance, update_fields=None, **kwargs):
+    """
+    Program types, section statuses and user roles are counted on the admin dashboard.
+    """
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return  # Logins do not change any count
+    invalidate_dashboard_stats()
+
+@receiver(m2m_changed, sender=Course.programs.through)
+def invalidate_dashboard_stats_on_course_programs_change(sender, action, **kwargs):
+    """
+    Course ↔ Program links are the dashboard's courses-per-program counts.
+    """
+    if action.startswith('post_'):
+        invalidate_dashboard_stats()
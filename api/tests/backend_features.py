@@ -0,0 +1,23 @@
+from contextlib import contextmanager
+from unittest import mock
+from django.db import connection
+from django.db.models.constants import OnConflict
+
+
+@contextmanager
+def mysql_upserts():
+    """
+    Make the SQLite test database upsert like MySQL/MariaDB: bulk_create() rejects a
+    conflict target, and update_conflicts updates the row hit by any unique key.
+    """
+    def on_conflict_suffix_sql(fields, on_conflict, update_fields, unique_fields):
+        if on_conflict != OnConflict.UPDATE:
+            return ""  # INSERT OR IGNORE covers ignore_conflicts
+        if list(unique_fields):
+            raise AssertionError("MySQL upserts take no conflict target.")
+        quoted = map(connection.ops.quote_name, update_fields)
+        return "ON CONFLICT DO UPDATE SET " + ", ".join(f"{field} = EXCLUDED.{field}" for field in quoted)
+
+    with mock.patch.object(connection.features, 'supports_update_conflicts_with_target', False), \
+            mock.patch.object(connection.ops, 'on_conflict_suffix_sql', on_conflict_suffix_sql):
+        yield
@@ -0,0 +1,99 @@
+from assessments.models import Assessment, Question, StudentQuestionScore
+from courses.models import Course
+from outcomes.models import CourseLearningOutcome
+from programs.models import Program
+from sections.models import Section
+from users.models import CustomUser
+
+
+def create_program(abbreviation="CS"):
+    return Program.objects.create(
+        program_title=f"Program {abbreviation}",
+        program_abbreviation=abbreviation,
+        program_type="UG"
+    )
+
+
+def create_course(program, course_id="CS101", clo_count=2):
+    """Create a course linked to a program with `clo_count` CLOs of equal weightage."""
+    course = Course.objects.create(course_id=course_id, name=f"Course {course_id}", credit_hours=3)
+    course.programs.add(program)
+    for number in range(1, clo_count + 1):
+        CourseLearningOutcome.objects.create(
+            course=course,
+            CLO=number,
+            heading=f"CLO heading {number}",
+            description=f"CLO description {number}",
+            weightage=100 // clo_count
+        )
+    return course
+
+
+def create_users(count, role="student", prefix="student"):
+    return [
+        CustomUser.objects.create_user(
+            username=f"{prefix}{index}",
+            first_name=f"First{index}",
+            last_name=f"Last{index}",
+            email=f"{prefix}{index}@example.com",
+            role=role,
+            password="password123"
+        )
+        for index in range(count)
+    ]
+
+
+def create_section(course, program=None, faculty=None, students=(), section="A", **weightages):
+    """
+    Create a section and optionally override its breakdown, e.g. quiz_weightage=20, final_weightage=80.
+    """
+    section = Section.objects.create(
+        course=course,
+        program=program,
+        faculty=faculty,
+        semester="1",
+        section=section,
+        batch="Fall",
+        year=str(Section.CURRENT_YEAR)
+    )
+    if weightages:
+        breakdown = section.assessmentbreakdown
+        breakdown.final_weightage = 0
+        for field, value in weightages.items():
+            setattr(breakdown, field, value)
+        breakdown.save()
+    if students:
+        section.students.add(*students)
+    return section
+
+
+def create_assessment(section, assessment_type="final", weightage=100, marks=(10, 10), clos=None, title=None):
+    """
+    Create an assessment with one question per entry of `marks`.
+    `clos` is a list with one CLO (or list of CLOs) per question; defaults to the course's first CLO.
+    """
+    assessment = Assessment.objects.create(
+        title=title or f"{assessment_type} {Assessment.objects.filter(section=section).count() + 1}",
+        section=section,
+        date="2025-01-01",
+        type=assessment_type,
+        weightage=weightage
+    )
+    default_clo = CourseLearningOutcome.objects.filter(course=section.course).order_by('CLO').first()
+    for index, question_marks in enumerate(marks):
+        question = Question.objects.create(assessment=assessment, marks=question_marks)
+        question_clos = clos[index] if clos else default_clo
+        if not isinstance(question_clos, (list, tuple)):
+            question_clos = [question_clos]
+        question.clo.add(*question_clos)
+    return assessment
+
+
+def set_marks(student, assessment, marks):
+    """Save `marks` for the assessment's questions (in id order) through StudentQuestionScore.save()."""
+    for question, obtained in zip(assessment.questions.order_by('id'), marks):
+        score, _ = StudentQuestionScore.objects.get_or_create(
+            student=student, question=question, defaults={'marks_obtained': 0}
+        )
+        score.marks_obtained = obtained
+        score.save()
@@ -0,0 +1,65 @@
+import io
+import json
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from assessments.models import StudentQuestionScore
+from api.services.score_writes import save_score_cells
+from api.tests.factories import create_program, create_course, create_users, create_section, create_assessment
+
+
+class BenchmarkEndpointsTestCase(TestCase):
+    def setUp(self):
+        self.program = create_program()
+        self.course = create_course(self.program)
+        self.faculty = create_users(1, role="faculty", prefix="faculty")[0]
+        self.program.program_incharge = create_users(1, role="faculty", prefix="incharge")[0]
+        self.program.save()
+        self.students = create_users(3)
+        self.section = create_section(
+            self.course, program=self.program, faculty=self.faculty, students=self.students,
+            quiz_weightage=20, final_weightage=80
+        )
+        create_assessment(self.section, "quiz", 100, marks=(5, 5))
+        final = create_assessment(self.section, "final", 100, marks=(10, 10))
+        question_ids = list(final.questions.values_list("id", flat=True))
+        save_score_cells(final, {(student.id, question_id): 4 for student in self.students for question_id in question_ids})
+
+    def run_benchmark(self, **options):
+        stdout = io.StringIO()
+        call_command("benchmark_endpoints", stdout=stdout, stderr=io.StringIO(), **options)
+        return json.loads(stdout.getvalue())
+
+    def test_report(self):
+        """Test that every endpoint is measured successfully with percentiles and query counts."""
+        marks_before = sorted(StudentQuestionScore.objects.values_list("student_id", "question_id", "marks_obtained"))
+        cache.set("other-app:key", "kept")
+        report = self.run_benchmark(sizes=[3], repeat=3, patch_cells=3, label="test")
+
+        self.assertEqual(report["label"], "test")
+        self.assertEqual(report["sections"], [
+            {"id": self.section.id, "size": 3, "students": 3, "assessments": 2, "questions": 4}
+        ])
+        measured = {(result["endpoint"], result["variant"], result["cache"]) for result in report["results"]}
+        self.assertEqual(len(measured), 32)  # 16 requests, cold and warm
+        for endpoint in [
+            ("assessment-marks", "patch"), ("assessment-marks-import", "csv"),
+            ("program-plo-result", ""), ("student-plo-result", ""),
+        ]:
+            self.assertIn((*endpoint, "cold"), measured)
+        for result in report["results"]:
+            self.assertEqual(result["status"], 200, result)
+            self.assertLessEqual(result["p50_ms"], result["p99_ms"])
+            self.assertGreater(result["queries"], 0)
+
+        # The timed writes put the marks grid back as it was, and cold runs leave other cache entries alone
+        self.assertEqual(
+            sorted(StudentQuestionScore.objects.values_list("student_id", "question_id", "marks_obtained")), marks_before
+        )
+        self.assertEqual(cache.get("other-app:key"), "kept")
+
+    def test_no_sections(self):
+        """Test that an unknown section is reported instead of an empty benchmark."""
+        with self.assertRaises(CommandError):
+            self.run_benchmark(sections=[self.section.id + 100])
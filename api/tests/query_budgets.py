@@ -0,0 +1,41 @@
+from urllib.parse import urlsplit
+from django.urls import resolve
+from api.services.query_inspector import QueryInspector
+
+# Maximum queries per request of each route in api/urls.py, by route name, measured with
+# a cold cache. Budgets do not depend on the section size: a route whose query count
+# grows with students, assessments or questions has an N+1 loop.
+QUERY_BUDGETS = {
+    'student-traditional-result': 8,
+    'faculty-traditional-result': 10,
+    'assessment-marks': 19,
+    'faculty-clo-result': 11,
+    'student-clo-result': 11,
+    'admin-dashboard': 5,
+    'student-dashboard': 23,
+    'faculty-dashboard': 4,
+    # SQLite's 999-parameter limit splits the largest seeded import into extra insert batches.
+    'assessment-marks-import': 27,
+    'program-plo-result': 20,
+    'student-plo-result': 18,
+}
+
+
+class QueryBudgetMixin:
+    """TestCase mixin asserting that API requests stay within their route's QUERY_BUDGETS entry."""
+
+    def assertWithinQueryBudget(self, url, data=None, method='get', **extra):
+        """Request `url` with self.client and fail if it runs more queries than its route's budget."""
+        route = resolve(urlsplit(url).path).url_name
+        self.assertIn(route, QUERY_BUDGETS, f"No query budget for route '{route}'")
+
+        with QueryInspector() as inspector:
+            response = getattr(self.client, method)(url, data, **extra)
+        self.assertLess(response.status_code, 400, f"{method.upper()} {url} failed: {response.status_code}")
+
+        repeated = "".join(f"\n  {times} x {shape}" for shape, times in inspector.repeated())
+        self.assertLessEqual(
+            inspector.count, QUERY_BUDGETS[route],
+            f"{method.upper()} {url} ran {inspector.count} queries (budget {QUERY_BUDGETS[route]}){repeated}"
+        )
+        return response
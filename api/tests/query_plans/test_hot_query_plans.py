@@ -0,0 +1,146 @@
+import json
+import re
+from contextlib import nullcontext
+from unittest import skipUnless
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from assessments.models import StudentQuestionScore
+from api.services.result_calculation import calculate_student_results
+from api.services.score_writes import save_score_cells
+from api.tests.backend_features import mysql_upserts
+from api.tests.factories import (
+    create_program, create_course, create_users, create_section, create_assessment, set_marks
+)
+
+SQLITE_SCAN = re.compile(r'\bSCAN (\w+)')
+
+# Tables that grow with enrollments and scores; whole-table reads of small reference
+# tables (e.g. the program list of the dashboards) are expected
+SCORING_TABLES = {
+    'assessments_studentquestionscore',
+    'assessments_assessment',
+    'assessments_question',
+    'assessments_question_clo',
+    'outcomes_courselearningoutcome',
+    'results_studentassessmentaggregate',
+    'results_cloattainmentsnapshot',
+    'results_studentcloattainment',
+    'sections_section_students',
+}
+
+
+def _mysql_tables(plan):
+    """Yield every table access node of a MySQL EXPLAIN FORMAT=JSON plan."""
+    if isinstance(plan, dict):
+        if 'table_name' in plan:
+            yield plan
+        for value in plan.values():
+            yield from _mysql_tables(value)
+    elif isinstance(plan, list):
+        for value in plan:
+            yield from _mysql_tables(value)
+
+
+def full_table_scans(sql):
+    """Return a description of every full scan of a scoring table in the plan of `sql`."""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+            return [
+                row[-1] for row in cursor.fetchall()
+                if (match := SQLITE_SCAN.search(row[-1])) and match.group(1) in SCORING_TABLES
+            ]
+
+        cursor.execute(f"EXPLAIN FORMAT=JSON {sql}")
+        plan = json.loads(cursor.fetchone()[0])
+    # MySQL picks a full scan over an index for tables as small as these fixtures, so
+    # only scans that no index could serve are reported there
+    return [
+        f"{table['table_name']} ({table['access_type']})"
+        for table in _mysql_tables(plan)
+        if table['table_name'] in SCORING_TABLES and table.get('access_type') == 'ALL' and not table.get('possible_keys')
+    ]
+
+
+# Run against MySQL/MariaDB with DB_ENGINE=django.db.backends.mysql (and the DB_* settings):
+#     python manage.py test api/tests/query_plans
+@skipUnless(connection.vendor in ('sqlite', 'mysql'), "EXPLAIN output is only parsed for SQLite and MySQL")
+class HotQueryPlansTestCase(TestCase):
+    """EXPLAIN every SELECT of the scoring hot paths and fail on full table scans."""
+
+    def setUp(self):
+        cache.clear()
+        self.program = create_program()
+        self.course = create_course(self.program)
+        self.faculty = create_users(1, role="faculty", prefix="faculty")[0]
+        self.students = create_users(3)
+        self.student = self.students[0]
+        self.section = create_section(
+            self.course, program=self.program, faculty=self.faculty, students=self.students,
+            quiz_weightage=20, final_weightage=80
+        )
+        # A second section so the section filters have rows to skip
+        create_section(self.course, program=self.program, students=self.students, section="B")
+        self.quiz = create_assessment(self.section, "quiz", 50, marks=(6, 4))
+        self.final = create_assessment(self.section, "final", 100, marks=(20, 30))
+        for student in self.students:
+            set_marks(student, self.quiz, (3, 2))
+            set_marks(student, self.final, (10, 15))
+        self.client = APIClient()
+
+    def assertNoFullScans(self, run):
+        with CaptureQueriesContext(connection) as queries:
+            run()
+        selects = [query["sql"] for query in queries if query["sql"].lstrip().upper().startswith('SELECT')]
+        self.assertTrue(selects)
+        for sql in selects:
+            scans = full_table_scans(sql)
+            self.assertFalse(scans, f"Full table scan {scans} in:\n{sql}")
+
+    def get(self, user, url, data=None):
+        self.client.force_authenticate(user)
+        response = self.client.get(url, data)
+        self.assertEqual(response.status_code, 200)
+
+    def test_student_result_details(self):
+        """Test the plans of every drill-down level of the student result API."""
+        url = f"/api/student/section/{self.section.id}/final_result/"
+        self.assertNoFullScans(lambda: self.get(self.student, url))
+        cache.clear()
+        self.assertNoFullScans(lambda: self.get(
+            self.student, url, {"assessment_type": "final", "assessment_id": self.final.id}
+        ))
+
+    def test_faculty_result_details(self):
+        """Test the plans of the faculty section overview and assessment breakdown."""
+        url = f"/api/faculty/section/{self.section.id}/final_result/"
+        self.assertNoFullScans(lambda: self.get(self.faculty, url, {"show_students": "true"}))
+        self.assertNoFullScans(lambda: self.get(
+            self.faculty, url, {"assessment_type": "quiz", "assessment_id": self.quiz.id}
+        ))
+
+    def test_clo_attainment(self):
+        """Test the plans of the faculty and student CLO attainment APIs."""
+        self.assertNoFullScans(lambda: self.get(self.faculty, f"/api/faculty/section/{self.section.id}/clo_result/"))
+        cache.clear()
+        self.assertNoFullScans(lambda: self.get(self.student, f"/api/student/section/{self.section.id}/clo_result/"))
+
+    def test_result_calculation(self):
+        """Test the plans of calculate_student_results()."""
+        self.assertNoFullScans(lambda: calculate_student_results(self.section.id, self.student.id))
+
+    def test_student_dashboard(self):
+        """Test the plans of the student dashboard with per-section standings."""
+        self.assertNoFullScans(lambda: self.get(self.student, "/api/student_dashboard/", {"include_results": "true"}))
+
+    def test_marks_grid(self):
+        """Test the plans of loading the marks grid and saving changed cells."""
+        self.assertNoFullScans(lambda: self.get(self.faculty, "/api/assessment-marks/", {"id": self.final.id}))
+        question = self.final.questions.order_by('id')[0]
+        # On SQLite, save through the upsert MySQL runs (no conflict target) as well
+        with mysql_upserts() if connection.vendor == 'sqlite' else nullcontext():
+            self.assertNoFullScans(lambda: save_score_cells(self.final, {(self.student.id, question.id): 12}))
+        self.assertEqual(StudentQuestionScore.objects.get(student=self.student, question=question).marks_obtained, 12)
@@ -0,0 +1,86 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from assessments.models import Question, StudentQuestionScore
+from outcomes.models import CourseLearningOutcome
+from api.tests.factories import (
+    create_program, create_course, create_users, create_section, create_assessment, set_marks
+)
+
+
+class CLOAttainmentTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.program = create_program()
+        self.course = create_course(self.program, clo_count=2)
+        self.clo1, self.clo2 = CourseLearningOutcome.objects.filter(course=self.course).order_by('CLO')
+        self.faculty = create_users(1, role="faculty", prefix="faculty")[0]
+        self.student, self.other_student = create_users(2)
+        self.section = create_section(
+            self.course, program=self.program, faculty=self.faculty,
+            students=[self.student, self.other_student], quiz_weightage=40, final_weightage=60
+        )
+        # Quiz: 40 * 50% = 20 points; q1 (4 marks) -> CLO1, q2 (6 marks) -> CLO1 + CLO2
+        self.quiz = create_assessment(self.section, "quiz", 50, marks=(4, 6), clos=[self.clo1, [self.clo1, self.clo2]])
+        # Final: 60 points, single question -> CLO2
+        self.final = create_assessment(self.section, "final", 100, marks=(10,), clos=[self.clo2])
+        set_marks(self.student, self.quiz, (2, 6))
+        set_marks(self.student, self.final, (5,))
+        self.client = APIClient()
+
+    def test_faculty_attainment_values(self):
+        """Test CLO totals, per-type contributions and student attainment."""
+        self.client.force_authenticate(self.faculty)
+        response = self.client.get(f"/api/faculty/section/{self.section.id}/clo_result/")
+        self.assertEqual(response.status_code, 200)
+
+        clo1, clo2 = response.data["data"]["CLOs"]
+        self.assertEqual(clo1["clo_id"], "CLO1")
+        self.assertAlmostEqual(clo1["totalMarks"], 8 + 6)
+        self.assertEqual(list(clo2["assessmentTypeContribution"]), ["quiz", "final"])
+        self.assertAlmostEqual(clo2["assessmentTypeContribution"]["quiz"], 6)
+        self.assertAlmostEqual(clo2["assessmentTypeContribution"]["final"], 60)
+
+        results = response.data["data"]["students"][self.student.username]["clo_results"]
+        self.assertAlmostEqual(results["CLO1"]["quiz"], 2 / 4 * 8 + 6)
+        self.assertAlmostEqual(results["CLO2"]["quiz"], 6)
+        self.assertAlmostEqual(results["CLO2"]["final"], 30)
+
+    def test_types_without_score_rows_are_omitted(self):
+        """Test that a CLO/type pair only appears when the student has a contributing score row."""
+        StudentQuestionScore.objects.filter(student=self.other_student, question__assessment=self.final).delete()
+        self.client.force_authenticate(self.other_student)
+        response = self.client.get(f"/api/student/section/{self.section.id}/clo_result/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["data"]["student"]["clo_results"]["CLO2"], {"quiz": 0.0})
+
+    def test_weight_matrix_is_cached_until_structure_changes(self):
+        """Test that the weight matrix is reused and rebuilt after a question's marks change."""
+        self.client.force_authenticate(self.student)
+        url = f"/api/student/section/{self.section.id}/clo_result/"
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as cached:
+            self.client.get(url)
+        self.assertFalse([q for q in cached if q["sql"].startswith('SELECT "assessments_question"')])
+
+        question = Question.objects.get(assessment=self.final)
+        question.marks = 20
+        question.save()
+        response = self.client.get(url)
+        self.assertAlmostEqual(response.data["data"]["student"]["clo_results"]["CLO2"]["final"], 15)
+
+    def test_faculty_query_count_does_not_grow_with_students(self):
+        """Test that the faculty payload costs the same queries for more students."""
+        self.client.force_authenticate(self.faculty)
+        url = f"/api/faculty/section/{self.section.id}/clo_result/"
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(url)
+        self.section.students.add(*create_users(5, prefix="extra"))
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.get(url)
+        self.assertEqual(len(response.data["data"]["students"]), 7)
+        self.assertEqual(len(small), len(large))
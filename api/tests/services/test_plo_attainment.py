@@ -0,0 +1,189 @@
+from unittest import mock
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from outcomes.models import CourseLearningOutcome, PloCloMapping, ProgramLearningOutcome
+from results.models import CLOAttainmentSnapshot, StudentCLOAttainment
+from api.services.plo_attainment import (
+    compute_clo_attainment, ensure_clo_attainment, program_plo_attainment, student_plo_transcript
+)
+from api.tests.factories import (
+    create_program, create_course, create_users, create_section, create_assessment, set_marks
+)
+
+
+class PLOAttainmentFixtureMixin:
+    def setUp(self):
+        cache.clear()
+        self.program = create_program()
+        self.course = create_course(self.program, clo_count=2)
+        self.clo1, self.clo2 = CourseLearningOutcome.objects.filter(course=self.course).order_by('CLO')
+        self.plo1, self.plo2 = [
+            ProgramLearningOutcome.objects.create(
+                program=self.program, PLO=number, heading=f"PLO heading {number}",
+                description=f"PLO description {number}", weightage=50
+            )
+            for number in (1, 2)
+        ]
+        for plo, clo in ((self.plo1, self.clo1), (self.plo2, self.clo2)):
+            PloCloMapping.objects.create(program=self.program, course=self.course, plo=plo, clo=clo, weightage=100)
+
+        self.students = create_users(3)
+        self.section_a = create_section(self.course, program=self.program, students=self.students[:2])
+        self.section_b = create_section(self.course, students=self.students[2:], section="B")
+        self.final_a = create_assessment(self.section_a, marks=(10, 10), clos=[self.clo1, self.clo2])
+        self.final_b = create_assessment(self.section_b, marks=(10, 10), clos=[self.clo1, self.clo2])
+        set_marks(self.students[0], self.final_a, (5, 10))
+        set_marks(self.students[1], self.final_a, (10, 0))
+        set_marks(self.students[2], self.final_b, (8, 2))
+
+        # A section of the same course run for another program is not part of this program's results
+        other_program = create_program("EE")
+        self.course.programs.add(other_program)
+        other_section = create_section(self.course, program=other_program, students=self.students[:1], section="C")
+        create_assessment(other_section, marks=(10, 10), clos=[self.clo1, self.clo2])
+
+
+class ProgramPLOAttainmentTestCase(PLOAttainmentFixtureMixin, TestCase):
+    def test_rollup_values(self):
+        """Test that CLO attainment is rolled up through the mappings per student and per PLO."""
+        data = program_plo_attainment(self.program, include_students=True)
+
+        self.assertEqual(data["sections"], 2)
+        plo1, plo2 = data["PLOs"]
+        self.assertEqual(plo1["plo_id"], "PLO1")
+        self.assertEqual(plo1["students_assessed"], 3)
+        self.assertEqual(plo1["students_attained"], 3)
+        self.assertAlmostEqual(plo1["average_attainment"], round((50 + 100 + 80) / 3, 2))
+        self.assertEqual(plo2["students_attained"], 1)
+        self.assertAlmostEqual(plo2["average_attainment"], 40.0)
+        self.assertEqual(plo2["sections"], 2)
+
+        self.assertEqual(data["students"]["student0"]["plo_results"], {"PLO1": 50.0, "PLO2": 100.0})
+        self.assertEqual(data["students"]["student2"]["plo_results"], {"PLO1": 80.0, "PLO2": 20.0})
+
+    def test_results_are_stored_and_invalidated(self):
+        """Test that stored CLO attainment is reused until a score of the section changes."""
+        program_plo_attainment(self.program)
+        self.assertEqual(CLOAttainmentSnapshot.objects.count(), 2)
+        self.assertEqual(StudentCLOAttainment.objects.filter(section=self.section_a).count(), 4)
+
+        with CaptureQueriesContext(connection) as queries:
+            program_plo_attainment(self.program)
+        self.assertFalse(any("assessments_studentquestionscore" in q["sql"] for q in queries))
+
+        set_marks(self.students[1], self.final_a, (10, 10))
+        self.assertFalse(CLOAttainmentSnapshot.objects.filter(section=self.section_a).exists())
+        self.assertTrue(CLOAttainmentSnapshot.objects.filter(section=self.section_b).exists())
+
+        data = program_plo_attainment(self.program, include_students=True)
+        self.assertEqual(data["students"]["student1"]["plo_results"]["PLO2"], 100.0)
+
+    def test_scores_changed_while_computing(self):
+        """Test that attainment computed from scores that changed meanwhile is not stored as current."""
+        bulk_create = StudentCLOAttainment.objects.bulk_create
+        changes = [(10, 10)]
+
+        def racing_bulk_create(rows, **kwargs):
+            # Another request saves marks after the scores were read
+            if changes:
+                set_marks(self.students[1], self.final_a, changes.pop())
+            return bulk_create(rows, **kwargs)
+
+        with mock.patch.object(StudentCLOAttainment.objects, 'bulk_create', side_effect=racing_bulk_create):
+            compute_clo_attainment([self.section_a])
+        self.assertFalse(CLOAttainmentSnapshot.objects.filter(section=self.section_a).exists())
+
+        changes.append((10, 10))
+        with mock.patch.object(StudentCLOAttainment.objects, 'bulk_create', side_effect=racing_bulk_create):
+            snapshots = ensure_clo_attainment([self.section_a])
+        self.assertIn(self.section_a.id, snapshots)  # Recomputed from the new marks
+        data = program_plo_attainment(self.program, include_students=True)
+        self.assertEqual(data["students"]["student1"]["plo_results"]["PLO2"], 100.0)
+
+    def test_enrollment_change_invalidates(self):
+        """Test that removing a student drops them from the stored results."""
+        program_plo_attainment(self.program)
+        self.section_a.students.remove(self.students[1])
+        data = program_plo_attainment(self.program, include_students=True)
+        self.assertNotIn("student1", data["students"])
+        self.assertEqual(data["PLOs"][0]["students_assessed"], 2)
+
+    def test_query_count_is_constant(self):
+        """Test that computing the rollup takes the same number of queries however many sections there are."""
+        with CaptureQueriesContext(connection) as small:
+            program_plo_attainment(self.program)
+        CLOAttainmentSnapshot.objects.all().delete()
+
+        for letter in "DEF":
+            section = create_section(self.course, program=self.program, students=self.students, section=letter)
+            create_assessment(section, marks=(10, 10), clos=[self.clo1, self.clo2])
+
+        with CaptureQueriesContext(connection) as large:
+            program_plo_attainment(self.program)
+        self.assertEqual(len(small), len(large))
+
+    def test_api_permissions(self):
+        """Test that only admins and the program incharge can read program-wide results."""
+        client = APIClient()
+        url = f"/api/program/{self.program.id}/plo_result/"
+
+        client.force_authenticate(self.students[0])
+        self.assertEqual(client.get(url).status_code, 403)
+
+        admin = create_users(1, role="admin", prefix="admin")[0]
+        client.force_authenticate(admin)
+        response = client.get(url, {"show_students": "true"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["data"]["PLOs"]), 2)
+        self.assertIn("student0", response.data["data"]["students"])
+
+
+class StudentPLOTranscriptTestCase(PLOAttainmentFixtureMixin, TestCase):
+    def test_transcript_values(self):
+        """Test that the transcript covers every enrolled section, grouped by program."""
+        data = student_plo_transcript(self.students[0])
+
+        self.assertEqual(data["sections"], 2)
+        self.assertEqual([program["program"] for program in data["programs"]], ["CS"])
+        plo1, plo2 = data["programs"][0]["PLOs"]
+        self.assertEqual((plo1["plo_id"], plo1["attainment"], plo1["attained"]), ("PLO1", 50.0, True))
+        self.assertEqual(plo2["attainment"], 100.0)
+        self.assertEqual(plo1["courses"][0]["section_id"], self.section_a.id)
+        self.assertEqual(plo1["courses"][0]["clos"], [{"clo_id": "CLO1", "mapping_weightage": 100, "attainment": 50.0}])
+
+    def test_cached_until_own_section_changes(self):
+        """Test that the transcript is cached and rebuilt only when one of the student's sections changes."""
+        student = self.students[0]
+        student_plo_transcript(student)
+
+        with CaptureQueriesContext(connection) as hit:
+            student_plo_transcript(student)
+        self.assertEqual(len(hit), 2)
+
+        # Another student's section changing leaves the cached transcript in place
+        set_marks(self.students[2], self.final_b, (0, 0))
+        with CaptureQueriesContext(connection) as queries:
+            student_plo_transcript(student)
+        self.assertEqual(len(queries), 2)
+
+        set_marks(student, self.final_a, (10, 10))
+        self.assertEqual(student_plo_transcript(student)["programs"][0]["PLOs"][0]["attainment"], 100.0)
+
+    def test_mapping_change_invalidates(self):
+        """Test that PLO mapping changes are reflected in cached transcripts."""
+        student_plo_transcript(self.students[0])
+        PloCloMapping.objects.filter(plo=self.plo2).delete()
+        data = student_plo_transcript(self.students[0])
+        self.assertEqual([plo["plo_id"] for plo in data["programs"][0]["PLOs"]], ["PLO1"])
+
+    def test_api(self):
+        """Test that the endpoint returns the logged-in student's transcript."""
+        client = APIClient()
+        client.force_authenticate(self.students[2])
+        response = client.get("/api/student/plo_result/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["data"]["student_details"]["sap_id"], "student2")
+        self.assertEqual(response.data["data"]["programs"][0]["PLOs"][1]["attainment"], 20.0)
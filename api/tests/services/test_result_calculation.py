@@ -0,0 +1,76 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from assessments.models import StudentQuestionScore
+from outcomes.models import CourseLearningOutcome
+from api.services.result_calculation import calculate_student_results
+from api.tests.factories import (
+    create_program, create_course, create_users, create_section, create_assessment, set_marks
+)
+
+
+class CalculateStudentResultsTestCase(TestCase):
+    def setUp(self):
+        self.program = create_program()
+        self.course = create_course(self.program, clo_count=2)
+        self.clo1, self.clo2 = CourseLearningOutcome.objects.filter(course=self.course).order_by('CLO')
+        self.student, self.other_student = create_users(2)
+        self.section = create_section(
+            self.course, program=self.program, students=[self.student, self.other_student],
+            quiz_weightage=20, final_weightage=80
+        )
+        self.quiz = create_assessment(self.section, "quiz", 50, marks=(5, 5), clos=[self.clo1, self.clo2])
+        self.final = create_assessment(self.section, "final", 100, marks=(20, 30), clos=[self.clo1, [self.clo1, self.clo2]])
+
+    def test_result_structure_and_values(self):
+        """Test that type, assessment, question and CLO figures are computed from the student's scores."""
+        set_marks(self.student, self.quiz, (5, 0))
+        set_marks(self.student, self.final, (10, 30))
+        set_marks(self.other_student, self.final, (20, 30))
+
+        result = calculate_student_results(self.section.id, self.student.id)
+
+        self.assertEqual([t["type"] for t in result["assessment_types"]], ["quiz", "final"])
+        quiz, final = result["assessment_types"]
+        self.assertEqual(quiz["total_marks"], 10.0)
+        self.assertEqual(quiz["obtained_marks"], 5.0)
+        self.assertAlmostEqual(quiz["completion_percentage"], 10.0)
+        self.assertAlmostEqual(quiz["adjusted_marks"], 10.0)
+        self.assertEqual(final["assessments"][0]["student_obtained_marks"], 40.0)
+        self.assertAlmostEqual(final["adjusted_marks"], 64.0)
+        self.assertAlmostEqual(result["course_completion"], 90.0)
+        self.assertAlmostEqual(result["student_current_overall"], 74.0)
+
+        questions = final["assessments"][0]["questions"]
+        self.assertEqual([q["obtained_marks"] for q in questions], [10.0, 30.0])
+        self.assertEqual([q["percentage"] for q in questions], [50.0, 100.0])
+
+        clo_results = {clo["clo_id"]: clo["obtained_percentage"] for clo in result["clo_based_results"]}
+        self.assertAlmostEqual(clo_results[self.clo1.id], (5 + 10 + 30) / (5 + 20 + 30) * 100)
+        self.assertAlmostEqual(clo_results[self.clo2.id], (0 + 30) / (5 + 30) * 100)
+
+    def test_missing_score_rows_count_as_zero(self):
+        """Test that a question without a score row contributes zero instead of failing."""
+        StudentQuestionScore.objects.filter(student=self.student, question__assessment=self.final).delete()
+        result = calculate_student_results(self.section.id, self.student.id)
+        final = result["assessment_types"][1]
+        self.assertEqual([q["obtained_marks"] for q in final["assessments"][0]["questions"]], [0.0, 0.0])
+
+    def test_query_count_is_constant(self):
+        """Test that /api/results/ issues the same number of queries however many assessments a section has."""
+        client = APIClient()
+        client.force_authenticate(self.student)
+
+        with CaptureQueriesContext(connection) as small:
+            response = client.get("/api/results/", {"section_id": self.section.id})
+        self.assertEqual(response.status_code, 200)
+
+        for _ in range(3):
+            create_assessment(self.section, "quiz", 10, marks=(2, 2, 2, 2))
+
+        with CaptureQueriesContext(connection) as large:
+            response = client.get("/api/results/", {"section_id": self.section.id})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["assessment_types"][0]["assessments"]), 4)
+        self.assertEqual(len(small), len(large))
@@ -0,0 +1,119 @@
+import io
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from assessments.models import StudentQuestionScore
+from results.models import StudentAssessmentAggregate
+from api.services.score_import import import_scores, ScoreImportError
+from api.tests.factories import create_program, create_course, create_users, create_section, create_assessment
+
+
+def csv_file(rows, name="marks.csv"):
+    return SimpleUploadedFile(name, "\n".join(",".join(map(str, row)) for row in rows).encode())
+
+
+class ScoreImportTestCase(TestCase):
+    def setUp(self):
+        self.program = create_program()
+        self.course = create_course(self.program)
+        self.students = create_users(5)
+        self.section = create_section(self.course, program=self.program, students=self.students)
+        self.assessment = create_assessment(self.section, marks=(5, 10))
+        self.q1, self.q2 = self.assessment.questions.order_by('id')
+
+    def marks(self, student, question):
+        return StudentQuestionScore.objects.get(student=student, question=question).marks_obtained
+
+    def test_csv_import(self):
+        """Test that a CSV keyed by username and question number is upserted and aggregates follow."""
+        updated = import_scores(self.assessment, csv_file([
+            ["username", "name", "Q1", "Q2"],
+            ["student0", "First0 Last0", 4, 9.5],
+            ["student1", "First1 Last1", "", 3],
+        ]))
+
+        self.assertEqual(updated, 3)
+        self.assertEqual((self.marks(self.students[0], self.q1), self.marks(self.students[0], self.q2)), (4, 9.5))
+        self.assertEqual(self.marks(self.students[1], self.q1), 0)  # A blank cell is ungraded
+        aggregate = StudentAssessmentAggregate.objects.get(student=self.students[0], assessment=self.assessment)
+        self.assertEqual(aggregate.obtained_sum, 13.5)
+
+    def test_blank_cells_clear_graded_marks(self):
+        """Test that a blank cell clears a graded mark, deleting its row in sparse mode."""
+        import_scores(self.assessment, csv_file([["username", "Q1", "Q2"], ["student0", 4, 9]]))
+
+        import_scores(self.assessment, csv_file([["username", "Q1", "Q2"], ["student0", "", 9]]))
+        self.assertEqual(self.marks(self.students[0], self.q1), 0)
+
+        import_scores(self.assessment, csv_file([["username", "Q1", "Q2"], ["student0", 4, 9]]))
+        with self.settings(OBE_SPARSE_SCORES=True):
+            import_scores(self.assessment, csv_file([["username", "Q1"], ["student0", ""]]))
+        self.assertFalse(StudentQuestionScore.objects.filter(student=self.students[0], question=self.q1).exists())
+        self.assertEqual(self.marks(self.students[0], self.q2), 9)  # Columns left out are unchanged
+
+    def test_xlsx_import(self):
+        """Test that an XLSX sheet exported in the grid's layout is imported."""
+        from openpyxl import Workbook
+
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.append([None, "Question 1", "Question 2"])
+        sheet.append(["Total Marks", 5, 10])
+        sheet.append(["First2 Last2 (student2)", 5, 10])
+        content = io.BytesIO()
+        workbook.save(content)
+
+        import_scores(self.assessment, SimpleUploadedFile("marks.xlsx", content.getvalue()))
+
+        self.assertEqual((self.marks(self.students[2], self.q1), self.marks(self.students[2], self.q2)), (5, 10))
+
+    def test_errors_roll_back_every_chunk(self):
+        """Test that an invalid row in a later chunk leaves earlier chunks unwritten."""
+        rows = [["username", "Q1", "Q2"]] + [[student.username, 1, 1] for student in self.students]
+        rows += [["nobody", 1, 1], ["student0", 6, "x"]]
+
+        with self.assertRaises(ScoreImportError) as raised:
+            import_scores(self.assessment, csv_file(rows), chunk_size=2)
+
+        self.assertEqual(
+            [(error["row"], error["error"]) for error in raised.exception.errors],
+            [(7, "Unknown student."), (8, "Marks cannot exceed 5.0."), (8, "Invalid marks format.")]
+        )
+        self.assertFalse(StudentQuestionScore.objects.filter(marks_obtained__gt=0).exists())
+
+    def test_header_errors(self):
+        """Test that a missing username column or unknown question number is reported."""
+        with self.assertRaises(ScoreImportError) as raised:
+            import_scores(self.assessment, csv_file([["name", "Q3"], ["x", 1]]))
+        self.assertEqual(len(raised.exception.errors), 3)
+
+        with self.assertRaises(ScoreImportError):
+            import_scores(self.assessment, csv_file([["username", "Q1"]], name="marks.txt"))
+
+    def test_one_username_query_per_chunk(self):
+        """Test that usernames are resolved with one query per chunk."""
+        rows = [["username", "Q1", "Q2"]] + [[student.username, 2, 2] for student in self.students]
+        with CaptureQueriesContext(connection) as queries:
+            import_scores(self.assessment, csv_file(rows), chunk_size=2)
+        username_queries = [q for q in queries if '"users_customuser"."username" IN' in q["sql"]]
+        self.assertEqual(len(username_queries), 3)
+
+    def test_api(self):
+        """Test the import endpoint for a superuser and its per-row error response."""
+        admin = create_users(1, role="admin", prefix="admin")[0]
+        admin.is_superuser = True
+        admin.save()
+        client = APIClient()
+        client.force_authenticate(admin)
+        url = f"/api/assessment-marks/import/?id={self.assessment.id}"
+
+        response = client.post(url, {"file": csv_file([["username", "Q1"], ["student3", 3]])}, format="multipart")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["updated"], 1)
+
+        response = client.post(url, {"file": csv_file([["username", "Q1"], ["student3", 30]])}, format="multipart")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["errors"][0]["question"], "Q1")
+        self.assertEqual(self.marks(self.students[3], self.q1), 3)
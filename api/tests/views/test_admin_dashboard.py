@@ -0,0 +1,51 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from programs.models import Program
+from api.tests.factories import create_program, create_course, create_users, create_section
+
+
+class AdminDashboardTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.program = create_program()
+        self.course = create_course(self.program)
+        create_course(self.program, course_id="CS201")
+        self.admin = create_users(1, role="admin", prefix="admin")[0]
+        self.students = create_users(3)
+        create_section(self.course, program=self.program, students=self.students)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.url = "/api/admin_dashboard/"
+
+    def test_counts(self):
+        """Test the grouped program, course, section and user counts."""
+        data = self.client.get(self.url).data
+        self.assertEqual(data["programs"], {"Undergraduate": 1, "Graduate": 0, "Postgraduate": 0, "Total": 1})
+        self.assertEqual(data["courses"], {"CS": 2, "Total": 2})
+        self.assertEqual(data["sections"], {"In Progress": 1, "Completed": 0, "Total": 1})
+        # guardian's anonymous user is counted as a student as well
+        self.assertEqual(data["users"], {"Admins": 1, "Faculty": 0, "Students": 4, "Total": 5})
+        self.assertEqual(data["clo_performance"]["plo_reports"], {"CS": f"/api/program/{self.program.id}/plo_result/"})
+
+    def test_cached_until_a_counted_model_changes(self):
+        """Test that a repeated load costs no queries and changes show up on the next load."""
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url)
+        self.assertEqual(len(queries), 0)
+
+        self.admin.last_login = self.admin.date_joined
+        self.admin.save(update_fields=['last_login'])
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url)
+        self.assertEqual(len(queries), 0)
+
+        create_users(1, role="faculty", prefix="faculty")
+        create_program("EE")
+        self.course.programs.add(Program.objects.get(program_abbreviation="EE"))
+        data = self.client.get(self.url).data
+        self.assertEqual(data["users"]["Faculty"], 1)
+        self.assertEqual(data["courses"], {"CS": 2, "EE": 1, "Total": 2})
@@ -0,0 +1,117 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from api.tests.factories import (
+    create_program, create_course, create_users, create_section, create_assessment, set_marks
+)
+
+
+class FacultyResultDetailsAPITestCase(TestCase):
+    def setUp(self):
+        self.program = create_program()
+        self.course = create_course(self.program)
+        self.faculty = create_users(1, role="faculty", prefix="faculty")[0]
+        self.students = create_users(4)
+        self.section = create_section(
+            self.course, program=self.program, faculty=self.faculty, students=self.students,
+            quiz_weightage=20, final_weightage=80
+        )
+        self.quiz = create_assessment(self.section, "quiz", 50, marks=(6, 4))
+        self.final = create_assessment(self.section, "final", 100, marks=(20, 30))
+        # Final exam totals: 10, 20, 30, 40 out of 50; quiz totals: 0, 2, 4, 6 out of 10
+        for index, student in enumerate(self.students):
+            set_marks(student, self.final, (index * 5 + 5, index * 5 + 5))
+            set_marks(student, self.quiz, (index * 2, 0))
+        self.client = APIClient()
+        self.client.force_authenticate(self.faculty)
+        self.url = f"/api/faculty/section/{self.section.id}/final_result/"
+
+    def test_section_overview_statistics(self):
+        """Test per-type reductions, distribution statistics and the student breakdown."""
+        response = self.client.get(self.url, {"show_students": "true"})
+        self.assertEqual(response.status_code, 200)
+
+        quiz, final = response.data["assessment_types"]
+        self.assertEqual(quiz["type"], "quiz")
+        self.assertEqual(quiz["completion_percentage"], 10.0)
+        self.assertEqual(final["total_type_marks"], 50.0)
+        self.assertEqual((final["average"], final["highest"], final["lowest"]), (25.0, 40.0, 10.0))
+        self.assertEqual(final["median"], 25.0)
+        self.assertEqual(final["std_dev"], 11.18)
+        self.assertEqual(final["percentiles"]["p75"], 32.5)
+        self.assertEqual(response.data["course_completion"], 90.0)
+
+        best = response.data["students"][3]
+        self.assertEqual(best["total_score"], 46.0)
+        self.assertEqual(best["percentage"], 76.67)
+        self.assertEqual(best["assessment_type_score"]["quiz"], {"obtained_score": 6.0, "adjusted_score": 6.0})
+        self.assertAlmostEqual(best["adjusted_course_score"], 6.0 + 64.0)
+
+    def test_type_details_with_students(self):
+        """Test assessment statistics and per-student adjusted scores for one type."""
+        response = self.client.get(self.url, {"assessment_type": "quiz", "show_students": "true"})
+        self.assertEqual(response.status_code, 200)
+
+        assessment = response.data["assessments"][0]
+        self.assertEqual(assessment["total_marks"], 10.0)
+        self.assertEqual((assessment["average"], assessment["highest"], assessment["lowest"]), (3.0, 6.0, 0.0))
+        self.assertEqual(assessment["adjusted_total_marks"], 10.0)
+
+        details = response.data["students"][2]["assessment_details"][self.quiz.id]
+        self.assertEqual(details["obtained_marks"], 4.0)
+        self.assertEqual(details["percentage"], 40.0)
+        self.assertEqual(details["obtained_adjusted_score"], 4.0)
+        self.assertEqual(response.data["students"][2]["percentage"], 40.0)
+
+    def test_query_count_does_not_grow_with_students(self):
+        """Test that the overview costs the same number of queries for more students and assessments."""
+        self.client.get(self.url)  # Warm up content type caches
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(self.url, {"show_students": "true"})
+
+        more_students = create_users(6, prefix="extra")
+        self.section.students.add(*more_students)
+        create_assessment(self.section, "quiz", 25, marks=(1, 1, 1))
+
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.get(self.url, {"show_students": "true"})
+        self.assertEqual(len(response.data["students"]), 10)
+        self.assertEqual(len(small), len(large))
+
+    def test_assessment_details_item_statistics(self):
+        """Test per-question statistics and per-student rows of the level-3 drill-down."""
+        response = self.client.get(self.url, {
+            "assessment_type": "quiz", "assessment_id": self.quiz.id, "show_students": "true"
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["total_marks"], 10.0)
+        self.assertEqual(response.data["student_count"], 4)
+
+        first, second = response.data["questions"]
+        self.assertEqual((first["average"], first["highest"], first["lowest"], first["zero_count"]), (3.0, 6.0, 0.0, 1))
+        self.assertEqual(first["average_percentage"], 50.0)
+        self.assertEqual(second["zero_count"], 4)
+
+        student = response.data["students"][3]
+        self.assertEqual(student["obtained_marks"], 6.0)
+        self.assertEqual(student["questions"][first["question_id"]], 6.0)
+        self.assertEqual(student["obtained_adjusted_score"], 6.0)
+
+    def test_assessment_details_scores_in_one_query(self):
+        """Test that the drill-down reads all of the assessment's scores with a single query."""
+        self.client.get(self.url)  # Warm up content type caches
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url, {"assessment_type": "final", "assessment_id": self.final.id})
+        score_queries = [q for q in queries if "studentquestionscore" in q["sql"]]
+        self.assertEqual(len(score_queries), 1)
+
+    def test_assessment_details_wrong_type_is_404(self):
+        """Test that an assessment id that does not match the type is not found."""
+        response = self.client.get(self.url, {"assessment_type": "final", "assessment_id": self.quiz.id})
+        self.assertEqual(response.status_code, 404)
+
+    def test_assessment_details_invalid_id_is_404(self):
+        """Test that a non-integer assessment id is not found instead of failing."""
+        response = self.client.get(self.url, {"assessment_type": "final", "assessment_id": "abc"})
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,297 @@
+from unittest import mock
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from assessments.models import StudentQuestionScore
+from results.models import StudentAssessmentAggregate, CLOAttainmentSnapshot
+from api.services.plo_attainment import ensure_clo_attainment
+from api.tests.backend_features import mysql_upserts
+from api.tests.factories import create_program, create_course, create_users, create_section, create_assessment
+
+
+class MarksAPIPostTestCase(TestCase):
+    def setUp(self):
+        self.program = create_program()
+        self.course = create_course(self.program)
+        self.faculty = create_users(1, role="faculty", prefix="faculty")[0]
+        self.students = create_users(4)
+        self.section = create_section(self.course, program=self.program, faculty=self.faculty, students=self.students)
+        self.assessment = create_assessment(self.section, marks=(5, 10, 10))
+        self.questions = list(self.assessment.questions.order_by('id'))
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.faculty)
+        self.url = f"/api/assessment-marks/?id={self.assessment.id}"
+
+    def grid(self, students, marks):
+        return [
+            {"student_id": student.id, "question_id": question.id, "marks_obtained": value}
+            for student in students
+            for question, value in zip(self.questions, marks)
+        ]
+
+    def test_saves_grid_and_refreshes_derived_data(self):
+        """Test that a valid grid is upserted and aggregates and stored attainment follow."""
+        ensure_clo_attainment([self.section])
+
+        response = self.client.post(self.url, {"scores": self.grid(self.students, (5, "7.5", ""))}, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["updated"], 8)  # Empty cells equal the existing zero rows
+        self.assertEqual(
+            StudentQuestionScore.objects.get(student=self.students[0], question=self.questions[1]).marks_obtained, 7.5
+        )
+        aggregate = StudentAssessmentAggregate.objects.get(student=self.students[0], assessment=self.assessment)
+        self.assertEqual(aggregate.obtained_sum, 12.5)
+        self.assertFalse(CLOAttainmentSnapshot.objects.filter(section=self.section).exists())
+
+    def test_invalid_cells_are_reported_and_nothing_is_written(self):
+        """Test that every invalid cell is reported in one response and the grid is not partially saved."""
+        outsider = create_users(1, prefix="outsider")[0]
+        scores = self.grid(self.students[:1], (5, 11, -1)) + [
+            {"student_id": self.students[1].id, "question_id": self.questions[0].id, "marks_obtained": "abc"},
+            {"student_id": outsider.id, "question_id": self.questions[0].id, "marks_obtained": 1},
+            {"student_id": self.students[1].id, "question_id": 0, "marks_obtained": 1},
+        ]
+
+        response = self.client.post(self.url, {"scores": scores}, format="json")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            [error["error"] for error in response.data["errors"]],
+            [
+                "Marks cannot exceed 10.0.",
+                "Marks cannot be negative.",
+                "Invalid marks format.",
+                "Student is not enrolled in this section.",
+                "Question not found.",
+            ]
+        )
+        self.assertFalse(StudentQuestionScore.objects.filter(marks_obtained__gt=0).exists())
+
+    @override_settings(OBE_SPARSE_SCORES=True)
+    def test_sparse_mode_leaves_blank_cells_ungraded(self):
+        """Test that in sparse mode blank cells create no rows while entered zeros do."""
+        StudentQuestionScore.objects.all().delete()
+
+        response = self.client.post(self.url, {"scores": self.grid(self.students[:1], (0, "", 4))}, format="json")
+
+        self.assertEqual(response.data["updated"], 2)
+        self.assertEqual(
+            set(StudentQuestionScore.objects.values_list('question_id', 'marks_obtained', 'version')),
+            {(self.questions[0].id, 0.0, 1), (self.questions[2].id, 4.0, 1)}
+        )
+
+    def test_blank_cells_clear_graded_marks(self):
+        """Test that a blank cell resets a graded mark to the zero placeholder, or deletes it in sparse mode."""
+        self.client.post(self.url, {"scores": self.grid(self.students[:1], (5, 6, 7))}, format="json")
+
+        response = self.client.post(self.url, {"scores": self.grid(self.students[:1], ("", None, 7))}, format="json")
+        self.assertEqual(response.data["updated"], 2)
+        self.assertEqual(
+            StudentQuestionScore.objects.get(student=self.students[0], question=self.questions[0]).marks_obtained, 0.0
+        )
+
+        with self.settings(OBE_SPARSE_SCORES=True):
+            response = self.client.post(self.url, {"scores": self.grid(self.students[:1], (1, 1, ""))}, format="json")
+        self.assertEqual(response.data["updated"], 3)
+        self.assertFalse(
+            StudentQuestionScore.objects.filter(student=self.students[0], question=self.questions[2]).exists()
+        )
+        aggregate = StudentAssessmentAggregate.objects.get(student=self.students[0], assessment=self.assessment)
+        self.assertEqual(aggregate.obtained_sum, 2.0)
+
+    def test_saves_without_conflict_target(self):
+        """Test that grid saves insert and update score rows on backends without upsert targets (MySQL)."""
+        StudentQuestionScore.objects.filter(student=self.students[1]).delete()
+        with mysql_upserts():
+            response = self.client.post(self.url, {"scores": self.grid(self.students[:2], (1, 2, 3))}, format="json")
+        self.assertEqual(response.data["updated"], 6)
+        self.assertEqual(
+            sorted(StudentQuestionScore.objects.filter(student__in=self.students[:2]).values_list('marks_obtained', 'version')),
+            [(1.0, 1)] * 2 + [(2.0, 1)] * 2 + [(3.0, 1)] * 2
+        )
+
+    def test_query_count_does_not_grow_with_grid_size(self):
+        """Test that saving a larger grid takes the same number of queries."""
+        with CaptureQueriesContext(connection) as small:
+            self.client.post(self.url, {"scores": self.grid(self.students[:1], (1, 1, 1))}, format="json")
+        with CaptureQueriesContext(connection) as large:
+            self.client.post(self.url, {"scores": self.grid(self.students, (2, 2, 2))}, format="json")
+        self.assertEqual(len(small), len(large))
+
+
+class MarksAPIPatchTestCase(TestCase):
+    def setUp(self):
+        self.program = create_program()
+        self.course = create_course(self.program)
+        self.faculty = create_users(1, role="faculty", prefix="faculty")[0]
+        self.students = create_users(4)
+        self.section = create_section(self.course, program=self.program, faculty=self.faculty, students=self.students)
+        self.assessment = create_assessment(self.section, marks=(5, 10))
+        self.q1, self.q2 = self.assessment.questions.order_by('id')
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.faculty)
+        self.url = f"/api/assessment-marks/?id={self.assessment.id}"
+
+    def cell(self, student, question, marks, version):
+        return {"student_id": student.id, "question_id": question.id, "marks_obtained": marks, "version": version}
+
+    def test_get_returns_versions_and_patch_bumps_them(self):
+        """Test that scores carry a version and a PATCH with the current version saves the cell."""
+        scores = self.client.get(self.url).data["scores"]
+        self.assertEqual({score["version"] for score in scores}, {0})
+
+        response = self.client.patch(self.url, {"scores": [self.cell(self.students[0], self.q1, 4, 0)]}, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["saved"], [
+            {"student_id": self.students[0].id, "question_id": self.q1.id, "marks_obtained": 4.0, "version": 1}
+        ])
+        score = StudentQuestionScore.objects.get(student=self.students[0], question=self.q1)
+        self.assertEqual((score.marks_obtained, score.version), (4.0, 1))
+        aggregate = StudentAssessmentAggregate.objects.get(student=self.students[0], assessment=self.assessment)
+        self.assertEqual(aggregate.obtained_sum, 4.0)
+
+    @override_settings(OBE_SPARSE_SCORES=True)
+    def test_blank_cell_clears_graded_mark(self):
+        """Test that in sparse mode a blank cell deletes the graded row and returns it as ungraded."""
+        self.client.patch(self.url, {"scores": [self.cell(self.students[0], self.q1, 4, 0)]}, format="json")
+
+        response = self.client.patch(self.url, {"scores": [self.cell(self.students[0], self.q1, "", 1)]}, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["saved"], [
+            {"student_id": self.students[0].id, "question_id": self.q1.id, "marks_obtained": None, "version": 0}
+        ])
+        self.assertFalse(StudentQuestionScore.objects.filter(student=self.students[0], question=self.q1).exists())
+        aggregate = StudentAssessmentAggregate.objects.get(student=self.students[0], assessment=self.assessment)
+        self.assertEqual(aggregate.obtained_sum, 0.0)
+
+    def test_writes_require_change_permission(self):
+        """Test that students and other faculty cannot POST or PATCH the section's marks."""
+        other_faculty = create_users(1, role="faculty", prefix="other")[0]
+        for user in (self.students[0], other_faculty):
+            self.client.force_authenticate(user)
+            with self.subTest(user=user.username):
+                response = self.client.patch(self.url, {"scores": [self.cell(self.students[0], self.q1, 5, 0)]}, format="json")
+                self.assertEqual(response.status_code, 403)
+                response = self.client.post(self.url, {"scores": [self.cell(self.students[0], self.q1, 5, 0)]}, format="json")
+                self.assertEqual(response.status_code, 403)
+        self.assertFalse(StudentQuestionScore.objects.filter(marks_obtained__gt=0).exists())
+
+    def test_stale_cells_are_rejected_cell_by_cell(self):
+        """Test that a stale cell is reported with the current marks while the other cells are saved."""
+        self.client.patch(self.url, {"scores": [self.cell(self.students[0], self.q1, 4, 0)]}, format="json")
+
+        # A second editor still holding version 0
+        response = self.client.patch(self.url, {"scores": [
+            self.cell(self.students[0], self.q1, 2, 0),
+            self.cell(self.students[1], self.q1, 3, 0),
+        ]}, format="json")
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data["conflicts"][0]["marks_obtained"], 4.0)
+        self.assertEqual(response.data["conflicts"][0]["version"], 1)
+        self.assertEqual([cell["student_id"] for cell in response.data["saved"]], [self.students[1].id])
+        self.assertEqual(StudentQuestionScore.objects.get(student=self.students[0], question=self.q1).marks_obtained, 4.0)
+        self.assertEqual(StudentQuestionScore.objects.get(student=self.students[1], question=self.q1).marks_obtained, 3.0)
+
+    @override_settings(OBE_SPARSE_SCORES=True)
+    def test_concurrent_first_writes_conflict(self):
+        """Test that a cell first written by someone else after the locked read is reported as a conflict."""
+        StudentQuestionScore.objects.all().delete()
+        bulk_create = StudentQuestionScore.objects.bulk_create
+
+        def racing_bulk_create(scores, **kwargs):
+            # The other editor's first write of the same cell commits in between
+            StudentQuestionScore.objects.create(student=self.students[0], question=self.q1, marks_obtained=3)
+            return bulk_create(scores, **kwargs)
+
+        with mock.patch.object(StudentQuestionScore.objects, 'bulk_create', side_effect=racing_bulk_create):
+            response = self.client.patch(self.url, {"scores": [
+                self.cell(self.students[0], self.q1, 4, 0),
+                self.cell(self.students[1], self.q1, 2, 0),
+            ]}, format="json")
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(
+            [(cell["student_id"], cell["marks_obtained"], cell["version"]) for cell in response.data["conflicts"]],
+            [(self.students[0].id, 3.0, 1)]
+        )
+        self.assertEqual([cell["student_id"] for cell in response.data["saved"]], [self.students[1].id])
+        self.assertEqual(StudentQuestionScore.objects.get(student=self.students[0], question=self.q1).marks_obtained, 3.0)
+        aggregate = StudentAssessmentAggregate.objects.get(student=self.students[1], assessment=self.assessment)
+        self.assertEqual(aggregate.obtained_sum, 2.0)
+
+    def test_full_grid_saves_bump_versions(self):
+        """Test that POST and model saves also move the version, so grid edits made before them go stale."""
+        self.client.post(self.url, {"scores": [
+            {"student_id": self.students[0].id, "question_id": self.q2.id, "marks_obtained": 7}
+        ]}, format="json")
+        self.assertEqual(StudentQuestionScore.objects.get(student=self.students[0], question=self.q2).version, 1)
+
+        score = StudentQuestionScore.objects.get(student=self.students[1], question=self.q2)
+        score.marks_obtained = 1
+        score.save()
+        response = self.client.patch(self.url, {"scores": [self.cell(self.students[1], self.q2, 2, 0)]}, format="json")
+        self.assertEqual(response.status_code, 409)
+
+    def test_query_count_does_not_depend_on_edit_count(self):
+        """Test that a delta save takes the same number of queries for one edit or many."""
+        with CaptureQueriesContext(connection) as one:
+            self.client.patch(self.url, {"scores": [self.cell(self.students[0], self.q1, 1, 0)]}, format="json")
+        with CaptureQueriesContext(connection) as many:
+            self.client.patch(self.url, {"scores": [
+                self.cell(student, question, 2, 0) for student in self.students[1:] for question in (self.q1, self.q2)
+            ]}, format="json")
+        self.assertEqual(len(one), len(many))
+
+
+class MarksAPIMatrixTestCase(TestCase):
+    def setUp(self):
+        self.program = create_program()
+        self.course = create_course(self.program)
+        self.faculty = create_users(1, role="faculty", prefix="faculty")[0]
+        self.students = create_users(3)
+        self.section = create_section(self.course, program=self.program, faculty=self.faculty, students=self.students)
+        self.assessment = create_assessment(self.section, marks=(5, 10))
+        self.q1, self.q2 = self.assessment.questions.order_by('id')
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.faculty)
+        self.url = f"/api/assessment-marks/?id={self.assessment.id}"
+
+    def test_matrix_payload(self):
+        """Test that format=matrix returns ordered ids and dense row-major marks and versions."""
+        score = StudentQuestionScore.objects.get(student=self.students[1], question=self.q2)
+        score.marks_obtained = 8
+        score.save()
+        StudentQuestionScore.objects.filter(student=self.students[2], question=self.q1).delete()
+
+        response = self.client.get(self.url + "&format=matrix")
+
+        self.assertEqual(response.status_code, 200)
+        data = response.data
+        self.assertEqual(data["question_ids"], [self.q1.id, self.q2.id])
+        self.assertEqual(data["student_ids"], [student.id for student in self.students])
+        self.assertEqual(data["marks"], [[0.0, 0.0], [0.0, 8.0], [None, 0.0]])
+        self.assertEqual(data["versions"], [[0, 0], [0, 1], [0, 0]])
+
+    def test_default_format_is_unchanged(self):
+        """Test that the per-cell list payload is still returned without format=matrix."""
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.data["scores"]), 6)
+        self.assertNotIn("marks", response.data)
+
+    def test_matrix_query_count_is_constant(self):
+        """Test that the matrix payload takes the same number of queries for more students."""
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(self.url + "&format=matrix")
+        self.section.students.add(*create_users(5, prefix="late"))
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.get(self.url + "&format=matrix")
+        self.assertEqual(len(response.data["marks"]), 8)
+        self.assertEqual(len(small), len(large))
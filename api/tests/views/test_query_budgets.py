@@ -0,0 +1,156 @@
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+import api.urls
+from api.services.score_writes import save_score_cells
+from api.tests.factories import create_program, create_course, create_users, create_section, create_assessment
+from api.tests.query_budgets import QUERY_BUDGETS, QueryBudgetMixin
+from results.models import CLOAttainmentSnapshot
+
+# Seeded section sizes: (students, quizzes, questions per assessment)
+SECTION_SIZES = {"A": (3, 1, 2), "B": (15, 3, 5), "C": (40, 5, 12)}
+
+
+class QueryBudgetTestCase(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.program = create_program()
+        cls.course = create_course(cls.program)
+        cls.admin = create_users(1, role="admin", prefix="admin")[0]
+        cls.faculty = create_users(1, role="faculty", prefix="faculty")[0]
+
+        # One section per size, each fully graded
+        cls.sections = []
+        for name, (student_count, quiz_count, question_count) in SECTION_SIZES.items():
+            students = create_users(student_count, prefix=f"student{name}_")
+            section = create_section(
+                cls.course, program=cls.program, faculty=cls.faculty, students=students, section=name,
+                quiz_weightage=20, final_weightage=80
+            )
+            assessments = [
+                create_assessment(section, "quiz", 100 / quiz_count, marks=(5,) * question_count) for _ in range(quiz_count)
+            ] + [create_assessment(section, "final", 100, marks=(10,) * question_count)]
+            for assessment in assessments:
+                question_ids = list(assessment.questions.values_list('id', flat=True))
+                save_score_cells(assessment, {
+                    (student.id, question_id): (student.id + question_id) % 5
+                    for student in students for question_id in question_ids
+                })
+            cls.sections.append((section, students[0], assessments[-1]))
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def cold_sections(self, user):
+        """Yield (section, student, final) of each seeded section as `user`, clearing the caches first."""
+        self.client.force_authenticate(user)
+        for section, student, final in self.sections:
+            cache.clear()
+            ContentType.objects.clear_cache()
+            yield section, student, final
+
+    def test_budgets_name_api_routes(self):
+        """Test that every budget names a route of api/urls.py."""
+        routes = {pattern.name for pattern in api.urls.urlpatterns}
+        self.assertLessEqual(set(QUERY_BUDGETS), routes)
+
+    def test_student_result_details(self):
+        """Test the student result drill-down levels against their budget."""
+        for section, student, final in self.sections:
+            with self.subTest(section=section.section):
+                self.client.force_authenticate(student)
+                url = f"/api/student/section/{section.id}/final_result/"
+                for params in ({}, {"assessment_type": "quiz"}, {"assessment_type": "final", "assessment_id": final.id}):
+                    cache.clear()
+                    self.assertWithinQueryBudget(url, params)
+
+    def test_faculty_result_details(self):
+        """Test the faculty section overview and assessment breakdown against their budget."""
+        for section, _, final in self.cold_sections(self.faculty):
+            with self.subTest(section=section.section):
+                url = f"/api/faculty/section/{section.id}/final_result/"
+                self.assertWithinQueryBudget(url, {"show_students": "true"})
+                self.assertWithinQueryBudget(url, {"assessment_type": "final", "assessment_id": final.id, "show_students": "true"})
+
+    def test_marks_grid(self):
+        """Test loading and saving the marks grid against its budget."""
+        for section, student, final in self.cold_sections(self.faculty):
+            with self.subTest(section=section.section):
+                url = f"/api/assessment-marks/?id={final.id}"
+                scores = self.assertWithinQueryBudget(url).data["scores"]
+                cell = next(cell for cell in scores if cell["student_id"] == student.id)
+                self.assertWithinQueryBudget(url, {"scores": [{**cell, "marks_obtained": 10}]}, method='post', format='json')
+
+    def test_clo_attainment(self):
+        """Test the faculty and student CLO attainment APIs against their budget."""
+        for section, student, _ in self.cold_sections(self.faculty):
+            with self.subTest(section=section.section):
+                self.client.force_authenticate(self.faculty)
+                self.assertWithinQueryBudget(f"/api/faculty/section/{section.id}/clo_result/")
+                cache.clear()
+                self.client.force_authenticate(student)
+                self.assertWithinQueryBudget(f"/api/student/section/{section.id}/clo_result/")
+
+    def test_marks_import(self):
+        """Test importing a CSV of the whole marks grid against its budget."""
+        for section, _, final in self.cold_sections(self.faculty):
+            with self.subTest(section=section.section):
+                rows = ["username," + ",".join(f"Q{number}" for number in range(1, final.questions.count() + 1))]
+                rows += [f"{student.username}," + ",".join(["1"] * final.questions.count()) for student in section.students.all()]
+                self.assertWithinQueryBudget(
+                    f"/api/assessment-marks/import/?id={final.id}",
+                    {"file": SimpleUploadedFile("marks.csv", "\n".join(rows).encode())},
+                    method='post', format='multipart'
+                )
+
+    def test_plo_attainment(self):
+        """Test the program PLO rollup and the student PLO transcript against their budget, recomputing attainment."""
+        for section, student, _ in self.cold_sections(self.admin):
+            with self.subTest(section=section.section):
+                CLOAttainmentSnapshot.objects.all().delete()
+                self.client.force_authenticate(self.admin)
+                self.assertWithinQueryBudget(f"/api/program/{self.program.id}/plo_result/", {"show_students": "true"})
+                cache.clear()
+                CLOAttainmentSnapshot.objects.all().delete()
+                self.client.force_authenticate(student)
+                self.assertWithinQueryBudget("/api/student/plo_result/")
+
+    def test_dashboards(self):
+        """Test the admin, faculty and student dashboards against their budget."""
+        for section, student, _ in self.cold_sections(self.admin):
+            with self.subTest(section=section.section):
+                self.client.force_authenticate(self.admin)
+                self.assertWithinQueryBudget("/api/admin_dashboard/")
+                self.client.force_authenticate(self.faculty)
+                self.assertWithinQueryBudget("/api/faculty_dashboard/")
+                self.client.force_authenticate(student)
+                self.assertWithinQueryBudget("/api/student_dashboard/", {"include_results": "true"})
+
+
+@override_settings(OBE_QUERY_INSPECTOR=True)
+class QueryInspectorMiddlewareTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.program = create_program()
+        self.course = create_course(self.program)
+        self.student = create_users(1)[0]
+        self.section = create_section(self.course, program=self.program, students=[self.student])
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+
+    def test_headers(self):
+        """Test that responses carry the request's query count and no repeats for set-based views."""
+        response = self.client.get(f"/api/student/section/{self.section.id}/final_result/")
+        self.assertGreater(int(response["X-Query-Count"]), 0)
+        self.assertNotIn("X-Query-Repeated", response)
+
+    def test_repeated_queries_are_reported(self):
+        """Test that a per-question query loop is reported in the header and the log."""
+        assessment = create_assessment(self.section, marks=(1,) * 6)
+        url = f"/api/student-score/?student_id={self.student.id}&assessment_id={assessment.id}"
+        with self.assertLogs('api.middleware', level='WARNING') as logs:
+            response = self.client.get(url)
+        self.assertTrue(response["X-Query-Repeated"].startswith("2; max=6"))
+        self.assertIn("6 x SELECT", logs.output[0])
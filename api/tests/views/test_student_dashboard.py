@@ -0,0 +1,65 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from outcomes.models import CourseLearningOutcome
+from api.tests.factories import (
+    create_program, create_course, create_users, create_section, create_assessment, set_marks
+)
+
+
+class StudentDashboardTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.program = create_program()
+        self.student = create_users(1)[0]
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+        self.url = "/api/student_dashboard/?include_results=true"
+
+    def enroll(self, course_id, section="A"):
+        course = create_course(self.program, course_id=course_id)
+        section = create_section(
+            course, program=self.program, students=[self.student], section=section, quiz_weightage=20, final_weightage=80
+        )
+        clo1, clo2 = CourseLearningOutcome.objects.filter(course=course).order_by('CLO')
+        quiz = create_assessment(section, "quiz", 50, marks=(10,), clos=[clo1])
+        create_assessment(section, "final", 100, marks=(10, 10), clos=[clo1, clo2])
+        return section, quiz
+
+    def test_standings_match_section_overview(self):
+        """Test that each section's standing equals the section overview of the result details API."""
+        section, quiz = self.enroll("CS101")
+        set_marks(self.student, quiz, (5,))
+
+        entry = self.client.get(self.url).data["sections"][0]
+        overview = self.client.get(f"/api/student/section/{section.id}/final_result/").data
+
+        self.assertEqual(entry["course_completion"], overview["course_completion"])
+        self.assertEqual(entry["student_current_overall"], overview["student_current_overall"])
+        self.assertEqual(entry["course_completion"], 90.0)
+        self.assertEqual(entry["student_current_overall"], 1.0)
+        self.assertEqual([clo["clo_id"] for clo in entry["clo_summary"]], ["CLO1", "CLO2"])
+        self.assertEqual(entry["clo_summary"][0]["attained"], 5.0)
+
+    def test_results_are_optional(self):
+        """Test that the plain dashboard payload is unchanged without include_results."""
+        self.enroll("CS101")
+        entry = self.client.get("/api/student_dashboard/").data["sections"][0]
+        self.assertNotIn("course_completion", entry)
+
+    def test_query_count_does_not_depend_on_course_load(self):
+        """Test that the dashboard with results takes the same queries for one or several sections."""
+        self.enroll("CS101")
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as one:
+            self.client.get(self.url)
+
+        for course_id in ("CS102", "CS103", "CS104"):
+            self.enroll(course_id)
+        self.client.get(self.url)  # Computes the new sections' CLO attainment
+        with CaptureQueriesContext(connection) as many:
+            data = self.client.get(self.url).data
+        self.assertEqual(len(data["sections"]), 4)
+        self.assertEqual(len(one), len(many))
@@ -0,0 +1,83 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from api.services.score_writes import save_score_cells
+from api.tests.factories import (
+    create_program, create_course, create_users, create_section, create_assessment, set_marks
+)
+
+
+class StudentResultDetailsAPITestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.program = create_program()
+        self.course = create_course(self.program)
+        self.student, self.other = create_users(2)
+        self.section = create_section(
+            self.course, program=self.program, students=[self.student, self.other], quiz_weightage=20, final_weightage=80
+        )
+        self.quiz = create_assessment(self.section, "quiz", 50, marks=(6, 4))
+        self.final = create_assessment(self.section, "final", 100, marks=(20, 30))
+        set_marks(self.student, self.quiz, (3, 4))
+        set_marks(self.student, self.final, (10, 15))
+        set_marks(self.other, self.final, (20, 30))
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+        self.url = f"/api/student/section/{self.section.id}/final_result/"
+
+    def get(self, query=""):
+        response = self.client.get(self.url + query)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_levels(self):
+        """Test the overview, type and assessment levels of the drill-down."""
+        overview = self.get()
+        self.assertEqual((overview["course_completion"], overview["student_current_overall"]), (90.0, 33.4))
+        quiz_type = overview["assessment_types"][1]
+        self.assertEqual((quiz_type["type"], quiz_type["student_earned_percentage_of_this_type"]), ("quiz", 1.4))
+
+        quiz = self.get("?assessment_type=quiz")
+        self.assertEqual((quiz["type_completion_percentage"], quiz["student_type_percentage"]), (10.0, 1.4))
+        self.assertEqual(quiz["assessments"], [{
+            "assessment_id": self.quiz.id, "title": self.quiz.title, "total_marks": 10.0,
+            "student_obtained_marks": 7.0, "assessment_percentage": 70.0, "weighted_contribution": 14.0,
+        }])
+
+        final = self.get(f"?assessment_type=final&assessment_id={self.final.id}")
+        self.assertEqual((final["total_marks"], final["student_obtained_marks"], final["assessment_percentage"]), (50.0, 25.0, 50.0))
+        self.assertEqual(
+            [(q["total_marks"], q["student_obtained_marks"], q["question_percentage"]) for q in final["questions"]],
+            [(20.0, 10.0, 50.0), (30.0, 15.0, 50.0)]
+        )
+
+    def test_unknown_assessment(self):
+        """Test that an assessment of another type or section is not found."""
+        self.assertEqual(self.client.get(self.url + f"?assessment_type=quiz&assessment_id={self.final.id}").status_code, 404)
+        self.assertEqual(self.client.get(self.url + "?assessment_type=quiz&assessment_id=x").status_code, 404)
+
+    def test_drill_down_is_a_cache_hit(self):
+        """Test that after the first request every level is served from the cached tree."""
+        self.get()
+        for query in ("", "?assessment_type=final", f"?assessment_type=final&assessment_id={self.final.id}"):
+            with CaptureQueriesContext(connection) as queries:
+                self.get(query)
+            self.assertEqual(len(queries), 1)  # The enrollment check
+
+    def test_cache_follows_own_scores_only(self):
+        """Test that the tree is rebuilt after the student's own scores change, not another student's."""
+        self.get()
+        set_marks(self.other, self.quiz, (6, 4))
+        with CaptureQueriesContext(connection) as queries:
+            self.get()
+        self.assertEqual(len(queries), 1)
+
+        set_marks(self.student, self.quiz, (6, 4))
+        self.assertEqual(self.get("?assessment_type=quiz")["assessments"][0]["student_obtained_marks"], 10.0)
+
+        # Bulk saves from the marks grid invalidate too
+        save_score_cells(self.final, {(self.student.id, self.final.questions.order_by('id')[0].id): 20})
+        self.assertEqual(self.get()["student_current_overall"], 46.8)
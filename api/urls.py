@@ -6,6 +6,7 @@ urlpatterns = [
     path('student/section/<section_id>/final_result/', StudentResultDetailsAPI.as_view(), name='student-traditional-result'),
     path('faculty/section/<section_id>/final_result/', FacultyResultDetailsAPI.as_view(), name='faculty-traditional-result'),
     path('assessment-marks/', MarksAPI.as_view(), name='assessment-marks'),
+    path('assessment-marks/import/', MarksImportAPI.as_view(), name='assessment-marks-import'),
     path('student-score/', StudentScoreAPI.as_view(), name='student-score'),
     path('courses/<int:program_id>/', CoursesByProgram.as_view(), name='get_courses'),
     path('get-course-id/', CourseBySection.as_view(), name='get_course_by_section'),
@@ -14,6 +15,8 @@ urlpatterns = [
     path('clos/<int:course_id>/', get_clos_by_course, name='get_clos'),
     path('faculty/section/<int:section_id>/clo_result/', FacultyCLOAttainmentAPI.as_view(), name='faculty-clo-result'),
     path('student/section/<int:section_id>/clo_result/', StudentCLOAttainmentAPI.as_view(), name='student-clo-result'),
+    path('program/<int:program_id>/plo_result/', ProgramPLOAttainmentAPI.as_view(), name='program-plo-result'),
+    path('student/plo_result/', StudentPLOTranscriptAPI.as_view(), name='student-plo-result'),
     path('admin_dashboard/', admin_dashboard, name='admin-dashboard'),
     path('student_dashboard/', student_dashboard, name='student-dashboard'),
     path('faculty_dashboard/', faculty_dashboard, name='faculty-dashboard'),
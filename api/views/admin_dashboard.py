@@ -1,45 +1,20 @@
 from rest_framework.response import Response
 from rest_framework.decorators import api_view
-from programs.models import Program
-from courses.models import Course
-from sections.models import Section
-from users.models import CustomUser
+from django.urls import reverse
+from api.services.dashboard_stats import admin_dashboard_stats
 
 @api_view(['GET'])
 def admin_dashboard(request):
-    # ✅ Programs Overview (Total by Type)
-    program_counts = {
-        "Undergraduate": Program.objects.filter(program_type="UG").count(),
-        "Graduate": Program.objects.filter(program_type="GR").count(),
-        "Postgraduate": Program.objects.filter(program_type="PG").count(),
-        "Total": Program.objects.count(),
-    }
-
-    # ✅ Courses Overview (Total per Program)
-    course_counts = {
-        program.program_abbreviation: program.courses.count()
-        for program in Program.objects.all()
-    }
-    course_counts["Total"] = Course.objects.count()
-
-    # ✅ Sections Overview (In Progress & Completed)
-    section_counts = {
-        "In Progress": Section.objects.filter(status="in_progress").count(),
-        "Completed": Section.objects.filter(status="complete").count(),
-        "Total": Section.objects.count(),
-    }
-
-    # ✅ User Management (Total by Role)
-    user_counts = {
-        "Admins": CustomUser.objects.filter(role="admin").count(),
-        "Faculty": CustomUser.objects.filter(role="faculty").count(),
-        "Students": CustomUser.objects.filter(role="student").count(),
-        "Total": CustomUser.objects.count(),
-    }
+    # ✅ Programs, Courses, Sections and Users Overview (cached grouped counts)
+    stats = admin_dashboard_stats()
 
-    # ✅ CLO Performance (Static Link)
+    # ✅ CLO Performance (PLO attainment report per program)
     clo_performance = {
         "report_link": "/clo-performance/",
+        "plo_reports": {
+            abbreviation: reverse('program-plo-result', args=[program_id])
+            for abbreviation, program_id in stats["program_ids"].items()
+        },
     }
 
     # ✅ System Configurations (Static Links)
@@ -50,10 +25,10 @@ def admin_dashboard(request):
 
     # 🔥 Response Data
     data = {
-        "programs": program_counts,
-        "courses": course_counts,
-        "sections": section_counts,
-        "users": user_counts,
+        "programs": stats["programs"],
+        "courses": stats["courses"],
+        "sections": stats["sections"],
+        "users": stats["users"],
         "clo_performance": clo_performance,
         "system_configurations": system_configurations,
     }
@@ -2,10 +2,10 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
-from assessments.models import Assessment, Question, StudentQuestionScore
+from assessments.models import StudentQuestionScore
 from sections.models import Section
-from outcomes.models import CourseLearningOutcome
 from assessments.models import AssessmentBreakdown
+from api.services.clo_attainment import get_clo_weight_matrix
 
 
 class FacultyCLOAttainmentAPI(APIView):
@@ -18,38 +18,21 @@ class FacultyCLOAttainmentAPI(APIView):
         """
         # Get Section
         section = get_object_or_404(Section, id=section_id)
-        students = section.students.all()
-
-        # Get CLOs and map by ID (Ensure ordered CLOs)
-        clos = CourseLearningOutcome.objects.filter(course=section.course).order_by("CLO")
-        clo_mapping = {clo.id: f"CLO{clo.CLO}" for clo in clos}
+        students = list(section.students.order_by('id'))
 
         # Get Assessment Breakdown (for weightages)
         breakdown = AssessmentBreakdown.objects.filter(section=section).first()
         if not breakdown:
             return Response({"status": "error", "message": "Assessment Breakdown not found"}, status=404)
 
-        assessment_weights = breakdown.get_assessment_types()  # Fetch dynamic weightages
-
-        # Exclude assessments with 0 weightage
-        valid_assessment_types = {atype: weight for atype, weight in assessment_weights.items() if weight > 0}
+        # Question × CLO weights, cached until the section's structure changes
+        weight_matrix = get_clo_weight_matrix(section)
 
-        # Get Assessments and Questions
-        assessments = Assessment.objects.filter(section=section, type__in=valid_assessment_types.keys()).prefetch_related("questions")
-        questions = Question.objects.filter(assessment__section=section).prefetch_related("clo")
-        student_scores = StudentQuestionScore.objects.filter(question__assessment__section=section)
-
-        # **Data Structure Initialization**
-        clo_results = {
-            clo_mapping[clo.id]: {
-                "clo_id": "CLO" + str(clo.CLO),
-                "title": clo.heading,
-                "weightage": clo.weightage,
-                "totalMarks": 0,
-                "assessmentTypeContribution": {}
-            }
-            for clo in clos
-        }
+        # All of the section's scores in one query; attainment is a single matrix product per type
+        score_rows = StudentQuestionScore.objects.filter(
+            section=section
+        ).values_list('student_id', 'question_id', 'marks_obtained')
+        clo_results = weight_matrix.student_clo_results([student.id for student in students], score_rows)
 
         student_results = {
             student.username: {  # Use SAP ID as the key
@@ -58,72 +41,17 @@ class FacultyCLOAttainmentAPI(APIView):
                     "last_name": student.last_name,
                     "email": student.email
                 },
-                "clo_results": {
-                    clo_key: {}  # Only add assessments if they contribute
-                    for clo_key in clo_mapping.values()
-                }
+                "clo_results": student_clo_results
             }
-            for student in students
+            for student, student_clo_results in zip(students, clo_results)
         }
 
-        # **Process Data**
-        for assessment in assessments:
-            total_assessment_marks = sum(q.marks for q in assessment.questions.all())
-            if total_assessment_marks == 0:
-                continue  # Skip empty assessments
-
-            assessment_type = assessment.type
-            effective_weight = valid_assessment_types[assessment.type]
-            adjusted_weight = effective_weight*assessment.weightage/100
-
-            for question in assessment.questions.all():
-                if not question.clo.exists():
-                    continue  # Skip questions without CLOs
-
-                question_weight = (question.marks / total_assessment_marks) * adjusted_weight
-                mapped_clos = question.clo.all()
-                num_clos = mapped_clos.count()
-
-                for clo in mapped_clos:
-                    distributed_weight = question_weight / num_clos
-                    clo_key = clo_mapping[clo.id]
-                    clo_results[clo_key]["totalMarks"] += distributed_weight
-
-                    # Add assessment type only if it contributes
-                    if assessment_type not in clo_results[clo_key]["assessmentTypeContribution"]:
-                        clo_results[clo_key]["assessmentTypeContribution"][assessment_type] = 0
-                    clo_results[clo_key]["assessmentTypeContribution"][assessment_type] += distributed_weight
-
-                    # Add student results, but only for relevant CLOs
-                    for student in students:
-                        student_id = student.username  # Use SAP ID instead of full name
-                        score = student_scores.filter(student=student, question=question).first()
-                        
-                        if score:
-                            # Ensure CLO key exists inside "clo_results"
-                            student_results[student_id]["clo_results"].setdefault(clo_key, {})
-                            
-                            # Add assessment type scores inside "clo_results"
-                            student_results[student_id]["clo_results"][clo_key].setdefault(assessment_type, 0)
-                            student_results[student_id]["clo_results"][clo_key][assessment_type] += (
-                                (score.marks_obtained / question.marks) * distributed_weight
-                            )
-
-        # # **Convert CLO contribution to percentage**
-        # for clo_key, clo_data in clo_results.items():
-        #     total_contribution = sum(clo_data["assessmentTypeContribution"].values())
-        #     if total_contribution > 0:
-        #         for key in clo_data["assessmentTypeContribution"]:
-        #             clo_data["assessmentTypeContribution"][key] = (
-        #                 clo_data["assessmentTypeContribution"][key] / total_contribution
-        #             ) * 100
-
         # **Prepare Final JSON Response**
         response_data = {
             "status": "success",
             "message": "OBE result data fetched successfully.",
             "data": {
-                "CLOs": list(clo_results.values()),  # CLOs are now properly structured
+                "CLOs": weight_matrix.clo_summaries(),  # CLOs are now properly structured
                 "students": student_results  # Each student now matches the CLO hierarchy
             }
         }
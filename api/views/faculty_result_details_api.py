@@ -1,9 +1,12 @@
+import numpy as np
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from sections.models import Section
-from assessments.models import Question, StudentQuestionScore
+from assessments.models import Assessment, StudentQuestionScore
 from guardian.shortcuts import get_objects_for_user
+from api.services.score_matrix import SectionAssessmentMatrix, build_score_matrix, distribution_statistics
 
 class FacultyResultDetailsAPI(APIView):
     def get(self, request, section_id):
@@ -26,49 +29,32 @@ class FacultyResultDetailsAPI(APIView):
             return self.type_details(section, breakdown, assessment_type, show_students)
 
         if assessment_type and assessment_id:
-            return self.assessment_details(section, assessment_type, assessment_id, show_students)
+            return self.assessment_details(section, breakdown, assessment_type, assessment_id, show_students)
 
         return Response({"error": "Invalid parameters"}, status=400)
 
+    def load_matrix(self, section):
+        # Students × assessments matrix built from the aggregate table, in a fixed number of queries
+        students = list(section.students.order_by('id'))
+        return SectionAssessmentMatrix(section, students)
 
     def section_overview(self, section, breakdown, show_students):
+        matrix = self.load_matrix(section)
+        students = matrix.students
+
         assessment_types_data = []
-        students = section.students.all()
-        student_scores = {student.id: {
-            "student_id": student.id,
-            "student_name": student.get_full_name(),
-            "assessment_type_score": {},
-            "total_score": 0,
-            "percentage": 0,
-            "adjusted_course_score": 0,
-        } for student in students}
+        total_scores = np.zeros(len(students))  # Obtained marks over all weighted types
+        adjusted_course_scores = np.zeros(len(students))
+        type_scores = {}
 
         # Pre-compute data for all assessment types
         for assessment_type, weight in breakdown.items():
             if weight == 0:
                 continue
-            assessments = section.assessments.filter(type=assessment_type)
-            total_type_marks = 0
-            total_type_weightage = 0  # To sum up the weightage of all assessments of this type
-            student_total_marks = {student.id: 0 for student in students}  # Total marks for each student
-
-            for assessment in assessments:
-                questions = Question.objects.filter(assessment=assessment)
-                total_type_marks += sum(q.marks for q in questions)
-                total_type_weightage += assessment.weightage  # Summing up weightage for this type
-
-                for student in students:
-                    student_total_marks[student.id] += sum(
-                        StudentQuestionScore.objects.filter(
-                            student=student, question__in=questions
-                        ).values_list('marks_obtained', flat=True)
-                    )
-
-            # Calculate highest, lowest, and average marks for this type
-            all_student_marks = list(student_total_marks.values())
-            average = sum(all_student_marks) / len(all_student_marks) if all_student_marks else 0
-            highest = max(all_student_marks) if all_student_marks else 0
-            lowest = min(all_student_marks) if all_student_marks else 0
+            assessments = matrix.assessments_by_type[assessment_type]
+            total_type_marks = float(matrix.assessment_total_marks(assessments).sum())
+            total_type_weightage = sum(a.weightage for a in assessments)  # Summing up weightage for this type
+            student_total_marks = matrix.assessment_scores(assessments).sum(axis=1)  # Total marks for each student
 
             # Calculate completion percentage for this type
             completion_percentage = (total_type_weightage / 100) * weight if weight > 0 else 0
@@ -79,31 +65,25 @@ class FacultyResultDetailsAPI(APIView):
                 "allocated_weight": weight,
                 "total_type_marks": total_type_marks,
                 "completion_percentage": round(completion_percentage, 2),
-                "average": round(average, 2),
-                "highest": highest,
-                "lowest": lowest,
+                "average": round(float(student_total_marks.mean()), 2) if students else 0,
+                "highest": float(student_total_marks.max()) if students else 0,
+                "lowest": float(student_total_marks.min()) if students else 0,
+                **distribution_statistics(student_total_marks),
             })
 
-            # Update student_scores for this assessment type
-            for student in students:
-                obtained_score = student_total_marks[student.id]
-                adjusted_score = (
-                    (float(obtained_score) / total_type_marks) * completion_percentage
-                    if total_type_marks > 0 else 0
-                )
-                student_scores[student.id]["assessment_type_score"][assessment_type] = {
-                    "obtained_score": obtained_score,
-                    "adjusted_score": round(adjusted_score, 2),
-                }
-                student_scores[student.id]["total_score"] += obtained_score
-                student_scores[student.id]["adjusted_course_score"] += adjusted_score
+            adjusted_scores = (
+                student_total_marks / total_type_marks * completion_percentage
+                if total_type_marks > 0 else np.zeros(len(students))
+            )
+            type_scores[assessment_type] = (student_total_marks, adjusted_scores)
+            total_scores += student_total_marks
+            adjusted_course_scores += adjusted_scores
 
         # Aggregate section-level performance
-        total_marks = sum(q.marks for q in Question.objects.filter(assessment__section=section))
-        for student_id, student_data in student_scores.items():
-            student_data["percentage"] = round(
-                (float(student_data["total_score"]) / total_marks) * 100, 2
-            ) if total_marks > 0 else 0
+        total_marks = float(matrix.total_marks.sum())
+        percentages = (
+            np.round(total_scores / total_marks * 100, 2) if total_marks > 0 else np.zeros(len(students))
+        )
 
         response_data = {
             "section_id": section.id,
@@ -111,56 +91,62 @@ class FacultyResultDetailsAPI(APIView):
                 at["completion_percentage"] for at in assessment_types_data
             ),
             "student_performance": {
-                "average": round(
-                    sum([s["percentage"] for s in student_scores.values()]) / len(student_scores), 2
-                ) if student_scores else 0,
-                "highest": max([s["percentage"] for s in student_scores.values()]) if student_scores else 0,
-                "lowest": min([s["percentage"] for s in student_scores.values()]) if student_scores else 0,
+                "average": round(float(percentages.mean()), 2) if students else 0,
+                "highest": float(percentages.max()) if students else 0,
+                "lowest": float(percentages.min()) if students else 0,
+                **distribution_statistics(percentages),
             },
             "assessment_types": assessment_types_data,
         }
 
         # Include student breakdown if requested
         if show_students:
-            response_data["students"] = list(student_scores.values())
+            response_data["students"] = [
+                {
+                    "student_id": student.id,
+                    "student_name": student.get_full_name(),
+                    "assessment_type_score": {
+                        assessment_type: {
+                            "obtained_score": float(obtained[row]),
+                            "adjusted_score": round(float(adjusted[row]), 2),
+                        }
+                        for assessment_type, (obtained, adjusted) in type_scores.items()
+                    },
+                    "total_score": float(total_scores[row]),
+                    "percentage": float(percentages[row]),
+                    "adjusted_course_score": float(adjusted_course_scores[row]),
+                }
+                for row, student in enumerate(students)
+            ]
 
         return Response(response_data)
 
     def type_details(self, section, breakdown, assessment_type, show_students):
-        assessments = section.assessments.filter(type=assessment_type)
+        matrix = self.load_matrix(section)
+        assessments = matrix.assessments_by_type[assessment_type]
         weight = breakdown.get(assessment_type, 0)
-        students = section.students.all()
+        students = matrix.students
+
+        # Students × assessments obtained marks for this type
+        total_marks = matrix.assessment_total_marks(assessments)
+        scores = matrix.assessment_scores(assessments)
+        total_type_marks = float(total_marks.sum())  # Track total marks for this type
 
         # Prepare data for each assessment
         assessments_data = []
-        total_type_marks = 0  # Track total marks for this type
-
-        for assessment in assessments:
-            questions = Question.objects.filter(assessment=assessment)
-            total_marks = sum(q.marks for q in questions)
-            total_type_marks += total_marks  # Accumulate total marks for all assessments of this type
-
-            scores = []
-            for student in students:
-                obtained_marks = sum(
-                    StudentQuestionScore.objects.filter(
-                        student=student, question__in=questions
-                    ).values_list('marks_obtained', flat=True)
-                )
-                scores.append(obtained_marks)
-
-            # Correct adjusted_total_marks calculation
-            assessment_weightage = assessment.weightage
-            adjusted_total_marks = (assessment_weightage / 100) * weight
+        for column, assessment in enumerate(assessments):
+            assessment_scores = scores[:, column]
+            adjusted_total_marks = (assessment.weightage / 100) * weight
 
             assessments_data.append({
                 "assessment_id": assessment.id,
                 "title": assessment.title,
-                "total_marks": total_marks,
-                "average": round(sum(scores) / len(scores), 2) if scores else 0,
-                "highest": max(scores) if scores else 0,
-                "lowest": min(scores) if scores else 0,
-                "assessment_weightage": assessment_weightage,
+                "total_marks": float(total_marks[column]),
+                "average": round(float(assessment_scores.mean()), 2) if students else 0,
+                "highest": float(assessment_scores.max()) if students else 0,
+                "lowest": float(assessment_scores.min()) if students else 0,
+                **distribution_statistics(assessment_scores),
+                "assessment_weightage": assessment.weightage,
                 "adjusted_total_marks": round(adjusted_total_marks, 2)
             })
 
@@ -171,51 +157,116 @@ class FacultyResultDetailsAPI(APIView):
             "assessments": assessments_data,
         }
 
-        # Include student breakdown if requested
+        # Include student breakdown if requested (derived from the same matrix)
         if show_students:
+            adjusted_totals = np.array([(a.weightage / 100) * weight for a in assessments], dtype=float)
+            safe_totals = np.where(total_marks > 0, total_marks, 1)
+            percentages = np.where(total_marks > 0, scores / safe_totals * 100, 0)
+            adjusted_scores = np.where(total_marks > 0, scores / safe_totals * adjusted_totals, 0)
+            type_scores = scores.sum(axis=1)
+
             student_data = []
-            for student in students:
-                student_score = 0
-                assessment_details = {}
-
-                for assessment in assessments:
-                    questions = Question.objects.filter(assessment=assessment)
-                    obtained_marks = sum(
-                        StudentQuestionScore.objects.filter(
-                            student=student, question__in=questions
-                        ).values_list('marks_obtained', flat=True)
-                    )
-                    total_marks = sum(q.marks for q in questions)
-
-                    # Correct adjusted score calculations
-                    adjusted_total_marks = (assessment.weightage / 100) * weight
-                    obtained_adjusted_score = (
-                        (float(obtained_marks) / total_marks) * adjusted_total_marks
-                        if total_marks > 0 else 0
-                    )
-
-                    assessment_details[assessment.id] = {
+            for row, student in enumerate(students):
+                assessment_details = {
+                    assessment.id: {
                         "assessment_title": assessment.title,
-                        "obtained_marks": obtained_marks,
-                        "total_marks": total_marks,
-                        "percentage": round(
-                            (float(obtained_marks) / total_marks) * 100, 2
-                        ) if total_marks > 0 else 0,
-                        "adjusted_total_marks": round(adjusted_total_marks, 2),
-                        "obtained_adjusted_score": round(obtained_adjusted_score, 2),
+                        "obtained_marks": float(scores[row, column]),
+                        "total_marks": float(total_marks[column]),
+                        "percentage": round(float(percentages[row, column]), 2),
+                        "adjusted_total_marks": round(float(adjusted_totals[column]), 2),
+                        "obtained_adjusted_score": round(float(adjusted_scores[row, column]), 2),
                     }
-                    student_score += obtained_marks
-
+                    for column, assessment in enumerate(assessments)
+                }
                 student_data.append({
                     "student_id": student.id,
                     "student_name": student.get_full_name(),
-                    "type_score": student_score,
+                    "type_score": float(type_scores[row]),
                     "percentage": round(
-                        (float(student_score) / total_type_marks) * 100, 2
+                        (float(type_scores[row]) / total_type_marks) * 100, 2
                     ) if total_type_marks > 0 else 0,
                     "assessment_details": assessment_details,
                 })
 
             response_data["students"] = student_data
 
-        return Response(response_data)
\ No newline at end of file
+        return Response(response_data)
+
+    def assessment_details(self, section, breakdown, assessment_type, assessment_id, show_students):
+        try:
+            assessment_id = int(assessment_id)
+        except ValueError:
+            raise Http404
+        assessment = get_object_or_404(Assessment, id=assessment_id, section=section, type=assessment_type)
+        weight = breakdown.get(assessment_type, 0)
+        questions = list(assessment.questions.order_by('id'))
+        students = list(section.students.order_by('id'))
+
+        # All scores of the assessment in one query, as a students × questions matrix
+        score_rows = list(StudentQuestionScore.objects.filter(
+            assessment=assessment
+        ).values_list('student_id', 'question_id', 'marks_obtained'))
+        student_index = {student.id: row for row, student in enumerate(students)}
+        question_index = {question.id: column for column, question in enumerate(questions)}
+        marks = build_score_matrix(student_index, question_index, score_rows)
+        # Cells with a score row; without one (sparse storage) the student is ungraded
+        graded = build_score_matrix(
+            student_index, question_index, ((student_id, question_id, 1) for student_id, question_id, _ in score_rows)
+        ).astype(bool)
+        question_marks = np.array([question.marks for question in questions], dtype=float)
+        total_marks = float(question_marks.sum())
+        student_totals = marks.sum(axis=1)
+
+        # Per-question item statistics over every student of the section
+        questions_data = []
+        for column, question in enumerate(questions):
+            question_scores = marks[:, column]
+            average = float(question_scores.mean()) if students else 0
+            questions_data.append({
+                "question_id": question.id,
+                "question_number": column + 1,
+                "total_marks": question.marks,
+                "average": round(average, 2),
+                "highest": float(question_scores.max()) if students else 0,
+                "lowest": float(question_scores.min()) if students else 0,
+                "zero_count": int(((question_scores == 0) & graded[:, column]).sum()),
+                "graded_count": int(graded[:, column].sum()),
+                "average_percentage": round(average / question.marks * 100, 2) if question.marks > 0 else 0,
+            })
+
+        adjusted_total_marks = (assessment.weightage / 100) * weight
+        response_data = {
+            "section_id": section.id,
+            "assessment_type": assessment_type,
+            "assessment_id": assessment.id,
+            "title": assessment.title,
+            "total_marks": total_marks,
+            "assessment_weightage": assessment.weightage,
+            "adjusted_total_marks": round(adjusted_total_marks, 2),
+            "student_count": len(students),
+            "average": round(float(student_totals.mean()), 2) if students else 0,
+            "highest": float(student_totals.max()) if students else 0,
+            "lowest": float(student_totals.min()) if students else 0,
+            **distribution_statistics(student_totals),
+            "questions": questions_data,
+        }
+
+        # Include per-student rows if requested
+        if show_students:
+            response_data["students"] = [
+                {
+                    "student_id": student.id,
+                    "student_name": student.get_full_name(),
+                    "obtained_marks": float(student_totals[row]),
+                    "percentage": round(float(student_totals[row]) / total_marks * 100, 2) if total_marks > 0 else 0,
+                    "obtained_adjusted_score": round(
+                        float(student_totals[row]) / total_marks * adjusted_total_marks, 2
+                    ) if total_marks > 0 else 0,
+                    "questions": {
+                        question.id: float(marks[row, column]) for column, question in enumerate(questions)
+                    },
+                }
+                for row, student in enumerate(students)
+            ]
+
+        return Response(response_data)
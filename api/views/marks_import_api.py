@@ -0,0 +1,37 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAuthenticated
+from django.shortcuts import get_object_or_404
+from assessments.models import Assessment
+from api.services.score_import import import_scores, ScoreImportError
+
+
+class MarksImportAPI(APIView):
+    permission_classes = [IsAuthenticated]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request):
+        # Expecting multipart data: ?id=<assessment id> and a .csv/.xlsx "file"
+        assessment = get_object_or_404(Assessment, id=request.query_params.get('id') or request.data.get('assessment_id'))
+        if not request.user.has_perm('assessments.change_assessment', assessment):
+            return Response({"status": "error", "message": "Permission denied"}, status=403)
+
+        uploaded_file = request.FILES.get('file')
+        if uploaded_file is None:
+            return Response({"status": "error", "message": "No file uploaded."}, status=400)
+
+        try:
+            updated = import_scores(assessment, uploaded_file)
+        except ScoreImportError as error:
+            return Response({
+                "status": "error",
+                "message": f"{error} No changes were made.",
+                "errors": error.errors
+            }, status=400)
+
+        return Response({
+            "status": "success",
+            "message": "Scores imported successfully.",
+            "updated": updated
+        })
@@ -0,0 +1,30 @@
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework.permissions import IsAuthenticated
+from django.shortcuts import get_object_or_404
+from programs.models import Program
+from api.services.plo_attainment import program_plo_attainment
+
+
+class ProgramPLOAttainmentAPI(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, program_id):
+        """
+        Program-wide PLO attainment rolled up from the stored CLO attainment of every
+        section of the program's courses. Pass show_students=true for per-student results.
+        """
+        program = get_object_or_404(Program, id=program_id)
+
+        # Only admins and the program's incharge see program-wide results
+        user = request.user
+        if not (user.is_superuser or user.role == 'admin' or program.program_incharge_id == user.id):
+            return Response({"status": "error", "message": "Permission denied"}, status=403)
+
+        show_students = request.query_params.get('show_students', 'false').lower() == 'true'
+
+        return Response({
+            "status": "success",
+            "message": "PLO attainment data fetched successfully.",
+            "data": program_plo_attainment(program, include_students=show_students)
+        })
@@ -9,7 +9,7 @@ class SectionsAPI(APIView):
 
     def get(self, request):
         user = request.user
-        sections = get_objects_for_user(user, 'view_section', Section)
+        sections = get_objects_for_user(user, 'view_section', Section).values_list('id', 'course__name', 'semester', 'section')
 
-        data = [{'id': section.id, 'name': f"{section.course.name} - {section.semester}{section.section}"} for section in sections]
+        data = [{'id': section_id, 'name': f"{course_name} - {semester}{section}"} for section_id, course_name, semester, section in sections]
         return Response(data)
@@ -4,6 +4,7 @@ from rest_framework.permissions import IsAuthenticated
 from programs.models import Program
 from courses.models import Course
 from sections.models import Section
+from api.services.student_standing import student_section_standings
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
@@ -17,7 +18,15 @@ def student_dashboard(request):
     programs = list(Program.objects.values("program_abbreviation", "program_title"))
 
     # Fetch Sections where the student is enrolled
-    enrolled_sections = Section.objects.filter(students=student).values("id", "course__name", "semester", "section")
+    enrolled_sections = list(Section.objects.filter(students=student).values("id", "course__name", "semester", "section"))
+
+    # Optionally add each section's current standing, computed for all sections together
+    if request.query_params.get('include_results', 'false').lower() == 'true':
+        standings = student_section_standings(
+            student, Section.objects.filter(students=student).select_related('assessmentbreakdown')
+        )
+        for section in enrolled_sections:
+            section.update(standings.get(section["id"], {}))
 
     available_courses = Course.objects.count()
 
@@ -25,7 +34,7 @@ def student_dashboard(request):
     data = {
         "programs": programs,
         "courses": available_courses,
-        "sections": list(enrolled_sections),
+        "sections": enrolled_sections,
     }
 
     return Response(data)
@@ -0,0 +1,19 @@
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework.permissions import IsAuthenticated
+from api.services.plo_attainment import student_plo_transcript
+
+
+class StudentPLOTranscriptAPI(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        """
+        The logged-in student's PLO attainment across all of their enrolled sections.
+        """
+        # ✅ Computed for all sections in one batched pass, cached until one of them changes
+        return Response({
+            "status": "success",
+            "message": "Student PLO transcript fetched successfully.",
+            "data": student_plo_transcript(request.user)
+        })
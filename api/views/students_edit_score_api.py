@@ -2,17 +2,35 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from assessments.models import Assessment, Question, StudentQuestionScore
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.negotiation import DefaultContentNegotiation
 from django.shortcuts import get_object_or_404
 from assessments.serializers import QuestionSerializer, StudentQuestionScoreSerializer
 from users.serializers import CustomUserSerializer
+from api.services.score_writes import validate_score_cells, save_score_cells, save_score_changes
+
+class ScoreLayoutNegotiation(DefaultContentNegotiation):
+    """
+    `?format=matrix` selects MarksAPI's payload layout rather than a renderer, so it is
+    answered as JSON instead of DRF's 404 for an unknown format.
+    """
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        if request.query_params.get(self.settings.URL_FORMAT_OVERRIDE) == 'matrix':
+            format_suffix = 'json'
+        return super().select_renderer(request, renderers, format_suffix)
+
 
 class MarksAPI(APIView):
     permission_classes = [IsAuthenticated]
+    content_negotiation_class = ScoreLayoutNegotiation
 
     def get(self, request):
         assessment_id = request.query_params.get('id')
         assessment = get_object_or_404(Assessment, id=assessment_id)
 
+        if request.query_params.get('format') == 'matrix':
+            return Response(self.matrix_payload(assessment))
+
         # Get questions
         questions = Question.objects.filter(assessment=assessment)
         question_data = QuestionSerializer(questions, many=True).data
@@ -22,7 +40,7 @@ class MarksAPI(APIView):
         student_data = CustomUserSerializer(students, many=True).data
 
         # Get scores
-        scores = StudentQuestionScore.objects.filter(question__assessment=assessment)
+        scores = StudentQuestionScore.objects.filter(assessment=assessment)
         score_data = StudentQuestionScoreSerializer(scores, many=True).data
 
         return Response({
@@ -32,51 +50,89 @@ class MarksAPI(APIView):
             'scores': score_data
         })
 
+    def matrix_payload(self, assessment):
+        """
+        Columnar grid: ordered question and student arrays plus dense row-major
+        (student × question) marks and version matrices, filled from one values_list
+        query without per-row serialization. Cells without a score row are null / 0.
+        """
+        questions = list(assessment.questions.order_by('id').values('id', 'marks'))
+        students = list(assessment.section.students.order_by('id').values('id', 'username', 'first_name', 'last_name'))
+        question_index = {question['id']: column for column, question in enumerate(questions)}
+        student_index = {student['id']: row for row, student in enumerate(students)}
+
+        marks = [[None] * len(questions) for _ in students]
+        versions = [[0] * len(questions) for _ in students]
+        score_rows = StudentQuestionScore.objects.filter(
+            assessment=assessment
+        ).values_list('student_id', 'question_id', 'marks_obtained', 'version')
+        for student_id, question_id, marks_obtained, version in score_rows:
+            row = student_index.get(student_id)
+            if row is not None:
+                column = question_index[question_id]
+                marks[row][column] = marks_obtained
+                versions[row][column] = version
+
+        return {
+            'assessment_title': assessment.title,
+            'format': 'matrix',
+            'questions': questions,
+            'students': students,
+            'question_ids': [question['id'] for question in questions],
+            'student_ids': [student['id'] for student in students],
+            'marks': marks,
+            'versions': versions,
+        }
+
     def post(self, request):
         # Expecting data in the form: { "scores": [{ "student_id": x, "question_id": y, "marks_obtained": z }, ...] }
+        assessment = get_object_or_404(Assessment, id=request.query_params.get('id') or request.data.get('assessment_id'))
+        if not request.user.has_perm('assessments.change_assessment', assessment):
+            return Response({"status": "error", "message": "Permission denied"}, status=403)
+        data = request.data.get('scores', [])
+        if not isinstance(data, list):
+            return Response({"status": "error", "message": "'scores' must be a list."}, status=400)
+
+        # ✅ Validate the whole grid in memory against the assessment's questions and students
+        values, errors = validate_score_cells(assessment, data)
+        if errors:
+            return Response({
+                "status": "error",
+                "message": f"{len(errors)} score(s) could not be saved. No changes were made.",
+                "errors": errors
+            }, status=400)
+
+        # ✅ Write all changed cells in one transaction
+        updated = save_score_cells(assessment, values)
+        return Response({
+            "status": "success",
+            "message": "Scores saved successfully.",
+            "updated": updated
+        })
+
+    def patch(self, request):
+        # Only changed cells: { "scores": [{ "student_id": x, "question_id": y, "marks_obtained": z, "version": v }, ...] }
+        # where v is the score's version from the last GET/PATCH response
+        assessment = get_object_or_404(Assessment, id=request.query_params.get('id') or request.data.get('assessment_id'))
+        if not request.user.has_perm('assessments.change_assessment', assessment):
+            return Response({"status": "error", "message": "Permission denied"}, status=403)
         data = request.data.get('scores', [])
-        errors = []
-
-        for score_item in data:
-            student_id = score_item['student_id']
-            question_id = score_item['question_id']
-            
-            # ✅ Convert marks_obtained to float to handle decimal values
-            try:
-                marks_obtained = float(score_item['marks_obtained']) if score_item['marks_obtained'] else 0.0
-            except ValueError:
-                return Response({
-                    "status": "error",
-                    "message": f"Invalid marks format for student {student_id}, question {question_id}"
-                }, status=400)
-
-            try:
-                question = Question.objects.get(id=question_id)
-
-                # ✅ Validate Marks (No Negative & Not More Than Max Marks)
-                if marks_obtained < 0:
-                    errors.append({
-                        "student_id": student_id,
-                        "question_id": question_id,
-                        "error": "Marks cannot be negative."
-                    })
-                elif marks_obtained > question.marks:
-                    errors.append({
-                        "student_id": student_id,
-                        "question_id": question_id,
-                        "error": f"Marks cannot exceed {question.marks}."
-                    })
-
-                if not errors:
-                    StudentQuestionScore.objects.update_or_create(
-                        student_id=student_id,
-                        question_id=question_id,
-                        defaults={"marks_obtained": marks_obtained}
-                    )
-
-            except Question.DoesNotExist:
-                errors.append({
-                    "student_id": student_id,
-                    "question_id": question_id,
-                    "error": "Question not found."
-                })
\ No newline at end of file
+        if not isinstance(data, list):
+            return Response({"status": "error", "message": "'scores' must be a list."}, status=400)
+
+        saved, conflicts, errors = save_score_changes(assessment, data)
+        if conflicts or errors:
+            # ✅ Accepted cells are saved; stale and invalid ones are returned cell by cell
+            return Response({
+                "status": "conflict" if conflicts else "error",
+                "message": f"{len(conflicts) + len(errors)} score(s) were not saved.",
+                "saved": saved,
+                "conflicts": conflicts,
+                "errors": errors
+            }, status=409 if conflicts else 400)
+
+        return Response({
+            "status": "success",
+            "message": "Scores saved successfully.",
+            "saved": saved
+        })
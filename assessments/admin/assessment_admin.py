@@ -1,15 +1,29 @@
-from django.contrib import admin
+from django import forms
+from django.conf import settings
+from django.contrib import admin, messages
+from django.core.exceptions import PermissionDenied
+from django.shortcuts import get_object_or_404, redirect, render
+from django.urls import path
 from assessments.models import Assessment
+from assessments.signals.question_signals import bulk_score_rows
 from sections.models import Section
+from sections.permissions import PermissionPrefetchAdminMixin, has_object_perm
 from guardian.shortcuts import get_objects_for_user
+from api.services.score_import import import_scores, ScoreImportError
 from .question_admin import QuestionInline
 from django.utils.html import format_html
 from django.urls import reverse
 
-class AssessmentAdmin(admin.ModelAdmin):
+class MarksImportForm(forms.Form):
+    file = forms.FileField(help_text="A .csv or .xlsx sheet with a username (SAP ID) column and Q1, Q2, ... columns.")
+
+
+class AssessmentAdmin(PermissionPrefetchAdminMixin, admin.ModelAdmin):
     inlines = [QuestionInline]
+    actions = ['import_marks']
     
     list_display = ['title', 'section', 'date', 'type', 'weightage', 'manage_marks_button']
+    list_select_related = ['section__course']  # Section.__str__ shows the course name
     fields = ['title', 'section', 'date', 'type', 'weightage']
     
     def changelist_view(self, request, extra_context=None):
@@ -30,7 +44,63 @@ class AssessmentAdmin(admin.ModelAdmin):
 
     manage_marks_button.short_description = 'Manage/View Marks'
     manage_marks_button.allow_tags = True
-        
+
+    @admin.action(description="Import marks from a spreadsheet")
+    def import_marks(self, request, queryset):
+        """
+        Redirect to the upload form of the selected assessment.
+        """
+        if queryset.count() != 1:
+            self.message_user(request, "Select exactly one assessment to import marks for.", messages.ERROR)
+            return None
+        return redirect('admin:assessments_assessment_import_marks', queryset.first().pk)
+
+    def get_urls(self):
+        urls = [
+            path(
+                '<int:assessment_id>/import-marks/',
+                self.admin_site.admin_view(self.import_marks_view),
+                name='assessments_assessment_import_marks',
+            ),
+        ]
+        return urls + super().get_urls()
+
+    def import_marks_view(self, request, assessment_id):
+        """
+        Upload a marks spreadsheet for one assessment (see api/services/score_import.py).
+        """
+        assessment = get_object_or_404(Assessment, pk=assessment_id)
+        if not self.has_change_permission(request, assessment):
+            raise PermissionDenied
+
+        form = MarksImportForm(request.POST or None, request.FILES or None)
+        if request.method == 'POST' and form.is_valid():
+            try:
+                updated = import_scores(assessment, form.cleaned_data['file'])
+            except ScoreImportError as error:
+                for row_error in error.errors[:20]:
+                    row = f"Row {row_error['row']}: " if row_error.get('row') else ""
+                    self.message_user(request, f"{row}{row_error['error']}", messages.ERROR)
+                self.message_user(request, f"{error} No changes were made.", messages.ERROR)
+            else:
+                self.message_user(request, f"Imported {updated} score(s) for {assessment.title}.", messages.SUCCESS)
+                return redirect('admin:assessments_assessment_changelist')
+
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': f"Import marks: {assessment.title}",
+            'assessment': assessment,
+            'form': form,
+            'sparse_scores': settings.OBE_SPARSE_SCORES,
+        }
+        return render(request, 'admin/assessments/assessment/import_marks.html', context)
+
+    def save_formset(self, request, form, formset, change):
+        # Score rows of all questions added through the inline are created in one insert
+        with bulk_score_rows():
+            super().save_formset(request, form, formset, change)
+
     def get_form(self, request, obj=None, **kwargs):
         """
         Customize the form to filter sections based on the user's permissions.
@@ -41,23 +111,23 @@ class AssessmentAdmin(admin.ModelAdmin):
         if 'section' in form.base_fields:
             # Superusers can see all sections
             if request.user.is_superuser:
-                form.base_fields['section'].queryset = Section.objects.all()
+                form.base_fields['section'].queryset = Section.objects.select_related('course')
             else:
                 # Faculty members can only see sections they have `view_section` permission for
                 allowed_sections = get_objects_for_user(request.user, 'sections.view_section', klass=Section)
-                form.base_fields['section'].queryset = allowed_sections
+                form.base_fields['section'].queryset = allowed_sections.select_related('course')
         
         return form
 
     def get_queryset(self, request):
         """
-        Restrict queryset to Assessments the user has permissions for.
+        Restrict queryset to Assessments of the sections the user can view.
         """
         queryset = super().get_queryset(request)
         if request.user.is_superuser:
             return queryset
         return queryset.filter(
-            pk__in=get_objects_for_user(request.user, 'assessments.view_assessment', queryset)
+            section__in=get_objects_for_user(request.user, 'sections.view_section', klass=Section)
         )
 
     def has_module_permission(self, request):
@@ -67,7 +137,7 @@ class AssessmentAdmin(admin.ModelAdmin):
         if request.user.is_superuser:
             return True
         if obj:
-            return request.user.has_perm('assessments.view_assessment', obj)
+            return has_object_perm(request, 'assessments.view_assessment', obj)
         return True
 
     def has_add_permission(self, request, obj=None):
@@ -80,7 +150,7 @@ class AssessmentAdmin(admin.ModelAdmin):
             return allowed_sections.exists()
 
         # Check if the user has the required permission for the related section of this object
-        return request.user.has_perm('sections.can_add_assessment', obj.section)
+        return has_object_perm(request, 'sections.can_add_assessment', Section(pk=obj.section_id))
 
     def has_change_permission(self, request, obj=None):
         """
@@ -90,7 +160,7 @@ class AssessmentAdmin(admin.ModelAdmin):
         if obj is None:  # For the changelist view
             return True
         # Check if the user has the required permission for the related section
-        return request.user.has_perm('assessments.change_assessment', obj)
+        return has_object_perm(request, 'assessments.change_assessment', obj)
 
     def has_delete_permission(self, request, obj=None):
         """
@@ -99,7 +169,7 @@ class AssessmentAdmin(admin.ModelAdmin):
         """
         if obj is None:  # For the changelist view
             return True
-        return request.user.has_perm('assessments.delete_assessment', obj)
+        return has_object_perm(request, 'assessments.delete_assessment', obj)
     
     class Media:
         js = ('js/assessment_clo_filter.js',)  # Add the JS file
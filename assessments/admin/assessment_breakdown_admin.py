@@ -2,7 +2,9 @@ from django.contrib import admin
 from django.core.exceptions import ValidationError
 from django import forms
 from assessments.models import AssessmentBreakdown
+from sections.models import Section
 from guardian.shortcuts import get_objects_for_user
+from sections.permissions import PermissionPrefetchAdminMixin, has_object_perm
 
 # Custom form for validation in admin
 class AssessmentBreakdownForm(forms.ModelForm):
@@ -29,12 +31,19 @@ class AssessmentBreakdownForm(forms.ModelForm):
 
         return cleaned_data
 
+class SectionListFilter(admin.RelatedFieldListFilter):
+    def field_choices(self, field, request, model_admin):
+        # Section.__str__ shows the course name, so load the courses with the sections
+        sections = Section.objects.select_related('course').order_by(*self.field_admin_ordering(field, request, model_admin))
+        return [(section.pk, str(section)) for section in sections]
+
 # Admin configuration for AssessmentBreakdown
 @admin.register(AssessmentBreakdown)
-class AssessmentBreakdownAdmin(admin.ModelAdmin):
+class AssessmentBreakdownAdmin(PermissionPrefetchAdminMixin, admin.ModelAdmin):
     form = AssessmentBreakdownForm  # Use the custom form with validation
     list_display = ('section', 'assignment_weightage', 'quiz_weightage', 'lab_weightage', 'mid_weightage', 'final_weightage', 'project_weightage')
-    list_filter = ('section',)
+    list_filter = (('section', SectionListFilter),)
+    list_select_related = ('section__course',)
     search_fields = ('section__name',)  # Assumes 'name' field on Section model
 
     fieldsets = (
@@ -71,7 +80,7 @@ class AssessmentBreakdownAdmin(admin.ModelAdmin):
         if request.user.is_superuser:
             return True
         if obj:
-            return request.user.has_perm('assessments.view_assessmentbreakdown', obj)
+            return has_object_perm(request, 'assessments.view_assessmentbreakdown', obj)
         return True
     
     def has_add_permission(self, request):
@@ -88,7 +97,7 @@ class AssessmentBreakdownAdmin(admin.ModelAdmin):
         if obj is None:  # For the changelist view
             return True
         # Check if the user has the required permission for the related section
-        return request.user.has_perm('assessments.change_assessmentbreakdown', obj)
+        return has_object_perm(request, 'assessments.change_assessmentbreakdown', obj)
     
     def has_delete_permission(self, request, obj=None):
         """
@@ -2,6 +2,7 @@ from django.contrib import admin
 from sections.models import Section
 from assessments.models import Question
 from guardian.shortcuts import get_objects_for_user
+from sections.permissions import has_object_perm
 
 class QuestionInline(admin.TabularInline):
     model = Question
@@ -26,13 +27,13 @@ class QuestionInline(admin.TabularInline):
         return True
     
     def has_add_permission(self, request, obj=None):
-        return request.user.has_perm('assessments.can_add_question', obj)
+        return has_object_perm(request, 'assessments.can_add_question', obj)
 
     def has_change_permission(self, request, obj=None):
-        return request.user.has_perm('assessments.change_assessment', obj)
+        return has_object_perm(request, 'assessments.change_assessment', obj)
 
     def has_delete_permission(self, request, obj=None):
-        return request.user.has_perm('assessments.delete_assessment', obj)
+        return has_object_perm(request, 'assessments.delete_assessment', obj)
     
     class Media:
         js = ('js/assessment_clo_filter.js',)  # Add the JS file
@@ -48,7 +49,7 @@ class QuestionAdmin(admin.ModelAdmin):
         Allow deletion of questions when cascading from an assessment.
         """
         if obj and hasattr(obj, 'assessment'):
-            return request.user.has_perm('assessments.delete_assessment', obj.assessment)
+            return has_object_perm(request, 'assessments.delete_assessment', obj.assessment)
         return True
 
 admin.site.register(Question, QuestionAdmin)
\ No newline at end of file
@@ -0,0 +1,69 @@
+"""
+Delete the zero-mark placeholder StudentQuestionScore rows that were created for every
+enrolled student before sparse score storage (OBE_SPARSE_SCORES) was enabled.
+
+A placeholder is a row with 0 marks that was never entered (version 0). Missing rows
+count as zero, so aggregates and stored attainment are unchanged and are not rebuilt,
+and no version token is bumped (or scores_bulk_saved sent): cached result trees and
+attainment zero-fill missing rows, so values cached before the collapse stay correct.
+Marks grids are read from the rows on every request and show the cells as ungraded.
+Zeros entered before score versions existed cannot be told apart and are collapsed too.
+
+Usage:
+    python manage.py collapse_placeholder_scores
+    python manage.py collapse_placeholder_scores --section 12 --dry-run
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from assessments.models import StudentQuestionScore
+
+
+class Command(BaseCommand):
+    help = "Delete never-entered zero-mark score rows for sparse score storage"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--section",
+            type=int,
+            action="append",
+            dest="sections",
+            help="Only collapse the given section id (may be repeated).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Rows per DELETE (default: 5000).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only count the placeholder rows.",
+        )
+
+    def handle(self, *args, **options):
+        if not settings.OBE_SPARSE_SCORES:
+            raise CommandError(
+                "OBE_SPARSE_SCORES is off, so new questions and enrollments would create placeholder rows again. "
+                "Enable it before collapsing."
+            )
+
+        placeholders = StudentQuestionScore.objects.filter(marks_obtained=0, version=0)
+        if options["sections"]:
+            placeholders = placeholders.filter(section_id__in=options["sections"])
+
+        if options["dry_run"]:
+            self.stdout.write(f"{placeholders.count()} placeholder score rows would be deleted.")
+            return
+
+        # Delete in primary key batches so no single statement holds locks on the whole table
+        deleted = 0
+        while True:
+            batch = list(placeholders.values_list("pk", flat=True)[:options["batch_size"]])
+            if not batch:
+                break
+            deleted += StudentQuestionScore.objects.filter(pk__in=batch).delete()[0]
+
+        self.stdout.write(self.style.SUCCESS(f"Collapsed {deleted} placeholder score rows."))
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.4 on 2026-10-18 06:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0005_alter_studentquestionscore_marks_obtained'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentquestionscore',
+            name='version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,29 @@
+from django.db import migrations
+
+
+def delete_object_permissions(apps, schema_editor):
+    """
+    Assessment and question permissions are resolved through their section
+    (sections.permissions.SectionPermissionBackend), so the per-object group rows
+    granted to the section groups are no longer needed.
+    """
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    GroupObjectPermission = apps.get_model('guardian', 'GroupObjectPermission')
+
+    content_types = ContentType.objects.filter(app_label='assessments', model__in=['assessment', 'question'])
+    GroupObjectPermission.objects.filter(
+        content_type__in=content_types, group__name__regex=r'^(faculty|students)_section_\d+$'
+    ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0006_studentquestionscore_version'),
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('guardian', '0002_generic_permissions_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_object_permissions, migrations.RunPython.noop),
+    ]
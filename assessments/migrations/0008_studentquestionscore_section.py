@@ -0,0 +1,59 @@
+# Generated by Django 5.0.4 on 2026-10-18 07:29
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def fill_score_sections(apps, schema_editor):
+    """Copy each score's question.assessment and its section onto the score row."""
+    Question = apps.get_model('assessments', 'Question')
+    StudentQuestionScore = apps.get_model('assessments', 'StudentQuestionScore')
+
+    question = Question.objects.filter(id=OuterRef('question_id'))
+    StudentQuestionScore.objects.update(
+        assessment_id=Subquery(question.values('assessment_id')[:1]),
+        section_id=Subquery(question.values('assessment__section_id')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0007_delete_object_permissions'),
+        ('sections', '0004_alter_section_year'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentquestionscore',
+            name='assessment',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, to='assessments.assessment'),
+        ),
+        migrations.AddField(
+            model_name='studentquestionscore',
+            name='section',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, to='sections.section'),
+        ),
+        migrations.RunPython(fill_score_sections, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='studentquestionscore',
+            name='assessment',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='assessments.assessment'),
+        ),
+        migrations.AlterField(
+            model_name='studentquestionscore',
+            name='section',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='sections.section'),
+        ),
+        migrations.AddIndex(
+            model_name='studentquestionscore',
+            index=models.Index(fields=['section', 'student'], name='score_section_student_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentquestionscore',
+            index=models.Index(fields=['assessment', 'student'], name='score_assessment_student_idx'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.0.4 on 2026-10-18 07:36
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0008_studentquestionscore_section'),
+        ('sections', '0004_alter_section_year'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    # New indexes first: on MySQL an index that backs a foreign key can only be dropped
+    # once another index can serve the constraint
+    operations = [
+        migrations.AddIndex(
+            model_name='assessment',
+            index=models.Index(fields=['section', 'type'], name='assessment_section_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentquestionscore',
+            index=models.Index(fields=['section', 'student', 'question', 'marks_obtained'], name='score_section_covering_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentquestionscore',
+            index=models.Index(fields=['question', 'student'], name='score_question_student_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='studentquestionscore',
+            name='score_section_student_idx',
+        ),
+        migrations.AlterField(
+            model_name='assessment',
+            name='section',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='assessments', to='sections.section'),
+        ),
+        migrations.AlterField(
+            model_name='studentquestionscore',
+            name='question',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='assessments.question'),
+        ),
+    ]
@@ -6,7 +6,8 @@ from sections.models import Section
 
 class Assessment(models.Model):
     title = models.CharField(max_length=100)
-    section = models.ForeignKey(Section, on_delete=models.CASCADE, related_name='assessments')
+    # Indexed by the (section, type) index below
+    section = models.ForeignKey(Section, on_delete=models.CASCADE, related_name='assessments', db_index=False)
     date = models.DateField()
     ASSESSMENT_TYPES = [
         ('quiz', 'Quiz'),
@@ -71,4 +72,7 @@ class Assessment(models.Model):
     class Meta:
         permissions = [
             ('can_add_question', 'Can add question to this assessment'),
+        ]
+        indexes = [
+            models.Index(fields=['section', 'type'], name='assessment_section_type_idx'),
         ]
\ No newline at end of file
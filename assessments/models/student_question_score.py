@@ -1,15 +1,32 @@
 from django.db import models
 from django.core.exceptions import ValidationError
 from users.models import CustomUser
+from sections.models import Section
+from .assessment import Assessment
 from .question import Question
 
 class StudentQuestionScore(models.Model):
     student = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
-    question = models.ForeignKey(Question, on_delete=models.CASCADE)
+    question = models.ForeignKey(Question, on_delete=models.CASCADE, db_index=False)  # See the (question, student) index
+    # Copies of question.assessment and question.assessment.section, so section and
+    # assessment wide score scans read one index range instead of joining questions and
+    # assessments. Filled in by save(); bulk writes set them explicitly.
+    assessment = models.ForeignKey(Assessment, on_delete=models.CASCADE, db_index=False)
+    section = models.ForeignKey(Section, on_delete=models.CASCADE, db_index=False)
     marks_obtained = models.FloatField()
+    # Bumped on every change; the marks grid sends it back so stale edits are rejected.
+    # 0 marks a zero placeholder row that was never entered (see collapse_placeholder_scores)
+    version = models.PositiveIntegerField(default=0)
 
     class Meta:
         unique_together = ('student', 'question')
+        indexes = [
+            # Covers the section-wide (student, question, marks) reads of the result services,
+            # so they never touch the table itself
+            models.Index(fields=['section', 'student', 'question', 'marks_obtained'], name='score_section_covering_idx'),
+            models.Index(fields=['assessment', 'student'], name='score_assessment_student_idx'),
+            models.Index(fields=['question', 'student'], name='score_question_student_idx'),
+        ]
 
     def clean(self):
         # Access the total marks from the related Question model
@@ -21,4 +38,8 @@ class StudentQuestionScore(models.Model):
     def save(self, *args, **kwargs):
         # Call clean() method to enforce validation before saving
         self.clean()
-        super().save(*args, **kwargs)
\ No newline at end of file
+        if self.section_id is None:
+            self.assessment_id = self.question.assessment_id
+            self.section_id = self.question.assessment.section_id
+        self.version += 1
+        super().save(*args, **kwargs)
@@ -2,9 +2,10 @@ from rest_framework import serializers
 from assessments.models import StudentQuestionScore
 
 class StudentQuestionScoreSerializer(serializers.ModelSerializer):
-    student_id = serializers.IntegerField(source='student.id')
-    question_id = serializers.IntegerField(source='question.id')
+    # Read the foreign key columns, not student.id / question.id, which load both rows per score
+    student_id = serializers.IntegerField(read_only=True)
+    question_id = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = StudentQuestionScore
-        fields = ['student_id', 'question_id', 'marks_obtained']
\ No newline at end of file
+        fields = ['student_id', 'question_id', 'marks_obtained', 'version']
\ No newline at end of file
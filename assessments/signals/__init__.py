@@ -1,3 +1,2 @@
-from .assessment_permissions_signals import *
 from .question_signals import *
-from .question_permissions_signals import *
\ No newline at end of file
+from .score_signals import *
@@ -1,19 +1,87 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.db.models import Subquery
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
-from assessments.models import Question, StudentQuestionScore
+from assessments.models import Assessment, Question, StudentQuestionScore
+from sections.models import Section
+
+# Questions created inside bulk_score_rows(), as (question_id, assessment_id)
+_deferred_questions = ContextVar('deferred_score_questions', default=None)
+
+
+def create_score_rows(questions):
+    """
+    Create the zero-mark StudentQuestionScore rows of every enrolled student for the given
+    (question_id, assessment_id) pairs in one bulk insert. Rows are known to be valid
+    (0 marks), so save()/clean() are skipped; existing rows are left alone.
+    Nothing is created in sparse mode (OBE_SPARSE_SCORES), where a missing row means ungraded.
+    """
+    if not questions or settings.OBE_SPARSE_SCORES:
+        return
+    section_by_assessment = dict(
+        Assessment.objects.filter(id__in={assessment_id for _, assessment_id in questions}).values_list('id', 'section_id')
+    )
+    students_by_section = {}
+    for section_id, student_id in Section.students.through.objects.filter(
+        section_id__in=set(section_by_assessment.values())
+    ).values_list('section_id', 'customuser_id'):
+        students_by_section.setdefault(section_id, []).append(student_id)
+
+    StudentQuestionScore.objects.bulk_create(
+        [
+            StudentQuestionScore(
+                student_id=student_id, question_id=question_id, marks_obtained=0.0,
+                assessment_id=assessment_id, section_id=section_by_assessment[assessment_id]
+            )
+            for question_id, assessment_id in questions
+            for student_id in students_by_section.get(section_by_assessment.get(assessment_id), [])
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+@contextmanager
+def bulk_score_rows():
+    """
+    Defer the score rows of questions created inside the block and create them all in
+    one insert when it exits, e.g. around the admin's QuestionInline formset save.
+    """
+    token = _deferred_questions.set([])
+    try:
+        yield
+        create_score_rows(_deferred_questions.get())
+    finally:
+        _deferred_questions.reset(token)
+
 
 @receiver(post_save, sender=Question)
 def create_student_scores(sender, instance, created, **kwargs):
     if created:
-        # Get all students enrolled in the section of the related assessment
-        students = instance.assessment.section.students.all()  # Assuming section.students is a ManyToManyField
-        for student in students:
-            StudentQuestionScore.objects.create(
-                student=student,
-                question=instance,
-                marks_obtained=0.0  # Default marks
-            )
+        deferred = _deferred_questions.get()
+        if deferred is not None:
+            deferred.append((instance.pk, instance.assessment_id))
+        else:
+            # The whole column of enrolled students in one insert
+            create_score_rows([(instance.pk, instance.assessment_id)])
+    else:
+        # Keep the scores' copied assessment and section keys in step if the question moved
+        StudentQuestionScore.objects.filter(question=instance).exclude(assessment_id=instance.assessment_id).update(
+            assessment_id=instance.assessment_id,
+            section_id=Subquery(Assessment.objects.filter(id=instance.assessment_id).values('section_id')[:1]),
+        )
+
+
+@receiver(post_save, sender=Assessment)
+def move_assessment_scores(sender, instance, created, **kwargs):
+    if not created:
+        # Keep the scores' copied section key in step if the assessment moved to another section
+        StudentQuestionScore.objects.filter(assessment=instance).exclude(section_id=instance.section_id).update(
+            section_id=instance.section_id
+        )
 
 @receiver(post_delete, sender=Question)
 def delete_student_scores(sender, instance, **kwargs):
-    StudentQuestionScore.objects.filter(question=instance).delete()
\ No newline at end of file
+    StudentQuestionScore.objects.filter(question=instance).delete()
@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# Sent by bulk score writes (which bypass StudentQuestionScore.save() and post_save)
+# with sender=Assessment and the `assessment` and `student_ids` whose scores changed.
+scores_bulk_saved = Signal()
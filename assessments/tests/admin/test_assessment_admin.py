@@ -0,0 +1,102 @@
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from assessments.models import StudentQuestionScore
+from api.tests.factories import create_program, create_course, create_users, create_section, create_assessment
+
+
+class AssessmentAdminPermissionsTestCase(TestCase):
+    def setUp(self):
+        self.program = create_program()
+        self.course = create_course(self.program)
+        self.faculty = create_users(1, role="faculty", prefix="faculty")[0]
+        self.faculty.is_staff = True
+        self.faculty.save()
+        self.section = create_section(
+            self.course, program=self.program, faculty=self.faculty, quiz_weightage=20, final_weightage=80
+        )
+        self.client.force_login(self.faculty)
+        self.url = "/dashboard/assessments/assessment/"
+
+    def add_assessments(self, count):
+        for _ in range(count):
+            create_assessment(self.section, "quiz", weightage=10, marks=(5,))
+
+    def test_changelist_permission_checks_are_prefetched(self):
+        """Test that per-row permission checks on the changelist do not add queries per assessment."""
+        self.add_assessments(2)
+        self.client.get(self.url)  # Warm the content type cache
+        with CaptureQueriesContext(connection) as small:
+            response = self.client.get(self.url)
+        self.assertContains(response, "Manage Marks", count=2)
+
+        self.add_assessments(8)
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.get(self.url)
+        self.assertContains(response, "Manage Marks", count=10)
+        self.assertEqual(len(small), len(large))
+
+    def test_other_faculty_sees_nothing(self):
+        """Test that another faculty member cannot see or manage the section's assessments."""
+        self.add_assessments(1)
+        other = create_users(1, role="faculty", prefix="other")[0]
+        other.is_staff = True
+        other.save()
+        self.client.force_login(other)
+        self.assertNotContains(self.client.get(self.url), "Manage Marks")
+
+    def test_superuser_changelist_and_form(self):
+        """Test that the changelist and the add form load each section's course up front."""
+        self.faculty.is_superuser = True
+        self.faculty.save()
+
+        def fetch():
+            self.client.get(self.url)
+            self.client.get(self.url + "add/")
+
+        self.add_assessments(2)
+        fetch()  # Warm per-process caches
+        with CaptureQueriesContext(connection) as small:
+            fetch()
+        self.add_assessments(4)
+        for letter in "BCDE":
+            create_section(self.course, program=self.program, section=letter)
+        with CaptureQueriesContext(connection) as large:
+            fetch()
+        self.assertEqual(len(small), len(large))
+
+
+class AssessmentAdminImportMarksTestCase(TestCase):
+    def setUp(self):
+        self.program = create_program()
+        self.course = create_course(self.program)
+        self.faculty = create_users(1, role="faculty", prefix="faculty")[0]
+        self.faculty.is_staff = True
+        self.faculty.save()
+        self.student = create_users(1)[0]
+        self.section = create_section(self.course, program=self.program, faculty=self.faculty, students=[self.student])
+        self.assessment = create_assessment(self.section, marks=(5, 10))
+        self.q1, self.q2 = self.assessment.questions.order_by('id')
+        self.client.force_login(self.faculty)
+        self.url = f"/dashboard/assessments/assessment/{self.assessment.id}/import-marks/"
+
+    def import_marks(self, content):
+        return self.client.post(self.url, {"file": SimpleUploadedFile("marks.csv", content.encode())})
+
+    def test_blank_cells_do_what_the_page_says(self):
+        """Test that the page describes blank cells as the import treats them, in both storage modes."""
+        self.import_marks("username,Q1,Q2\nstudent0,4,9\n")
+
+        self.assertContains(self.client.get(self.url), "A blank cell sets the mark to 0")
+        self.import_marks("username,Q1,Q2\nstudent0,,9\n")
+        self.assertEqual(StudentQuestionScore.objects.get(student=self.student, question=self.q1).marks_obtained, 0)
+
+        with self.settings(OBE_SPARSE_SCORES=True):
+            self.assertContains(
+                self.client.get(self.url), "A blank cell clears the mark and leaves the question ungraded"
+            )
+            self.import_marks("username,Q2\nstudent0,\n")
+        self.assertFalse(StudentQuestionScore.objects.filter(student=self.student, question=self.q2).exists())
+        self.assertContains(self.client.get(self.url), "leave out a question's column to keep its current marks")
+        self.assertEqual(StudentQuestionScore.objects.get(student=self.student, question=self.q1).marks_obtained, 0)
@@ -0,0 +1,35 @@
+import io
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+from assessments.models import StudentQuestionScore
+from results.models import StudentAssessmentAggregate
+from api.tests.factories import create_program, create_course, create_users, create_section, create_assessment, set_marks
+
+
+class CollapsePlaceholderScoresTestCase(TestCase):
+    def setUp(self):
+        self.program = create_program()
+        self.course = create_course(self.program)
+        self.students = create_users(3)
+        self.section = create_section(self.course, program=self.program, students=self.students)
+        self.assessment = create_assessment(self.section, marks=(5, 5))
+        set_marks(self.students[0], self.assessment, (3, 0))
+
+    @override_settings(OBE_SPARSE_SCORES=True)
+    def test_only_placeholders_are_deleted(self):
+        """Test that never-entered zero rows are deleted while entered marks, including zeros, are kept."""
+        call_command("collapse_placeholder_scores", batch_size=2, stdout=io.StringIO())
+
+        self.assertEqual(
+            set(StudentQuestionScore.objects.values_list("student_id", "marks_obtained")),
+            {(self.students[0].id, 3.0), (self.students[0].id, 0.0)}
+        )
+        self.assertEqual(StudentQuestionScore.objects.count(), 2)
+        self.assertEqual(StudentAssessmentAggregate.objects.filter(assessment=self.assessment).count(), 3)
+
+    def test_requires_sparse_mode(self):
+        """Test that collapsing is refused while placeholder rows would still be created."""
+        with self.assertRaises(CommandError):
+            call_command("collapse_placeholder_scores")
+        self.assertEqual(StudentQuestionScore.objects.count(), 6)
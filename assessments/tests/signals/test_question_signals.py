@@ -0,0 +1,123 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from assessments.models import Question, StudentQuestionScore
+from assessments.signals.question_signals import bulk_score_rows, create_score_rows
+from results.models import StudentAssessmentAggregate
+from api.services.score_writes import save_score_cells
+from api.services.section_structure import load_student_scores
+from api.tests.factories import create_program, create_course, create_users, create_section, create_assessment, set_marks
+
+
+def score_inserts(queries):
+    return [q for q in queries if q["sql"].startswith('INSERT') and '"assessments_studentquestionscore"' in q["sql"]]
+
+
+class QuestionScoreRowsTestCase(TestCase):
+    def setUp(self):
+        self.program = create_program()
+        self.course = create_course(self.program)
+        self.students = create_users(5)
+        self.section = create_section(self.course, program=self.program, students=self.students)
+        self.assessment = create_assessment(self.section, marks=(5,))
+
+    def test_question_creates_column_in_one_insert(self):
+        """Test that a new question gets a zero score row per enrolled student from a single insert."""
+        with CaptureQueriesContext(connection) as queries:
+            question = Question.objects.create(assessment=self.assessment, marks=10)
+
+        self.assertEqual(len(score_inserts(queries)), 1)
+        self.assertEqual(
+            set(StudentQuestionScore.objects.filter(question=question).values_list('student_id', 'marks_obtained')),
+            {(student.id, 0.0) for student in self.students}
+        )
+
+    def test_deferred_questions_share_one_insert(self):
+        """Test that questions created inside bulk_score_rows() get their rows from one insert at the end."""
+        with CaptureQueriesContext(connection) as queries:
+            with bulk_score_rows():
+                questions = [Question.objects.create(assessment=self.assessment, marks=2) for _ in range(4)]
+                self.assertFalse(StudentQuestionScore.objects.filter(question__in=questions).exists())
+
+        self.assertEqual(len(score_inserts(queries)), 1)
+        self.assertEqual(StudentQuestionScore.objects.filter(question__in=questions).count(), 4 * 5)
+
+    def test_existing_rows_are_kept(self):
+        """Test that rows which already exist are left untouched."""
+        question = Question.objects.create(assessment=self.assessment, marks=10)
+        score = StudentQuestionScore.objects.get(question=question, student=self.students[0])
+        score.marks_obtained = 7
+        score.save()
+
+        create_score_rows([(question.pk, self.assessment.pk)])
+
+        self.assertEqual(StudentQuestionScore.objects.get(pk=score.pk).marks_obtained, 7)
+        self.assertEqual(StudentQuestionScore.objects.filter(question=question).count(), 5)
+
+
+@override_settings(OBE_SPARSE_SCORES=True)
+class SparseScoreRowsTestCase(TestCase):
+    def setUp(self):
+        self.program = create_program()
+        self.course = create_course(self.program)
+        self.students = create_users(2)
+        self.section = create_section(self.course, program=self.program, students=self.students)
+        self.assessment = create_assessment(self.section, marks=(5, 5))
+
+    def test_no_placeholder_rows(self):
+        """Test that sparse mode creates no score rows for new questions or enrollments."""
+        Question.objects.create(assessment=self.assessment, marks=10)
+        self.section.students.add(*create_users(2, prefix="late"))
+        self.assertFalse(StudentQuestionScore.objects.exists())
+
+    def test_missing_rows_count_as_zero(self):
+        """Test that aggregates treat missing rows as zero and entered zeros are stored."""
+        set_marks(self.students[0], self.assessment, (4, 0))
+
+        self.assertEqual(StudentQuestionScore.objects.count(), 2)
+        aggregates = dict(
+            StudentAssessmentAggregate.objects.filter(assessment=self.assessment).values_list('student_id', 'obtained_sum')
+        )
+        self.assertEqual(aggregates, {self.students[0].id: 4.0, self.students[1].id: 0.0})
+
+
+class ScoreSectionKeysTestCase(TestCase):
+    def setUp(self):
+        self.program = create_program()
+        self.course = create_course(self.program)
+        self.student, self.late_student = create_users(2)
+        self.section = create_section(self.course, program=self.program, students=[self.student])
+        self.assessment = create_assessment(self.section, marks=(5, 5))
+
+    def assertKeysMatchQuestions(self):
+        scores = StudentQuestionScore.objects.select_related('question__assessment')
+        self.assertTrue(scores.exists())
+        for score in scores:
+            self.assertEqual(
+                (score.assessment_id, score.section_id),
+                (score.question.assessment_id, score.question.assessment.section_id)
+            )
+
+    def test_write_paths_fill_keys(self):
+        """Test that question, enrollment, single and bulk score writes all fill the section and assessment keys."""
+        Question.objects.create(assessment=self.assessment, marks=3)
+        self.section.students.add(self.late_student)
+        set_marks(self.student, self.assessment, (4, 4))
+        StudentQuestionScore.objects.filter(student=self.late_student).delete()
+        question = self.assessment.questions.order_by('id')[0]
+        save_score_cells(self.assessment, {(self.late_student.id, question.id): 2})
+        self.assertKeysMatchQuestions()
+
+    def test_moved_assessment_moves_scores(self):
+        """Test that moving an assessment to another section updates its scores' section key."""
+        other_section = create_section(self.course, program=self.program, section="B")
+        self.assessment.section = other_section
+        self.assessment.save()
+        self.assertKeysMatchQuestions()
+        self.assertFalse(StudentQuestionScore.objects.filter(section=self.section).exists())
+
+    def test_section_scan_does_not_join(self):
+        """Test that loading a student's section scores reads the score table alone."""
+        with CaptureQueriesContext(connection) as queries:
+            load_student_scores(self.section, self.student.id)
+        self.assertNotIn('JOIN', queries[0]["sql"])
@@ -0,0 +1,99 @@
+from collections import defaultdict
+from django.db import connection
+from django.db.models import OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from assessments.models import Assessment, Question, StudentQuestionScore
+from sections.models import Section
+from results.models import StudentAssessmentAggregate
+
+
+def upsert_options(unique_fields, update_fields):
+    """
+    bulk_create() options that update rows conflicting on `unique_fields`. MySQL/MariaDB
+    take no conflict target (ON DUPLICATE KEY UPDATE fires on any unique key), so
+    `unique_fields` is only passed to backends that support it.
+    """
+    options = {'update_conflicts': True, 'update_fields': update_fields}
+    if connection.features.supports_update_conflicts_with_target:
+        options['unique_fields'] = unique_fields
+    return options
+
+
+def refresh_aggregates(assessment_ids=None, section_ids=None, student_ids=None, batch_size=1000):
+    """
+    Recompute the aggregate rows of every enrolled (student, assessment) pair matching the
+    filters with grouped queries, and write them back with one bulk upsert per batch.
+    """
+    assessments = Assessment.objects.all()
+    if assessment_ids is not None:
+        assessments = assessments.filter(id__in=assessment_ids)
+    if section_ids is not None:
+        assessments = assessments.filter(section_id__in=section_ids)
+    assessments = list(
+        assessments.annotate(total=Coalesce(Sum('questions__marks'), Value(0.0))).values_list('id', 'section_id', 'total')
+    )
+    if not assessments:
+        return 0
+
+    enrollments = Section.students.through.objects.filter(section_id__in={section_id for _, section_id, _ in assessments})
+    scores = StudentQuestionScore.objects.filter(assessment_id__in=[assessment_id for assessment_id, _, _ in assessments])
+    if student_ids is not None:
+        enrollments = enrollments.filter(customuser_id__in=student_ids)
+        scores = scores.filter(student_id__in=student_ids)
+
+    students_by_section = defaultdict(list)
+    for section_id, student_id in enrollments.values_list('section_id', 'customuser_id'):
+        students_by_section[section_id].append(student_id)
+
+    obtained = {
+        (student_id, assessment_id): total
+        for student_id, assessment_id, total in scores.values_list('student_id', 'assessment_id').annotate(total=Sum('marks_obtained'))
+    }
+
+    rows = [
+        StudentAssessmentAggregate(
+            student_id=student_id,
+            assessment_id=assessment_id,
+            obtained_sum=obtained.get((student_id, assessment_id), 0.0),
+            total_marks=total_marks,
+        )
+        for assessment_id, section_id, total_marks in assessments
+        for student_id in students_by_section[section_id]
+    ]
+    StudentAssessmentAggregate.objects.bulk_create(
+        rows,
+        batch_size=batch_size,
+        **upsert_options(['student', 'assessment'], ['obtained_sum', 'total_marks', 'updated_at']),
+    )
+    return len(rows)
+
+
+def update_aggregates(assessment_ids, student_ids=None):
+    """
+    Recompute existing aggregate rows in place with a single UPDATE. Rows are never
+    inserted here, so it is safe to call while an assessment is being cascade-deleted.
+    Returns the number of rows updated.
+    """
+    obtained_sum = StudentQuestionScore.objects.filter(
+        student_id=OuterRef('student_id'), assessment_id=OuterRef('assessment_id')
+    ).values('student_id').annotate(total=Sum('marks_obtained')).values('total')
+    total_marks = Question.objects.filter(
+        assessment_id=OuterRef('assessment_id')
+    ).values('assessment_id').annotate(total=Sum('marks')).values('total')
+
+    aggregates = StudentAssessmentAggregate.objects.filter(assessment_id__in=assessment_ids)
+    if student_ids is not None:
+        aggregates = aggregates.filter(student_id__in=student_ids)
+    return aggregates.update(
+        obtained_sum=Coalesce(Subquery(obtained_sum), Value(0.0)),
+        total_marks=Coalesce(Subquery(total_marks), Value(0.0)),
+        updated_at=timezone.now(),
+    )
+
+
+def delete_aggregates(section_ids, student_ids):
+    """Drop the aggregate rows of students removed from sections."""
+    StudentAssessmentAggregate.objects.filter(
+        assessment__section_id__in=section_ids, student_id__in=student_ids
+    ).delete()
@@ -0,0 +1,47 @@
+"""
+Rebuild the StudentAssessmentAggregate table from StudentQuestionScore.
+
+Usage:
+    python manage.py rebuild_assessment_aggregates
+    python manage.py rebuild_assessment_aggregates --section 12 --section 15
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from results.aggregates import refresh_aggregates
+from results.models import StudentAssessmentAggregate
+
+
+class Command(BaseCommand):
+    help = "Rebuild per-student, per-assessment aggregate rows from raw scores"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--section",
+            type=int,
+            action="append",
+            dest="sections",
+            help="Only rebuild the given section id (may be repeated).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Rows per bulk insert (default: 1000).",
+        )
+
+    def handle(self, *args, **options):
+        section_ids = options["sections"]
+
+        with transaction.atomic():
+            aggregates = StudentAssessmentAggregate.objects.all()
+            if section_ids:
+                aggregates = aggregates.filter(assessment__section_id__in=section_ids)
+            deleted, _ = aggregates.delete()
+
+            created = refresh_aggregates(section_ids=section_ids, batch_size=options["batch_size"])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt assessment aggregates: {deleted} rows removed, {created} rows written."
+        ))
@@ -0,0 +1,71 @@
+# Generated by Django 5.0.4 on 2026-10-18 06:31
+
+import django.db.models.deletion
+from django.conf import settings
+from collections import defaultdict
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def populate_aggregates(apps, schema_editor):
+    """
+    Build the initial aggregate rows from existing scores with grouped queries.
+    """
+    Assessment = apps.get_model('assessments', 'Assessment')
+    StudentQuestionScore = apps.get_model('assessments', 'StudentQuestionScore')
+    Section = apps.get_model('sections', 'Section')
+    StudentAssessmentAggregate = apps.get_model('results', 'StudentAssessmentAggregate')
+
+    students_by_section = defaultdict(list)
+    for section_id, student_id in Section.students.through.objects.values_list('section_id', 'customuser_id'):
+        students_by_section[section_id].append(student_id)
+
+    obtained = {
+        (student_id, assessment_id): total
+        for student_id, assessment_id, total in StudentQuestionScore.objects.values_list(
+            'student_id', 'question__assessment_id'
+        ).annotate(total=Sum('marks_obtained'))
+    }
+
+    rows = [
+        StudentAssessmentAggregate(
+            student_id=student_id,
+            assessment_id=assessment_id,
+            obtained_sum=obtained.get((student_id, assessment_id), 0.0),
+            total_marks=total_marks or 0.0,
+        )
+        for assessment_id, section_id, total_marks in Assessment.objects.annotate(
+            total=Sum('questions__marks')
+        ).values_list('id', 'section_id', 'total')
+        for student_id in students_by_section[section_id]
+    ]
+    StudentAssessmentAggregate.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('assessments', '0005_alter_studentquestionscore_marks_obtained'),
+        ('sections', '0004_alter_section_year'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentAssessmentAggregate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('obtained_sum', models.FloatField(default=0)),
+                ('total_marks', models.FloatField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('assessment', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='student_aggregates', to='assessments.assessment')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='assessment_aggregates', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('student', 'assessment')},
+            },
+        ),
+        migrations.RunPython(populate_aggregates, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.0.4 on 2026-10-18 06:39
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('outcomes', '0002_initial'),
+        ('results', '0001_initial'),
+        ('sections', '0004_alter_section_year'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CLOAttainmentSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('computed_at', models.DateTimeField(auto_now_add=True)),
+                ('section', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='clo_attainment_snapshot', to='sections.section')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='StudentCLOAttainment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('attained', models.FloatField(default=0)),
+                ('possible', models.FloatField(default=0)),
+                ('clo', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='student_attainments', to='outcomes.courselearningoutcome')),
+                ('section', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='student_clo_attainments', to='sections.section')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='clo_attainments', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('section', 'student', 'clo')},
+            },
+        ),
+    ]
@@ -0,0 +1,7 @@
+from .student_assessment_aggregate import StudentAssessmentAggregate
+from .clo_attainment import CLOAttainmentSnapshot, StudentCLOAttainment
+__all__ = [
+    'StudentAssessmentAggregate',
+    'CLOAttainmentSnapshot',
+    'StudentCLOAttainment',
+]
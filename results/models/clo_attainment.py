@@ -0,0 +1,34 @@
+from django.db import models
+from users.models import CustomUser
+from outcomes.models import CourseLearningOutcome
+from sections.models import Section
+
+class CLOAttainmentSnapshot(models.Model):
+    """
+    Marks a section's StudentCLOAttainment rows as current. Score, structure and enrollment
+    changes delete the snapshot (see api/signals/cache_signals.py); the rows are recomputed
+    in bulk the next time a PLO report needs the section (see api/services/plo_attainment.py).
+    """
+    section = models.OneToOneField(Section, on_delete=models.CASCADE, related_name='clo_attainment_snapshot')
+    computed_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.section} computed at {self.computed_at}"
+
+
+class StudentCLOAttainment(models.Model):
+    """
+    Stored CLO attainment of a student in a section: the attained and possible CLO weight,
+    as shown by the CLO attainment APIs. Only rows of sections with a snapshot are current.
+    """
+    section = models.ForeignKey(Section, on_delete=models.CASCADE, related_name='student_clo_attainments')
+    student = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='clo_attainments')
+    clo = models.ForeignKey(CourseLearningOutcome, on_delete=models.CASCADE, related_name='student_attainments')
+    attained = models.FloatField(default=0)
+    possible = models.FloatField(default=0)
+
+    class Meta:
+        unique_together = ('section', 'student', 'clo')
+
+    def __str__(self):
+        return f"{self.student} - {self.clo}: {self.attained}/{self.possible}"
@@ -0,0 +1,21 @@
+from django.db import models
+from users.models import CustomUser
+from assessments.models import Assessment
+
+class StudentAssessmentAggregate(models.Model):
+    """
+    Derived per-student, per-assessment totals kept current from score, question and
+    enrollment changes (see results/aggregates.py). Result APIs read these rows instead
+    of re-summing StudentQuestionScore on every request.
+    """
+    student = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='assessment_aggregates')
+    assessment = models.ForeignKey(Assessment, on_delete=models.CASCADE, related_name='student_aggregates')
+    obtained_sum = models.FloatField(default=0)
+    total_marks = models.FloatField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('student', 'assessment')
+
+    def __str__(self):
+        return f"{self.student} - {self.assessment}: {self.obtained_sum}/{self.total_marks}"
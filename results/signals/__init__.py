@@ -0,0 +1 @@
+from .aggregate_signals import *
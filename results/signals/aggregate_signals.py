@@ -0,0 +1,39 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from assessments.models import Assessment, Question, StudentQuestionScore
+from assessments.signals import scores_bulk_saved
+from results.aggregates import refresh_aggregates, update_aggregates
+
+@receiver(post_save, sender=Assessment)
+def create_assessment_aggregates(sender, instance, created, **kwargs):
+    """
+    Create zeroed aggregate rows for every enrolled student when an Assessment is created.
+    """
+    if created:
+        refresh_aggregates(assessment_ids=[instance.pk])
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def update_aggregates_on_question_change(sender, instance, **kwargs):
+    """
+    Question create/delete/marks changes alter the assessment totals (and, on delete, the obtained sums).
+    """
+    update_aggregates([instance.assessment_id])
+
+@receiver(post_save, sender=StudentQuestionScore)
+def update_aggregate_on_score_save(sender, instance, created, **kwargs):
+    """
+    Keep the student's aggregate for the score's assessment current.
+    """
+    if created and not instance.marks_obtained:
+        return  # A new zero-mark row does not change any sum
+    assessment_id = instance.assessment_id
+    if not update_aggregates([assessment_id], [instance.student_id]):
+        refresh_aggregates(assessment_ids=[assessment_id], student_ids=[instance.student_id])
+
+@receiver(scores_bulk_saved)
+def refresh_aggregates_on_bulk_score_save(sender, assessment, student_ids, **kwargs):
+    """
+    Bulk score writes skip post_save; refresh the affected students' aggregates in one upsert.
+    """
+    refresh_aggregates(assessment_ids=[assessment.pk], student_ids=student_ids)
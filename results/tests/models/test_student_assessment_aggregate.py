@@ -0,0 +1,70 @@
+from django.core.management import call_command
+from django.test import TestCase
+from assessments.models import Question, StudentQuestionScore
+from results.aggregates import refresh_aggregates
+from results.models import StudentAssessmentAggregate
+from api.tests.backend_features import mysql_upserts
+from api.tests.factories import (
+    create_program, create_course, create_users, create_section, create_assessment, set_marks
+)
+
+
+class StudentAssessmentAggregateTestCase(TestCase):
+    def setUp(self):
+        self.program = create_program()
+        self.course = create_course(self.program)
+        self.student, self.other_student = create_users(2)
+        self.section = create_section(self.course, program=self.program, students=[self.student])
+        self.assessment = create_assessment(self.section, "final", 100, marks=(10, 20))
+
+    def aggregate(self, student=None):
+        return StudentAssessmentAggregate.objects.get(student=student or self.student, assessment=self.assessment)
+
+    def test_rows_created_for_enrolled_students(self):
+        """Test that creating an assessment and enrolling a student create zeroed aggregate rows."""
+        self.assertEqual((self.aggregate().obtained_sum, self.aggregate().total_marks), (0, 30))
+
+        self.section.students.add(self.other_student)
+        self.assertEqual(self.aggregate(self.other_student).total_marks, 30)
+
+    def test_refresh_without_conflict_target(self):
+        """Test that aggregates are inserted and refreshed on backends without upsert targets (MySQL)."""
+        with mysql_upserts():
+            self.section.students.add(self.other_student)
+            set_marks(self.student, self.assessment, (3, 4))
+            refresh_aggregates(assessment_ids=[self.assessment.id])
+        self.assertEqual(self.aggregate(self.other_student).total_marks, 30)
+        self.assertEqual(self.aggregate().obtained_sum, 7)
+        self.assertEqual(StudentAssessmentAggregate.objects.count(), 2)
+
+    def test_score_save_updates_obtained_sum(self):
+        """Test that saving a StudentQuestionScore updates the student's aggregate."""
+        set_marks(self.student, self.assessment, (7, 12.5))
+        self.assertEqual(self.aggregate().obtained_sum, 19.5)
+
+    def test_question_changes_update_totals(self):
+        """Test that question create, marks change and delete keep totals and sums current."""
+        set_marks(self.student, self.assessment, (7, 12))
+        question = Question.objects.create(assessment=self.assessment, marks=5)
+        self.assertEqual(self.aggregate().total_marks, 35)
+
+        question.marks = 15
+        question.save()
+        self.assertEqual(self.aggregate().total_marks, 45)
+
+        self.assessment.questions.order_by('id').first().delete()
+        self.assertEqual((self.aggregate().obtained_sum, self.aggregate().total_marks), (12, 35))
+
+    def test_unenrolling_removes_rows(self):
+        """Test that removing a student from the section deletes their aggregate rows."""
+        self.section.students.remove(self.student)
+        self.assertFalse(StudentAssessmentAggregate.objects.filter(student=self.student).exists())
+
+    def test_rebuild_command(self):
+        """Test that the management command rebuilds rows from raw scores."""
+        set_marks(self.student, self.assessment, (4, 6))
+        StudentQuestionScore.objects.filter(student=self.student).update(marks_obtained=1)  # Bypasses signals
+        StudentAssessmentAggregate.objects.all().delete()
+
+        call_command("rebuild_assessment_aggregates", stdout=open("/dev/null", "w"))
+        self.assertEqual((self.aggregate().obtained_sum, self.aggregate().total_marks), (2, 30))
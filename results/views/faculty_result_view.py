@@ -12,7 +12,7 @@ def faculty_result_view(request):
     faculty = request.user  # Get the logged-in faculty member
 
     # Fetch only sections visible to this faculty member (using object-level permissions if applicable)
-    faculty_sections = get_objects_for_user(faculty, 'view_section', Section)
+    faculty_sections = get_objects_for_user(faculty, 'view_section', Section).select_related('course')
 
     context = {
         **site.each_context(request),  # Includes admin context like available_apps
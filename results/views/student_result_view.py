@@ -9,7 +9,7 @@ def student_result_view(request):
     student = request.user  # Get the logged-in faculty member
 
     # Fetch only sections visible to this student (using object-level permissions if applicable)
-    user_sections = get_objects_for_user(student, 'view_section', Section)
+    user_sections = get_objects_for_user(student, 'view_section', Section).select_related('course')
 
     context = {
         **site.each_context(request),  # Includes admin context like available_apps
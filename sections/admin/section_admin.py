@@ -6,6 +6,7 @@ from sections.models import Section
 from assessments.models import Assessment
 from guardian.shortcuts import get_objects_for_user
 from guardian.admin import GuardedModelAdmin
+from sections.permissions import PermissionPrefetchAdminMixin, has_object_perm
 from django.utils.translation import gettext_lazy as _
 
 class SectionForm(forms.ModelForm):
@@ -16,10 +17,11 @@ class SectionForm(forms.ModelForm):
     class Media:
         js = ('js/section_form.js',)  # Link to the custom JavaScript file
 
-class SectionAdmin(GuardedModelAdmin):
+class SectionAdmin(PermissionPrefetchAdminMixin, GuardedModelAdmin):
     form = SectionForm
 
     list_display = ('course', 'semester', 'section', 'batch', 'year', 'faculty')
+    list_select_related = ('course', 'faculty')
     list_filter = ('semester', 'batch', 'year')
     search_fields = ('course__name', 'faculty__username', 'faculty__first_name', 'faculty__last_name')
 
@@ -39,7 +41,7 @@ class SectionAdmin(GuardedModelAdmin):
         if request.user.is_superuser:
             return True
         if obj:
-            return request.user.has_perm('sections.view_section', obj)
+            return has_object_perm(request, 'sections.view_section', obj)
         return True
 
     def change_view(self, request, object_id, form_url='', extra_context=None):
@@ -0,0 +1,185 @@
+from collections import namedtuple
+from django.contrib.auth.models import Group, Permission
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from guardian.core import ObjectPermissionChecker
+from guardian.models import GroupObjectPermission
+from assessments.models import Assessment, Question
+from sections.models import Section
+
+SectionGroups = namedtuple('SectionGroups', ['faculty', 'students'])
+
+# {(content_type_id, codename): permission_id}; permissions never change at runtime,
+# so they are kept per process like ContentType's own cache
+_permission_ids = {}
+
+
+def _groups_key(section_id):
+    return f"section:{section_id}:groups"
+
+
+def section_groups(*section_ids):
+    """
+    Return {section_id: SectionGroups(faculty_group_id, students_group_id)} for sections
+    whose groups exist. Group ids are cached until the section is deleted.
+    """
+    cached = cache.get_many([_groups_key(section_id) for section_id in section_ids])
+    groups = {section_id: cached[_groups_key(section_id)] for section_id in section_ids if _groups_key(section_id) in cached}
+
+    missing = [section_id for section_id in section_ids if section_id not in groups]
+    if missing:
+        names = {}
+        for section_id in missing:
+            names[f"faculty_section_{section_id}"] = (section_id, 'faculty')
+            names[f"students_section_{section_id}"] = (section_id, 'students')
+        found = {}
+        for name, group_id in Group.objects.filter(name__in=names).values_list('name', 'id'):
+            section_id, kind = names[name]
+            found.setdefault(section_id, {})[kind] = group_id
+        resolved = {
+            section_id: SectionGroups(**group_ids) for section_id, group_ids in found.items() if len(group_ids) == 2
+        }
+        cache.set_many({_groups_key(section_id): value for section_id, value in resolved.items()}, timeout=None)
+        groups.update(resolved)
+    return groups
+
+
+def cache_section_groups(section_id, groups):
+    """Store the group ids of a section, e.g. right after its groups are created."""
+    cache.set(_groups_key(section_id), groups, timeout=None)
+
+
+def forget_section_groups(*section_ids):
+    """Drop cached group ids, e.g. when the section's groups are deleted."""
+    cache.delete_many([_groups_key(section_id) for section_id in section_ids])
+
+
+def permission_ids(model, codenames):
+    """Return {codename: permission_id} of `model`'s permissions, loading unknown ones in one query."""
+    content_type = ContentType.objects.get_for_model(model)
+    missing = [codename for codename in codenames if (content_type.id, codename) not in _permission_ids]
+    if missing:
+        for codename, permission_id in Permission.objects.filter(
+            content_type=content_type, codename__in=missing
+        ).values_list('codename', 'id'):
+            _permission_ids[(content_type.id, codename)] = permission_id
+    return {codename: _permission_ids[(content_type.id, codename)] for codename in codenames}
+
+
+def assign_group_perms(objects, group_perms):
+    """
+    Grant object permissions on `objects` (instances of one model) with a single insert.
+    `group_perms` maps a group id to the permission codenames it gets, e.g.
+    {faculty_group_id: ['view_question', 'change_question']}. Existing grants are kept.
+    """
+    if not objects or not group_perms:
+        return
+    model = type(objects[0])
+    content_type = ContentType.objects.get_for_model(model)
+    perm_ids = permission_ids(model, {codename for codenames in group_perms.values() for codename in codenames})
+    GroupObjectPermission.objects.bulk_create(
+        [
+            GroupObjectPermission(
+                group_id=group_id, permission_id=perm_ids[codename], content_type=content_type, object_pk=str(obj.pk)
+            )
+            for obj in objects
+            for group_id, codenames in group_perms.items()
+            for codename in codenames
+        ],
+        ignore_conflicts=True,
+    )
+
+
+# Assessment and question permissions follow the parent section's group permissions:
+# section viewers can view them, and the section's faculty (who may add assessments)
+# can change and delete them. No per-object rows are stored for them.
+SECTION_SCOPED_PERMISSIONS = {
+    'assessments.view_assessment': 'sections.view_section',
+    'assessments.change_assessment': 'sections.can_add_assessment',
+    'assessments.delete_assessment': 'sections.can_add_assessment',
+    'assessments.can_add_question': 'sections.can_add_assessment',
+    'assessments.view_question': 'sections.view_section',
+    'assessments.change_question': 'sections.can_add_assessment',
+    'assessments.delete_question': 'sections.can_add_assessment',
+}
+
+
+def _section_id(obj):
+    if isinstance(obj, Assessment):
+        return obj.section_id
+    if isinstance(obj, Question):
+        return obj.assessment.section_id
+    return None
+
+
+class SectionPermissionBackend:
+    """
+    Resolves assessment and question object permissions through the parent Section's
+    guardian permissions (see SECTION_SCOPED_PERMISSIONS). Listed after guardian's
+    ObjectPermissionBackend in AUTHENTICATION_BACKENDS.
+    """
+
+    def authenticate(self, request, **credentials):
+        return None
+
+    def has_perm(self, user_obj, perm, obj=None):
+        section_perm = SECTION_SCOPED_PERMISSIONS.get(perm)
+        if obj is None or section_perm is None or not user_obj.is_active:
+            return False
+        section_id = _section_id(obj)
+        if section_id is None:
+            return False
+        # Only the pk is needed to look up the section's object permissions
+        return user_obj.has_perm(section_perm, Section(pk=section_id))
+
+
+def request_permission_checker(request):
+    """Return the guardian ObjectPermissionChecker of the request's user, created once per request."""
+    checker = getattr(request, '_object_permission_checker', None)
+    if checker is None:
+        checker = request._object_permission_checker = ObjectPermissionChecker(request.user)
+    return checker
+
+
+def prefetch_object_permissions(request, objects):
+    """
+    Load the user's object permissions on `objects` (instances of one model) into the
+    request's checker with a fixed number of queries. For assessments and questions
+    the permissions of their sections are loaded too.
+    """
+    objects = list(objects)
+    if not objects:
+        return
+    checker = request_permission_checker(request)
+    checker.prefetch_perms(objects)
+    section_ids = {_section_id(obj) for obj in objects} - {None}
+    if section_ids:
+        checker.prefetch_perms([Section(pk=section_id) for section_id in section_ids])
+
+
+def has_object_perm(request, perm, obj):
+    """
+    Check `perm` on `obj` like request.user.has_perm(perm, obj), answered from the
+    request's checker so objects prefetched with prefetch_object_permissions cost no queries.
+    """
+    if obj is None:
+        return request.user.has_perm(perm)
+    checker = request_permission_checker(request)
+    if checker.has_perm(perm, obj):
+        return True
+    section_perm = SECTION_SCOPED_PERMISSIONS.get(perm)
+    section_id = _section_id(obj) if section_perm else None
+    return section_id is not None and checker.has_perm(section_perm, Section(pk=section_id))
+
+
+class PermissionPrefetchAdminMixin:
+    """
+    ModelAdmin mixin that prefetches the user's object permissions for every row of the
+    changelist page, so per-row permission hooks using has_object_perm() do not query.
+    """
+
+    def get_changelist_instance(self, request):
+        changelist = super().get_changelist_instance(request)
+        if not request.user.is_superuser:
+            prefetch_object_permissions(request, changelist.result_list)
+        return changelist
@@ -1,10 +1,14 @@
+from django.conf import settings
 from django.db.models.signals import post_delete, m2m_changed, post_save, pre_save
 from django.dispatch import receiver
 from sections.models import Section
 from assessments.models import AssessmentBreakdown, Question, StudentQuestionScore
 from users.models import CustomUser
-from guardian.shortcuts import assign_perm
 from django.contrib.auth.models import Group
+from results.aggregates import refresh_aggregates, delete_aggregates
+from sections.permissions import (
+    SectionGroups, section_groups, cache_section_groups, forget_section_groups, assign_group_perms
+)
 
 @receiver(pre_save, sender=Section)
 def track_old_faculty(sender, instance, **kwargs):
@@ -28,18 +32,18 @@ def handle_section_creation_or_update(sender, instance, created, **kwargs):
     students_group, _ = Group.objects.get_or_create(name=students_group_name)
 
     if created:
-        # Assign permissions for faculty group
-        assign_perm('sections.view_section', faculty_group, instance)
-        assign_perm('sections.can_add_assessment', faculty_group, instance)
+        # Cache the new groups' ids, replacing anything left over for a reused pk
+        cache_section_groups(instance.pk, SectionGroups(faculty_group.pk, students_group.pk))
 
-        # Assign permissions for students group
-        assign_perm('sections.view_section', students_group, instance)
-
-        assessment_breakdowns = AssessmentBreakdown.objects.filter(section=instance)
-        for breakdown in assessment_breakdowns:
-            assign_perm('assessments.view_assessmentbreakdown', faculty_group, breakdown)
-            assign_perm('assessments.change_assessmentbreakdown', faculty_group, breakdown)
-            assign_perm('assessments.view_assessmentbreakdown', students_group, breakdown)
+        # Assign permissions for the faculty and students groups
+        assign_group_perms([instance], {
+            faculty_group.pk: ['view_section', 'can_add_assessment'],
+            students_group.pk: ['view_section'],
+        })
+        assign_group_perms(list(AssessmentBreakdown.objects.filter(section=instance)), {
+            faculty_group.pk: ['view_assessmentbreakdown', 'change_assessmentbreakdown'],
+            students_group.pk: ['view_assessmentbreakdown'],
+        })
 
         # Add faculty and students to their groups
         if instance.faculty:
@@ -57,42 +61,61 @@ def handle_section_creation_or_update(sender, instance, created, **kwargs):
 
 
 @receiver(m2m_changed, sender=Section.students.through)
-def handle_students_membership_change(sender, instance, action, pk_set, **kwargs):
+def handle_students_membership_change(sender, instance, action, reverse, pk_set, **kwargs):
     """
-    Updates student permissions when students are added or removed from a Section.
+    Updates student permissions, score rows and aggregates when students are added to or
+    removed from a Section, from either side of the relation. Every step is a single
+    set-based query, so a whole roster costs the same as one student.
     """
-    students_group_name = f"students_section_{instance.pk}"
-    students_group = Group.objects.get(name=students_group_name)
+    if action == "pre_clear":
+        # clear() sends no pk_set; treat it as removing everything currently enrolled
+        related = instance.enrolled_sections if reverse else instance.students
+        pk_set = set(related.values_list('pk', flat=True))
+        action = "post_remove"
+    elif action not in ("post_add", "post_remove") or not pk_set:
+        return
+
+    # One side of the relation is always a single object
+    if reverse:
+        section_ids, student_ids = set(pk_set), {instance.pk}
+    else:
+        section_ids, student_ids = {instance.pk}, set(pk_set)
+
+    group_ids = [groups.students for groups in section_groups(*section_ids).values()]
+    UserGroup = CustomUser.groups.through
 
     if action == "post_add":
-        # Add students to the group
-        for student_id in pk_set:
-            student = instance.students.get(pk=student_id)
-            student.groups.add(students_group)
-            # Get all questions related to the section's assessments
-            questions = Question.objects.filter(assessment__section=instance)
-            for question in questions:
-                # Create StudentQuestionScore for the student for each question
-                StudentQuestionScore.objects.get_or_create(
-                    student=student,
-                    question=question,
-                    defaults={'marks_obtained': 0}  # Default marks can be set to 0
-                )
-    elif action == "post_remove":
-        # Remove students from the group
-        for student_id in pk_set:
-            try:
-                # Fetch the student directly from the database
-                student = CustomUser.objects.get(pk=student_id)
-                student.groups.remove(students_group)
-                # Get all related StudentQuestionScore entries and delete them
-                StudentQuestionScore.objects.filter(
-                    student=student,
-                    question__assessment__section=instance
-                ).delete()
-            except CustomUser.DoesNotExist:
-                # Log the error if the student does not exist in the database (very unlikely in this case)
-                print(f"CustomUser with ID {student_id} does not exist.")
+        # Add students to the groups
+        UserGroup.objects.bulk_create(
+            [UserGroup(customuser_id=student_id, group_id=group_id) for group_id in group_ids for student_id in student_ids],
+            ignore_conflicts=True,
+        )
+        # Create the missing StudentQuestionScore rows for the sections' questions (not in sparse mode)
+        if not settings.OBE_SPARSE_SCORES:
+            questions = Question.objects.filter(assessment__section_id__in=section_ids).values_list(
+                'id', 'assessment_id', 'assessment__section_id'
+            )
+            StudentQuestionScore.objects.bulk_create(
+                [
+                    StudentQuestionScore(
+                        student_id=student_id, question_id=question_id, marks_obtained=0,
+                        assessment_id=assessment_id, section_id=section_id
+                    )
+                    for question_id, assessment_id, section_id in questions
+                    for student_id in student_ids
+                ],
+                batch_size=1000,
+                ignore_conflicts=True,
+            )
+        # Create the new students' per-assessment aggregate rows
+        refresh_aggregates(section_ids=section_ids, student_ids=student_ids)
+    else:
+        # Remove students from the groups and drop their scores and aggregates
+        UserGroup.objects.filter(group_id__in=group_ids, customuser_id__in=student_ids).delete()
+        StudentQuestionScore.objects.filter(
+            student_id__in=student_ids, section_id__in=section_ids
+        ).delete()
+        delete_aggregates(section_ids, student_ids)
 
 
 @receiver(post_delete, sender=Section)
@@ -105,4 +128,5 @@ def handle_section_deletion(sender, instance, **kwargs):
 
     # Delete the groups, which automatically removes all associated permissions
     Group.objects.filter(name=faculty_group_name).delete()
-    Group.objects.filter(name=students_group_name).delete()
\ No newline at end of file
+    Group.objects.filter(name=students_group_name).delete()
+    forget_section_groups(instance.pk)
\ No newline at end of file
@@ -0,0 +1,45 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from api.tests.factories import create_program, create_course, create_users, create_section
+
+
+class SectionListQueriesTestCase(TestCase):
+    def setUp(self):
+        self.program = create_program()
+        self.course = create_course(self.program)
+        self.faculty = create_users(1, role="faculty", prefix="faculty")[0]
+        self.admin = create_users(1, role="admin", prefix="admin")[0]
+        self.admin.is_staff = self.admin.is_superuser = True
+        self.admin.save()
+
+    def add_sections(self, letters):
+        for letter in letters:
+            create_section(self.course, program=self.program, faculty=self.faculty, section=letter)
+
+    def assertConstantQueries(self, fetch):
+        self.add_sections("AB")
+        fetch()  # Warm per-process caches
+        with CaptureQueriesContext(connection) as small:
+            fetch()
+        self.add_sections("CDEFGH")
+        with CaptureQueriesContext(connection) as large:
+            fetch()
+        self.assertEqual(len(small), len(large))
+
+    def test_section_changelist(self):
+        """Test that the section changelist loads courses and faculty with the sections."""
+        self.client.force_login(self.admin)
+        self.assertConstantQueries(lambda: self.client.get("/dashboard/sections/section/"))
+
+    def test_breakdown_changelist(self):
+        """Test that the breakdown changelist and its section filter do not query per section."""
+        self.client.force_login(self.admin)
+        self.assertConstantQueries(lambda: self.client.get("/dashboard/assessments/assessmentbreakdown/"))
+
+    def test_sections_api(self):
+        """Test that the sections API builds section names without a query per section."""
+        client = APIClient()
+        client.force_authenticate(self.faculty)
+        self.assertConstantQueries(lambda: self.assertEqual(client.get("/api/sections/").status_code, 200))
@@ -0,0 +1,43 @@
+from django.test import TestCase
+from guardian.models import GroupObjectPermission
+from api.tests.factories import create_program, create_course, create_users, create_section, create_assessment
+
+
+class SectionPermissionBackendTestCase(TestCase):
+    def setUp(self):
+        self.program = create_program()
+        self.course = create_course(self.program)
+        self.faculty, self.other_faculty = create_users(2, role="faculty", prefix="faculty")
+        self.students = create_users(2)
+        self.section = create_section(self.course, program=self.program, faculty=self.faculty, students=self.students[:1])
+        self.assessment = create_assessment(self.section, marks=(5,))
+        self.question = self.assessment.questions.get()
+
+    def test_faculty_gets_section_scoped_permissions(self):
+        """Test that the section's faculty can view, change and delete its assessments and questions."""
+        for perm in ('view_assessment', 'change_assessment', 'delete_assessment', 'can_add_question'):
+            self.assertTrue(self.faculty.has_perm(f'assessments.{perm}', self.assessment))
+        for perm in ('view_question', 'change_question', 'delete_question'):
+            self.assertTrue(self.faculty.has_perm(f'assessments.{perm}', self.question))
+        self.assertFalse(self.other_faculty.has_perm('assessments.view_assessment', self.assessment))
+
+    def test_students_can_only_view(self):
+        """Test that enrolled students can view but not change, and other students cannot view."""
+        enrolled, outsider = self.students
+        self.assertTrue(enrolled.has_perm('assessments.view_assessment', self.assessment))
+        self.assertTrue(enrolled.has_perm('assessments.view_question', self.question))
+        self.assertFalse(enrolled.has_perm('assessments.change_assessment', self.assessment))
+        self.assertFalse(outsider.has_perm('assessments.view_assessment', self.assessment))
+
+    def test_follows_section_membership(self):
+        """Test that permissions change with the section's roster and faculty without per-object rows."""
+        self.assertFalse(GroupObjectPermission.objects.filter(
+            content_type__app_label='assessments', content_type__model__in=['assessment', 'question']
+        ).exists())
+
+        self.section.students.add(self.students[1])
+        self.assertTrue(self.students[1].has_perm('assessments.view_question', self.question))
+
+        self.section.faculty = self.other_faculty
+        self.section.save()
+        self.assertTrue(self.other_faculty.has_perm('assessments.change_assessment', self.assessment))
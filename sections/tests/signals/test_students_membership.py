@@ -0,0 +1,64 @@
+from django.contrib.auth.models import Group
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from assessments.models import StudentQuestionScore
+from results.models import StudentAssessmentAggregate
+from api.tests.factories import create_program, create_course, create_users, create_section, create_assessment
+
+
+class StudentsMembershipSignalTestCase(TestCase):
+    def setUp(self):
+        self.program = create_program()
+        self.course = create_course(self.program)
+        self.section = create_section(self.course, program=self.program)
+        self.assessments = [create_assessment(self.section, weightage=50, marks=(5, 5, 5)) for _ in range(2)]
+        self.group = Group.objects.get(name=f"students_section_{self.section.pk}")
+
+    def test_add_creates_groups_scores_and_aggregates(self):
+        """Test that enrolling students adds group membership, zero score rows and aggregates."""
+        students = create_users(3)
+        self.section.students.add(*students)
+
+        self.assertEqual(set(self.group.customuser_set.all()), set(students))
+        self.assertEqual(StudentQuestionScore.objects.filter(marks_obtained=0).count(), 3 * 6)
+        self.assertEqual(StudentAssessmentAggregate.objects.count(), 3 * 2)
+
+    def test_reverse_add_and_clear(self):
+        """Test that enrolling from the student side and clearing a roster are handled too."""
+        student = create_users(1)[0]
+        student.enrolled_sections.add(self.section)
+        self.assertTrue(student.groups.filter(pk=self.group.pk).exists())
+        self.assertEqual(StudentQuestionScore.objects.filter(student=student).count(), 6)
+
+        self.section.students.clear()
+        self.assertFalse(student.groups.filter(pk=self.group.pk).exists())
+        self.assertFalse(StudentQuestionScore.objects.filter(student=student).exists())
+        self.assertFalse(StudentAssessmentAggregate.objects.filter(student=student).exists())
+
+    def test_remove_only_affects_removed_students(self):
+        """Test that removal drops the removed students' membership, scores and aggregates only."""
+        staying, leaving = create_users(2)
+        self.section.students.add(staying, leaving)
+        self.section.students.remove(leaving)
+
+        self.assertEqual(list(self.group.customuser_set.all()), [staying])
+        self.assertEqual(StudentQuestionScore.objects.filter(student=staying).count(), 6)
+        self.assertFalse(StudentQuestionScore.objects.filter(student=leaving).exists())
+        self.assertFalse(StudentAssessmentAggregate.objects.filter(student=leaving).exists())
+
+    def test_roster_changes_take_a_fixed_number_of_queries(self):
+        """Test that adding or removing a roster costs the same queries as a single student."""
+        one, *roster = create_users(11)
+
+        with CaptureQueriesContext(connection) as add_one:
+            self.section.students.add(one)
+        with CaptureQueriesContext(connection) as add_many:
+            self.section.students.add(*roster)
+        self.assertEqual(len(add_one), len(add_many))
+
+        with CaptureQueriesContext(connection) as remove_one:
+            self.section.students.remove(one)
+        with CaptureQueriesContext(connection) as remove_many:
+            self.section.students.remove(*roster)
+        self.assertEqual(len(remove_one), len(remove_many))
@@ -23,10 +23,12 @@ export const ScoreTable = {
     `,
     computed: {
         studentScores() {
+            // Index scores once instead of searching the list for every cell
+            const marksByCell = new Map(this.scores.map(s => [`${s.student_id}:${s.question_id}`, s.marks_obtained]));
             return this.students.reduce((acc, student) => {
                 acc[student.id] = this.questions.reduce((qAcc, question) => {
-                    const score = this.scores.find(s => s.student_id === student.id && s.question_id === question.id);
-                    qAcc[question.id] = score ? score.marks_obtained : 0;
+                    const marks = marksByCell.get(`${student.id}:${question.id}`);
+                    qAcc[question.id] = marks ?? "";  // Ungraded cells are blank
                     return qAcc;
                 }, {});
                 return acc;
@@ -1,5 +1,13 @@
 import { ScoreTable } from "./components/score_table.js";
 
+const AUTOSAVE_INTERVAL_MS = 5000;
+
+const cellKey = (studentId, questionId) => `${studentId}:${questionId}`;
+
+// ✅ A blank cell is ungraded (null); the server clears its mark
+const toMarks = (value) =>
+    value === null || value === undefined || String(value).trim() === "" ? null : parseFloat(value);
+
 const app = Vue.createApp({
     components: {
         ScoreTable,
@@ -14,12 +22,20 @@ const app = Vue.createApp({
             exportedMetadata: null, 
             errorMessage: "",
             successMessage: "",
-            csrfToken: ""
+            csrfToken: "",
+            dirty: new Set(),  // ✅ "studentId:questionId" keys of cells edited since the last save
+            saving: false,
+            autosaveTimer: null
         };
     },
     mounted() {
         this.fetchAssessmentData();
         this.getCsrfToken();
+        // ✅ Autosave only sends edited cells, so it is cheap to run every few seconds
+        this.autosaveTimer = setInterval(() => this.submitScores({ autosave: true }), AUTOSAVE_INTERVAL_MS);
+    },
+    unmounted() {
+        clearInterval(this.autosaveTimer);
     },
     methods: {
         getCsrfToken() {
@@ -33,7 +49,8 @@ const app = Vue.createApp({
 
         async fetchAssessmentData() {
             try {
-                const response = await fetch(`/api/assessment-marks/?id=${this.assessmentId}`);
+                // ✅ Columnar payload: question/student arrays plus dense marks and version matrices
+                const response = await fetch(`/api/assessment-marks/?id=${this.assessmentId}&format=matrix`);
                 if (!response.ok) throw new Error("Failed to fetch data.");
 
                 const data = await response.json();
@@ -42,7 +59,13 @@ const app = Vue.createApp({
                     ...q, number: index + 1 
                 }));
                 this.students = data.students;
-                this.scores = data.scores.map(score => ({ ...score })); 
+                // ✅ Every student × question cell is kept; ungraded cells have null marks and version 0
+                this.scores = data.marks.flatMap((row, i) => row.map((marks, j) => ({
+                    student_id: data.student_ids[i],
+                    question_id: data.question_ids[j],
+                    marks_obtained: marks,
+                    version: data.versions[i][j]
+                })));
 
             } catch (error) {
                 this.errorMessage = error.message;
@@ -68,7 +91,7 @@ const app = Vue.createApp({
                     `${student.first_name} ${student.last_name} (${student.username})`,
                     ...this.questions.map(q => {
                         const score = this.scores.find(s => s.student_id === student.id && s.question_id === q.id);
-                        return score ? score.marks_obtained : 0;
+                        return score ? score.marks_obtained ?? "" : "";
                     })
                 ])
             ];
@@ -91,6 +114,7 @@ const app = Vue.createApp({
                 const data = XLSX.utils.sheet_to_json(sheet, { header: 1 });
 
                 let newScores = [];
+                let invalidCell = null;
                 const importedQuestionIds = data[1].slice(1); 
 
                 if (JSON.stringify(importedQuestionIds) !== JSON.stringify(this.questions.map(q => q.id))) {
@@ -104,26 +128,42 @@ const app = Vue.createApp({
                         `${s.first_name} ${s.last_name} (${s.username})` === studentName
                     );
                     if (student) {
-                        row.slice(1).forEach((score, i) => {
-                            if (typeof score !== "string") score = String(score);  // ✅ Convert non-strings to strings
-                            score = score.trim();  // ✅ Ensure trim() doesn't break
-                            const question = this.questions[i];
-                            if (question) {
-                                newScores.push({
-                                    student_id: student.id,
-                                    question_id: question.id,
-                                    marks_obtained: parseFloat(score) || 0
-                                });
+                        // ✅ Walk the questions, not the row: empty cells are holes that forEach would skip
+                        this.questions.forEach((question, i) => {
+                            const marks = toMarks(row[i + 1]);
+                            if (Number.isNaN(marks)) {
+                                invalidCell = invalidCell || `${studentName}, question ${question.number}`;
+                                return;
                             }
+                            const current = this.scores.find(s =>
+                                s.student_id === student.id && s.question_id === question.id
+                            );
+                            newScores.push({
+                                student_id: student.id,
+                                question_id: question.id,
+                                marks_obtained: marks,
+                                version: current ? current.version : 0
+                            });
                         });
                     }
                 });
 
-                if (newScores.length !== this.scores.length) {
+                if (invalidCell) {
+                    this.errorMessage = `Imported file has invalid marks (${invalidCell}).`;
+                    return;
+                }
+                if (newScores.length !== this.students.length * this.questions.length) {
                     this.errorMessage = "Imported file structure does not match.";
                     return;
                 }
 
+                // ✅ Only cells whose marks changed are sent on the next save
+                const currentMarks = new Map(this.scores.map(s => [cellKey(s.student_id, s.question_id), toMarks(s.marks_obtained)]));
+                newScores.forEach(s => {
+                    const key = cellKey(s.student_id, s.question_id);
+                    if (currentMarks.get(key) !== s.marks_obtained) this.dirty.add(key);
+                });
+
                 this.scores = newScores;
                 this.successMessage = "Scores imported successfully!";
             };
@@ -140,48 +180,94 @@ const app = Vue.createApp({
                 this.scores = this.scores.map((s, i) => 
                     i === index ? { ...s, marks_obtained: updatedScore.marks_obtained } : s
                 );
+            } else {
+                this.scores = [...this.scores, { ...updatedScore, version: 0 }];
             }
+            this.dirty.add(cellKey(updatedScore.student_id, updatedScore.question_id));
         },
 
-        async submitScores() {
-            this.errorMessage = ""; // ✅ Clear previous errors
-            this.successMessage = ""; // ✅ Clear previous success messages
-            
+        applySavedCells(cells) {
+            // ✅ Take the server's marks and versions for saved or conflicting cells
+            const byKey = new Map(cells.map(c => [cellKey(c.student_id, c.question_id), c]));
+            this.scores = this.scores.map(s => {
+                const cell = byKey.get(cellKey(s.student_id, s.question_id));
+                return cell ? { ...s, marks_obtained: cell.marks_obtained, version: cell.version } : s;
+            });
+        },
+
+        async submitScores({ autosave = false } = {}) {
+            if (this.saving || (autosave && this.dirty.size === 0)) return;
+            if (!autosave) {
+                this.errorMessage = ""; // ✅ Clear previous errors
+                this.successMessage = ""; // ✅ Clear previous success messages
+            }
+
             if (!this.csrfToken) {
                 this.errorMessage = "CSRF token is missing!";
                 return;
             }
 
-            if (this.scores.length === 0) {
+            if (this.dirty.size === 0) {
                 this.errorMessage = "No changes made. Modify a record before saving.";
                 return;
             }
 
-            const processedScores = this.scores.map(score => ({
-                student_id: score.student_id,
-                question_id: score.question_id,
-                marks_obtained: parseFloat(score.marks_obtained) || 0.0  
-            }));
+            // ✅ Send only the edited cells, each with the version it was edited from
+            const sent = new Set(this.dirty);
+            const changedScores = this.scores
+                .filter(score => sent.has(cellKey(score.student_id, score.question_id)))
+                .map(score => ({
+                    student_id: score.student_id,
+                    question_id: score.question_id,
+                    marks_obtained: toMarks(score.marks_obtained),
+                    version: score.version ?? 0
+                }));
 
+            this.saving = true;
             try {
                 const response = await fetch(`/api/assessment-marks/?id=${this.assessmentId}`, {
-                    method: "POST",
+                    method: "PATCH",
                     headers: {
                         "Content-Type": "application/json",
                         "X-CSRFToken": this.csrfToken
                     },
                     credentials: "include",
-                    body: JSON.stringify({ scores: processedScores }),
+                    body: JSON.stringify({ scores: changedScores }),
+                });
+                const data = await response.json();
+
+                // ✅ Cells edited again while the request was in flight stay dirty and keep the new value
+                const sentMarks = new Map(changedScores.map(c => [cellKey(c.student_id, c.question_id), c.marks_obtained]));
+                const settled = new Set();
+                this.scores.forEach(s => {
+                    const key = cellKey(s.student_id, s.question_id);
+                    if (sentMarks.has(key) && toMarks(s.marks_obtained) === sentMarks.get(key)) settled.add(key);
                 });
+                settled.forEach(key => this.dirty.delete(key));
+                // Re-edited cells keep their new marks but take the saved version
+                const saved = (data.saved || []).map(c => settled.has(cellKey(c.student_id, c.question_id))
+                    ? c
+                    : { ...c, marks_obtained: this.scores.find(s =>
+                        s.student_id === c.student_id && s.question_id === c.question_id
+                    ).marks_obtained });
+                // ✅ Stale cells take the server's current marks
+                (data.conflicts || []).forEach(c => this.dirty.delete(cellKey(c.student_id, c.question_id)));
+                this.applySavedCells([...saved, ...(data.conflicts || [])]);
+                // Rejected (invalid) cells are not retried by autosave until edited again
+                (data.errors || []).forEach(c => this.dirty.delete(cellKey(c.student_id, c.question_id)));
 
                 if (!response.ok) {
-                    const errorData = await response.json();
-                    throw new Error(errorData.errors || "Failed to save scores.");
+                    const details = [...(data.conflicts || []), ...(data.errors || [])]
+                        .map(e => `Student ${e.student_id}, question ${e.question_id}: ${e.error}`)
+                        .join(" ");
+                    throw new Error(`${data.message || "Failed to save scores."} ${details}`.trim());
                 }
-                this.successMessage = "Scores updated successfully!";
+                this.successMessage = autosave ? "All changes saved." : "Scores updated successfully!";
                 setTimeout(() => { this.successMessage = ""; }, 3000);
             } catch (error) {
                 this.errorMessage = error.message;
+            } finally {
+                this.saving = false;
             }
         }
     }
@@ -0,0 +1,243 @@
+"""
+Benchmark Term Seeder
+=====================
+Generates realistic teaching terms on top of the seed_obe catalog, for load testing:
+  - faculty teaching ~4 sections each
+  - a student pool enrolled in ~5 sections per student
+  - sections with 50–200 students and a breakdown drawn from common templates
+  - quizzes, assignments, labs, midterm, final and project assessments with 10–40
+    questions each, every question mapped to one of the course's CLOs
+  - scores for every graded assessment; in-progress sections leave the final and
+    project ungraded
+
+Everything is drawn from --seed, so the same seed on the same catalog produces the same
+terms. Rows are written through the set-based paths the app itself uses (enrollment
+signal, save_score_cells), so score rows, aggregates and caches are consistent.
+
+Usage:
+    python manage.py seed_benchmark --sections 2000
+    python manage.py seed_benchmark --sections 50 --students-min 20 --students-max 60 --seed 7
+    python manage.py seed_benchmark --flush     # removes previously generated terms first
+"""
+
+import random
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from api.services.score_writes import save_score_cells
+from assessments.models import Assessment, Question
+from courses.models.course import Course
+from sections.models import Section
+
+User = get_user_model()
+
+USERNAME_PREFIX = "bench_"
+PASSWORD = "bench123"
+
+# Breakdown templates (assessment type -> weight); each sums to 100
+BREAKDOWNS = [
+    {"quiz": 10, "assignment": 10, "midterm": 25, "final": 40, "project": 15},
+    {"quiz": 15, "assignment": 10, "lab": 20, "midterm": 20, "final": 35},
+    {"quiz": 10, "assignment": 15, "midterm": 30, "final": 45},
+    {"lab": 40, "midterm": 20, "final": 40},
+]
+BREAKDOWN_FIELDS = {
+    "quiz": "quiz_weightage",
+    "assignment": "assignment_weightage",
+    "lab": "lab_weightage",
+    "midterm": "mid_weightage",
+    "final": "final_weightage",
+    "project": "project_weightage",
+}
+# How many assessments of each type a section gets (min, max)
+ASSESSMENTS_PER_TYPE = {
+    "quiz": (3, 4),
+    "assignment": (2, 3),
+    "lab": (4, 6),
+    "midterm": (1, 1),
+    "final": (1, 1),
+    "project": (1, 1),
+}
+QUESTION_MARKS = [1, 2, 2.5, 5, 10]
+SECTIONS_PER_FACULTY = 4
+SECTIONS_PER_STUDENT = 5
+
+
+def even_weights(n, total=100):
+    """Split *total* into *n* integer weights that differ by at most one and sum to *total*."""
+    return [total // n + (1 if index < total % n else 0) for index in range(n)]
+
+
+class Command(BaseCommand):
+    help = "Generate deterministic benchmark terms: sections, rosters, assessments and scores"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sections", type=int, default=20, help="Sections to generate (default: 20)")
+        parser.add_argument("--students-min", type=int, default=50, help="Smallest section roster (default: 50)")
+        parser.add_argument("--students-max", type=int, default=200, help="Largest section roster (default: 200)")
+        parser.add_argument("--questions-min", type=int, default=10, help="Fewest questions per assessment (default: 10)")
+        parser.add_argument("--questions-max", type=int, default=40, help="Most questions per assessment (default: 40)")
+        parser.add_argument("--seed", type=int, default=42, help="Random seed for reproducibility (default: 42)")
+        parser.add_argument("--flush", action="store_true", help="Delete previously generated benchmark data first")
+
+    def handle(self, *args, **options):
+        if not 0 < options["students_min"] <= options["students_max"]:
+            raise CommandError("--students-min must be positive and not above --students-max.")
+        if not 0 < options["questions_min"] <= options["questions_max"]:
+            raise CommandError("--questions-min must be positive and not above --questions-max.")
+
+        if options["flush"]:
+            self._flush()
+
+        courses = list(
+            Course.objects.filter(course_outcomes__isnull=False).distinct().order_by("id").prefetch_related("programs")
+        )
+        if not courses:
+            self.stdout.write("  No courses with CLOs found, running seed_obe first...")
+            call_command("seed_obe", seed=options["seed"], stdout=self.stdout)
+            courses = list(
+                Course.objects.filter(course_outcomes__isnull=False).distinct().order_by("id").prefetch_related("programs")
+            )
+        clo_ids = {}
+        for course in courses:
+            clo_ids[course.id] = list(course.course_outcomes.order_by("CLO").values_list("id", flat=True))
+
+        rng = random.Random(options["seed"])
+        sizes = [rng.randint(options["students_min"], options["students_max"]) for _ in range(options["sections"])]
+        faculty = self._create_users(
+            "faculty", -(-options["sections"] // SECTIONS_PER_FACULTY)
+        )
+        students = self._create_users(
+            "student", max(options["students_max"], -(-sum(sizes) // SECTIONS_PER_STUDENT))
+        )
+
+        taken = set(Section.objects.values_list("course_id", "program_id", "semester", "section", "batch", "year"))
+        for number, size in enumerate(sizes, start=1):
+            self._seed_section(rng, courses, clo_ids, faculty, students, size, taken, options)
+            if number % 10 == 0 or number == len(sizes):
+                self.stdout.write(f"  {number}/{len(sizes)} sections")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated {len(sizes)} sections with {sum(sizes)} enrollments "
+            f"({len(faculty)} faculty, {len(students)} students)."
+        ))
+
+    # -----------------------------------------------------------------------
+    # Flush
+    # -----------------------------------------------------------------------
+
+    def _flush(self):
+        self.stdout.write("  Flushing existing benchmark data...")
+        # Deleting sections cascades to assessments, questions, scores and aggregates
+        for section in Section.objects.filter(faculty__username__startswith=USERNAME_PREFIX):
+            section.delete()
+        User.objects.filter(username__startswith=USERNAME_PREFIX).delete()
+        self.stdout.write(self.style.WARNING("  Existing benchmark data cleared."))
+
+    # -----------------------------------------------------------------------
+    # Users
+    # -----------------------------------------------------------------------
+
+    def _create_users(self, role, count):
+        """Return `count` benchmark users of `role`, creating the missing ones in one insert."""
+        usernames = [f"{USERNAME_PREFIX}{role}{index:06d}" for index in range(count)]
+        users = User.objects.filter(username__startswith=f"{USERNAME_PREFIX}{role}")
+        existing = set(users.values_list("username", flat=True))
+        password = make_password(PASSWORD)  # Hashed once; bulk_create skips save()
+        User.objects.bulk_create(
+            [
+                User(
+                    username=username,
+                    email=f"{username}@example.com",
+                    first_name=role.title(),
+                    last_name=username[-6:],
+                    role=role,
+                    password=password,
+                )
+                for username in usernames
+                if username not in existing
+            ],
+            batch_size=1000,
+        )
+        return list(users.order_by("username").values_list("id", flat=True)[:count])
+
+    # -----------------------------------------------------------------------
+    # Sections
+    # -----------------------------------------------------------------------
+
+    @transaction.atomic
+    def _seed_section(self, rng, courses, clo_ids, faculty, students, size, taken, options):
+        course = rng.choice(courses)
+        programs = list(course.programs.all())
+        program = rng.choice(programs) if programs else None
+        while True:
+            key = (
+                course.id, program.id if program else None, str(rng.randint(1, 8)),
+                chr(rng.randint(65, 90)), rng.choice(["Spring", "Summer", "Fall"]),
+                str(Section.CURRENT_YEAR + rng.randint(0, 2)),
+            )
+            if key not in taken:
+                taken.add(key)
+                break
+        complete = rng.random() < 0.5
+
+        section = Section.objects.create(
+            course=course, program=program, faculty_id=rng.choice(faculty),
+            semester=key[2], section=key[3], batch=key[4], year=key[5],
+            status="complete" if complete else "in_progress",
+        )
+        breakdown = section.assessmentbreakdown
+        template = rng.choice(BREAKDOWNS)
+        for assessment_type, field in BREAKDOWN_FIELDS.items():
+            setattr(breakdown, field, template.get(assessment_type, 0))
+        breakdown.save()
+
+        # Assessments with their questions, inserted in bulk (no roster yet, so no score rows)
+        assessments, questions = [], []
+        for assessment_type in template:
+            count = rng.randint(*ASSESSMENTS_PER_TYPE[assessment_type])
+            for index, weightage in enumerate(even_weights(count), start=1):
+                assessment = Assessment.objects.create(
+                    title=f"{assessment_type.title()} {index}", section=section, type=assessment_type,
+                    date=f"{section.year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                    weightage=float(weightage),
+                )
+                assessments.append(assessment)
+                questions.extend(
+                    Question(assessment=assessment, marks=rng.choice(QUESTION_MARKS))
+                    for _ in range(rng.randint(options["questions_min"], options["questions_max"]))
+                )
+        Question.objects.bulk_create(questions, batch_size=1000)
+        questions = list(Question.objects.filter(assessment__section=section).order_by("id"))  # MySQL returns no ids
+        Question.clo.through.objects.bulk_create(
+            [
+                Question.clo.through(question_id=question.id, courselearningoutcome_id=rng.choice(clo_ids[course.id]))
+                for question in questions
+            ],
+            batch_size=1000,
+        )
+
+        # Enrollment creates the score rows and aggregates of the whole roster
+        roster = rng.sample(students, min(size, len(students)))
+        section.students.add(*roster)
+
+        # Each student has an ability; marks scatter around it. In-progress terms have
+        # no final or project marks yet
+        ability = {student_id: rng.uniform(0.35, 0.95) for student_id in roster}
+        questions_by_assessment = {}
+        for question in questions:
+            questions_by_assessment.setdefault(question.assessment_id, []).append(question)
+        for assessment in assessments:
+            if not complete and assessment.type in ("final", "project"):
+                continue
+            save_score_cells(assessment, {
+                (student_id, question.id): round(
+                    question.marks * min(1.0, max(0.0, rng.gauss(ability[student_id], 0.15))) * 2
+                ) / 2
+                for student_id in roster
+                for question in questions_by_assessment[assessment.id]
+            })
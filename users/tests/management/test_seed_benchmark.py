@@ -0,0 +1,59 @@
+import io
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Count, Sum
+from django.test import TestCase
+from assessments.models import Question, StudentQuestionScore
+from results.models import StudentAssessmentAggregate
+from sections.models import Section
+from api.tests.factories import create_program, create_course
+
+OPTIONS = dict(sections=3, students_min=4, students_max=8, questions_min=2, questions_max=3, stdout=io.StringIO())
+
+
+def term_signature():
+    """Everything the seed decides, independent of primary keys."""
+    return (
+        list(Section.objects.order_by("id").annotate(size=Count("students")).values_list(
+            "course__course_id", "section", "batch", "year", "status", "size"
+        )),
+        list(Question.objects.order_by("id").values_list("assessment__title", "marks", "clo__CLO")),
+        StudentQuestionScore.objects.aggregate(total=Sum("marks_obtained"), rows=Count("id")),
+    )
+
+
+class SeedBenchmarkTestCase(TestCase):
+    def setUp(self):
+        program = create_program()
+        create_course(program, "CS101", clo_count=3)
+        create_course(program, "CS102", clo_count=2)
+
+    def test_generates_graded_terms(self):
+        """Test roster and question counts within the requested ranges and consistent aggregates."""
+        call_command("seed_benchmark", **OPTIONS)
+
+        sections = Section.objects.annotate(size=Count("students"))
+        self.assertEqual(sections.count(), 3)
+        for section in sections:
+            self.assertTrue(4 <= section.size <= 8)
+            self.assertEqual(sum(section.assessmentbreakdown.get_assessment_types().values()), 100)
+        per_assessment = Question.objects.values("assessment").annotate(count=Count("id")).values_list("count", flat=True)
+        self.assertTrue(all(2 <= count <= 3 for count in per_assessment))
+
+        self.assertGreater(StudentQuestionScore.objects.filter(marks_obtained__gt=0).count(), 0)
+        self.assertEqual(
+            StudentQuestionScore.objects.aggregate(total=Sum("marks_obtained"))["total"],
+            StudentAssessmentAggregate.objects.aggregate(total=Sum("obtained_sum"))["total"],
+        )
+
+    def test_same_seed_same_terms(self):
+        """Test that flushing and reseeding with the same seed reproduces the terms."""
+        call_command("seed_benchmark", seed=7, **OPTIONS)
+        first = term_signature()
+        call_command("seed_benchmark", seed=7, flush=True, **OPTIONS)
+        self.assertEqual(term_signature(), first)
+
+    def test_invalid_ranges(self):
+        """Test that inverted ranges are rejected."""
+        with self.assertRaises(CommandError):
+            call_command("seed_benchmark", **{**OPTIONS, "students_min": 9})